@@ -1,4 +1,7 @@
 import math
+import numpy as np
+import MetricsCache
+import QueueMetrics
 from toolz import isiterable
 from numbers import Number
 
@@ -9,6 +12,13 @@ class BaseQueue:
     Checks for validity and feasibility of inputs.
     This is the inheritable class.
     """
+    #Instances keep their state in slots rather than a per-instance __dict__, which dominates memory when
+    # millions of queues are held at once. Subclasses list their own extra attributes in __slots__.
+    __slots__ = ('_lamda', '_mu', '_lq', '_p0', '_recalc_needed')
+
+    #attributes set by _calc_metrics; these are what the shared MetricsCache stores
+    _metric_fields = ('_lq', '_p0')
+
     def __init__(self, lamda, mu):
         """
         Constructor for BaseQueue class.
@@ -25,14 +35,15 @@ class BaseQueue:
         Method that returns a string representation of a queue's object state.
         Returns: String
         """
+        m = self.metrics()
         print(f'BaseQueue instance at {id(self)}'
-              f'\n\t lamda: {self.lamda}'
-              f'\n\t mu: {self.mu}'
-              f'\n\t P0: {self.p0}'
-              f'\n\t lq: {self.lq}'
-              f'\n\t l: {self.l}'
-              f'\n\t wq: {self.wq}'
-              f'\n\t w: {self.w}')
+              f'\n\t lamda: {m.lamda}'
+              f'\n\t mu: {m.mu}'
+              f'\n\t P0: {m.p0}'
+              f'\n\t lq: {m.lq}'
+              f'\n\t l: {m.l}'
+              f'\n\t wq: {m.wq}'
+              f'\n\t w: {m.w}')
 
     @property
     def lamda(self):
@@ -93,8 +104,7 @@ class BaseQueue:
         Returns: the average number of people waiting in the queue
         """
         if self._recalc_needed:
-            self._calc_metrics()
-            self._recalc_needed = False
+            self._refresh_metrics()
         return self._lq
 
     @property
@@ -104,8 +114,7 @@ class BaseQueue:
         Returns: the probability of an empty queue
         """
         if self._recalc_needed:
-            self._calc_metrics()
-            self._recalc_needed = False
+            self._refresh_metrics()
         return self._p0
 
     @property
@@ -156,6 +165,21 @@ class BaseQueue:
         """
         return self.ro
 
+    def metrics(self):
+        """
+        Calculates every metric once and returns them together. Reading the properties one at a time repeats
+        the chain of property calls behind them (w reads l, which reads lq and r, which read lamda and mu).
+        Returns: QueueMetrics snapshot
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+
+        lamda = self._lamda
+        lq = self._lq
+        r = lamda / self._mu
+        l = lq + r
+        return QueueMetrics.QueueMetrics(lamda, self._mu, r, self.ro, self._p0, lq, l, lq / lamda, l / lamda)
+
     def is_valid(self) -> bool:
         """
         Checks to see if lamda and mu are not nan
@@ -196,6 +220,89 @@ class BaseQueue:
         else:
             return lamda
 
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key: the queue type and every parameter _calc_metrics reads.
+        Subclasses with more parameters extend this.
+        Returns: tuple key
+        """
+        return type(self), self._lamda, self._mu
+
+    def _refresh_metrics(self):
+        """
+        Brings the values set by _calc_metrics up to date. Valid parameter sets are looked up in the shared
+        MetricsCache first, and only calculated (and then cached) on a miss.
+        Returns: None
+        """
+        cache = MetricsCache.shared
+        if not cache.enabled or not self.is_valid():
+            self._calc_metrics()
+            self._recalc_needed = False
+            return
+
+        key = self._cache_key()
+        values = cache.get(key)
+        if values is None:
+            self._calc_metrics()
+            cache.put(key, tuple(getattr(self, field) for field in self._metric_fields))
+        else:
+            for field, value in zip(self._metric_fields, values):
+                setattr(self, field, value)
+        self._recalc_needed = False
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu):
+        """
+        Vectorized counterpart of the metric properties. Every element of the broadcast lamda and mu
+        arrays is its own scenario, so lamda is NOT aggregated here like it is in the lamda setter.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion, broadcast against lamda
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lamda, mu = cls._batch_params(lamda, mu)
+        ro = lamda / mu
+        valid = ~np.isnan(ro)
+
+        #Same as the scalar _calc_metrics: a base queue has no lq or p0 formula.
+        nan = np.full(ro.shape, np.nan)
+        return cls._batch_results(lamda, ro, ro, nan, nan, valid, valid & (ro < 1))
+
+    @staticmethod
+    def _batch_params(*params):
+        """
+        Helper function that converts parameters to broadcast float arrays and applies the setter
+        validation element-wise: anything that is not greater than 0 becomes nan.
+        Args:
+            *params (array_like): lamda, mu, c or any other parameter that must be positive
+
+        Returns: tuple of broadcast float arrays
+        """
+        arrays = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in params])
+        return tuple(np.where(a > 0, a, np.nan) for a in arrays)
+
+    @staticmethod
+    def _batch_results(lamda, r, ro, lq, p0, valid, feasible):
+        """
+        Helper function that applies the is_valid/is_feasible handling of _calc_metrics as element-wise
+        masks and derives the Little's Laws metrics.
+        Args:
+            lamda (ndarray): arrival rates
+            r (ndarray): expected number of customers in service
+            ro (ndarray): traffic intensity
+            lq (ndarray): raw lq values, only trusted where feasible
+            p0 (ndarray): raw p0 values, only trusted where feasible
+            valid (ndarray): boolean mask of valid scenarios
+            feasible (ndarray): boolean mask of valid and feasible scenarios
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lq = np.where(valid, np.where(feasible, lq, np.inf), np.nan)
+        p0 = np.where(valid, np.where(feasible, p0, np.inf), np.nan)
+        l = lq + r
+        return {'lq': lq, 'p0': p0, 'l': l, 'w': l / lamda, 'wq': lq / lamda, 'ro': ro}
+
     def _calc_metrics(self):
         """
         Calculates and stores the average number of customers waiting,
@@ -0,0 +1,84 @@
+"""
+Memory benchmark of the __slots__ layout: bytes per queue instance measured with tracemalloc, against
+classes that hold the same attributes in a per-instance __dict__ the way the hierarchy used to.
+Run with: python BaseQueue_bench.py
+"""
+import sys
+import tracemalloc
+import MG1Queue
+import MMcPriorityQueue
+import MMcQueue
+
+
+N = 100000
+
+
+class DictMMcQueue:
+    """
+    Stand-in for the old MMcQueue layout: the same attributes, stored in __dict__.
+    """
+    def __init__(self, lamda, mu, c):
+        self._recalc_needed = True
+        self._lamda = lamda
+        self._mu = mu
+        self._c = c
+        self._lq = 0.0
+        self._p0 = 0.0
+
+
+class DictMG1Queue:
+    """
+    Stand-in for the old MG1Queue layout: the same attributes, stored in __dict__.
+    """
+    def __init__(self, lamda, mu, sigma):
+        self._recalc_needed = True
+        self._lamda = lamda
+        self._mu = mu
+        self._sigma = sigma
+        self._lq = 0.0
+        self._p0 = 0.0
+
+
+class DictMMcPriorityQueue(DictMMcQueue):
+    """
+    Stand-in for the old MMcPriorityQueue layout: lamda_k kept as the tuple that was passed in.
+    """
+    def __init__(self, lamda_k, mu, c):
+        super().__init__(sum(lamda_k), mu, c)
+        self._lamda_k = lamda_k
+
+
+def bytes_per_instance(factory):
+    """
+    Builds N instances and measures the memory they hold.
+    Args:
+        factory (callable): function of i that builds one instance
+    Returns: average bytes per instance
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [factory(i) for i in range(N)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    #the list that holds the instances is not part of their cost
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename')) - sys.getsizeof(instances)
+    return total / N
+
+
+def main():
+    cases = (
+        ('MMcQueue', lambda i: DictMMcQueue(10.0 + i, 20.0 + i, 3),
+         lambda i: MMcQueue.MMcQueue(10.0 + i, 20.0 + i, 3)),
+        ('MG1Queue', lambda i: DictMG1Queue(10.0 + i, 20.0 + i, 0.5),
+         lambda i: MG1Queue.MG1Queue(10.0 + i, 20.0 + i, 0.5)),
+        ('MMcPriorityQueue', lambda i: DictMMcPriorityQueue((1.0 + i, 2.0, 3.0), 20.0 + i, 3),
+         lambda i: MMcPriorityQueue.MMcPriorityQueue((1.0 + i, 2.0, 3.0), 20.0 + i, 3)),
+    )
+    print(f'{"class":>18} {"__dict__ (B)":>13} {"__slots__ (B)":>14}')
+    for name, old, new in cases:
+        print(f'{name:>18} {bytes_per_instance(old):>13.0f} {bytes_per_instance(new):>14.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from unittest import TestCase
 import math
+import numpy as np
 import BaseQueue as q
 
 class TestBaseQueue(TestCase):
@@ -262,4 +263,32 @@ class TestBaseQueue(TestCase):
         self.assertTrue(math.isnan(self.queue.lq))
         self.assertTrue(math.isnan(self.queue.p0))
 
-
+    def test_batch_metrics(self):
+        #lq and p0 are nan for valid and feasible scenarios, inf for infeasible ones, nan for invalid ones
+        m = q.BaseQueue.batch_metrics([15, 25, -1], 20)
+        self.assertTrue(np.isnan(m['lq'][0]))
+        self.assertTrue(np.isinf(m['lq'][1]))
+        self.assertTrue(np.isinf(m['p0'][1]))
+        self.assertTrue(np.isnan(m['lq'][2]))
+        np.testing.assert_allclose(m['ro'], [0.75, 1.25, np.nan])
+
+    def test_no_distributions(self):
+        #queue-length and waiting-time distributions belong to the concrete queues, not the abstract base
+        for name in ('state_probabilities', 'wait_exceedance', 'wait_percentile', '_service_sigma'):
+            self.assertFalse(hasattr(self.queue, name))
+
+    def test_slots(self):
+        #no per-instance __dict__ anywhere in the hierarchy
+        self.assertFalse(hasattr(self.queue, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.queue.extra = 1
+
+        #subclasses that do not declare __slots__ still work and get a __dict__ of their own
+        class TaggedQueue(q.BaseQueue):
+            def __init__(self, lamda, mu, tag):
+                super().__init__(lamda, mu)
+                self.tag = tag
+
+        queue = TaggedQueue(15, 20, 'a')
+        self.assertEqual('a', queue.tag)
+        self.assertAlmostEqual(0.75, queue.ro)
@@ -0,0 +1,155 @@
+"""
+Inverse capacity problems: the largest arrival rate lamda that keeps w, wq or lq at or below a target.
+M/M/1, M/D/1 and M/G/1 all follow the Pollaczek-Khinchine formula, which inverts in closed form
+(M/M/1 is M/G/1 with sigma = 1 / mu and M/D/1 is M/G/1 with sigma = 0). M/M/c has no closed form, so its
+queries run a vectorized, bracketed Illinois root-finder on ro with a bisection safeguard.
+"""
+import numpy as np
+import Erlang
+import MD1Queue
+import MG1Queue
+import MM1Queue
+import MMcQueue
+
+METRICS = ('w', 'wq', 'lq')
+
+
+def max_lamda(queue_class, mu, target, metric='wq', c=1, sigma=0.0):
+    """
+    Finds the largest arrival rate at which a queue meets a target on one of its metrics.
+    Args:
+        queue_class (type): MM1Queue, MD1Queue, MG1Queue or MMcQueue class (or a subclass)
+        mu (array_like): average rates of service completion
+        target (array_like): upper bound on the metric
+        metric (str): 'w', 'wq' or 'lq'
+        c (array_like): numbers of servers, only used by MMcQueue
+        sigma (array_like): service time standard deviations, only used by MG1Queue
+
+    Returns: float ndarray of arrival rates, nan where the arguments are invalid or no arrival rate meets
+        the target (a w target below 1 / mu)
+    """
+    if metric not in METRICS:
+        raise ValueError(f'metric must be one of {METRICS}, not {metric!r}')
+
+    mu, target, c, sigma = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (mu, target, c, sigma)])
+    valid = (mu > 0) & (target > 0) & (c > 0) & (c == np.floor(c)) & (sigma >= 0)
+    mu = np.where(valid, mu, np.nan)
+
+    #a w target is a wq target once the service time is taken out
+    if metric == 'w':
+        target = target - 1 / mu
+        metric = 'wq'
+
+    if issubclass(queue_class, MMcQueue.MMcQueue):
+        single = c == 1
+        lamda = np.where(single, _max_lamda_pk(mu, 1 / mu, target, metric), np.nan)
+        multi = valid & ~single & (target > 0)
+        if np.any(multi):
+            lamda[multi] = _max_lamda_mmc(mu[multi], c[multi].astype(np.int64), target[multi], metric)
+    elif issubclass(queue_class, MM1Queue.MM1Queue):
+        lamda = _max_lamda_pk(mu, 1 / mu, target, metric)
+    elif issubclass(queue_class, MD1Queue.MD1Queue):
+        lamda = _max_lamda_pk(mu, np.zeros_like(mu), target, metric)
+    elif issubclass(queue_class, MG1Queue.MG1Queue):
+        lamda = _max_lamda_pk(mu, sigma, target, metric)
+    else:
+        raise TypeError(f'no capacity inverse for {queue_class.__name__}')
+
+    return np.where(valid & (lamda > 0), lamda, np.nan)
+
+
+def _max_lamda_pk(mu, sigma, target, metric):
+    """
+    Helper function that inverts the Pollaczek-Khinchine formula lq = lamda^2 * s2 / (2 * (1 - lamda / mu)),
+    where s2 = 1 / mu^2 + sigma^2 is the second moment of the service time.
+    Args:
+        mu (ndarray): service rates
+        sigma (ndarray): service time standard deviations
+        target (ndarray): upper bound on wq or lq
+        metric (str): 'wq' or 'lq'
+
+    Returns: ndarray of arrival rates
+    """
+    s2 = 1 / mu ** 2 + sigma ** 2
+    with np.errstate(invalid='ignore'):
+        if metric == 'wq':
+            return 2 * target / (s2 + 2 * target / mu)
+
+        #positive root of s2 * lamda^2 + 2 * lq / mu * lamda - 2 * lq = 0, written without cancellation
+        return 2 * target / (target / mu + np.sqrt((target / mu) ** 2 + 2 * target * s2))
+
+
+def _mmc_scaled_metric(ro, mu, c, metric):
+    """
+    Helper function that evaluates (1 - ro) * wq or (1 - ro) * lq of M/M/c queues at the given utilizations.
+    Taking out the 1 / (1 - ro) pole leaves a smooth function that is finite at ro = 1, which the root-finder
+    converges on much faster than on the metric itself.
+    Args:
+        ro (ndarray): utilizations in [0, 1)
+        mu (ndarray): service rates
+        c (ndarray): numbers of servers
+        metric (str): 'wq' or 'lq'
+
+    Returns: ndarray of scaled metric values
+    """
+    b = Erlang.erlang_b(ro * c, c)
+    p_wait = b / (1 - ro * (1 - b))
+    return p_wait / (c * mu) if metric == 'wq' else p_wait * ro
+
+
+def _max_lamda_mmc(mu, c, target, metric, tol=1e-13, max_iter=200):
+    """
+    Helper function that solves metric(ro) = target for M/M/c queues with the Illinois method, in the scaled
+    form (1 - ro) * (metric(ro) - target) = 0. That is -target at ro = 0 and positive at ro = 1, so [0, 1]
+    always brackets the root. After three steps in a row that fail to halve the bracket, the next one
+    bisects, which bounds the worst case by a small multiple of plain bisection.
+    Args:
+        mu (ndarray): service rates
+        c (ndarray): numbers of servers, greater than 1
+        target (ndarray): positive upper bound on the metric
+        metric (str): 'wq' or 'lq'
+        tol (float): width of the ro bracket at which to stop
+        max_iter (int): iteration cap
+
+    Returns: ndarray of arrival rates
+    """
+    lo = np.zeros(mu.shape)
+    hi = np.ones(mu.shape)
+    f_lo = -target
+    f_hi = _mmc_scaled_metric(hi, mu, c, metric)
+    side = np.zeros(mu.shape, dtype=np.int8)
+    stalls = np.zeros(mu.shape, dtype=np.int64)
+    root = np.full(mu.shape, np.nan)
+    active = np.arange(len(mu))
+
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        l, h, fl, fh = lo[active], hi[active], f_lo[active], f_hi[active]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = l - fl * (h - l) / (fh - fl)
+        x = np.where((stalls[active] >= 3) | ~(x > l) | ~(x < h), (l + h) / 2, x)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fx = _mmc_scaled_metric(x, mu[active], c[active], metric) - (1 - x) * target[active]
+
+        above = fx > 0
+        new_l = np.where(above, l, x)
+        new_h = np.where(above, x, h)
+        stalls[active] = np.where(new_h - new_l > (h - l) / 2, stalls[active] + 1, 0)
+
+        #Illinois: when the same end moves twice in a row, halve the function value kept at the other end
+        s = np.where(above, 1, -1).astype(np.int8)
+        repeat = side[active] == s
+        f_lo[active] = np.where(above, np.where(repeat, fl / 2, fl), fx)
+        f_hi[active] = np.where(above, fx, np.where(repeat, fh / 2, fh))
+        side[active] = s
+        lo[active] = new_l
+        hi[active] = new_h
+
+        done = (new_h - new_l <= tol) | (np.abs(fx) <= tol * target[active])
+        root[active[done]] = x[done]
+        active = active[~done]
+
+    root[active] = lo[active]
+    return root * c * mu
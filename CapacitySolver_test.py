@@ -0,0 +1,46 @@
+from unittest import TestCase
+import numpy as np
+import CapacitySolver as s
+import MD1Queue
+import MG1Queue
+import MM1Queue
+import MMcQueue
+
+
+class TestCapacitySolver(TestCase):
+    def test_mm1(self):
+        #lamda = 15, mu = 20 gives lq = 2.25, wq = 0.15 and w = 0.2
+        self.assertAlmostEqual(15, s.max_lamda(MM1Queue.MM1Queue, 20, 2.25, 'lq'))
+        self.assertAlmostEqual(15, s.max_lamda(MM1Queue.MM1Queue, 20, 0.15, 'wq'))
+        self.assertAlmostEqual(15, s.max_lamda(MM1Queue.MM1Queue, 20, 0.2, 'w'))
+
+    def test_md1_and_mg1_round_trip(self):
+        for metric in s.METRICS:
+            lamda = s.max_lamda(MD1Queue.MD1Queue, 25, 0.5, metric)
+            self.assertAlmostEqual(0.5, getattr(MD1Queue.MD1Queue(float(lamda), 25), metric))
+
+            lamda = s.max_lamda(MG1Queue.MG1Queue, 25, 0.5, metric, sigma=0.04)
+            self.assertAlmostEqual(0.5, getattr(MG1Queue.MG1Queue(float(lamda), 25, 0.04), metric))
+
+    def test_mmc_round_trip(self):
+        cs = np.array([1, 2, 5, 50, 500])
+        targets = np.array([0.2, 0.5, 0.01, 0.001, 0.0001])
+        for metric in s.METRICS:
+            lamdas = s.max_lamda(MMcQueue.MMcQueue, 2, targets + (0.5 if metric == 'w' else 0), metric, c=cs)
+            for i in range(len(cs)):
+                queue = MMcQueue.MMcQueue(float(lamdas[i]), 2, int(cs[i]))
+                self.assertTrue(queue.is_feasible())
+                expected = targets[i] + (0.5 if metric == 'w' else 0)
+                self.assertAlmostEqual(1, getattr(queue, metric) / expected, places=8)
+
+    def test_invalid(self):
+        #a w target below the service time alone cannot be met
+        self.assertTrue(np.isnan(s.max_lamda(MM1Queue.MM1Queue, 20, 0.01, 'w')))
+        self.assertTrue(np.isnan(s.max_lamda(MMcQueue.MMcQueue, 20, 0.01, 'w', c=3)))
+
+        result = s.max_lamda(MMcQueue.MMcQueue, [20, -1, 20, 20], [0.1, 0.1, 0, 0.1], c=[2, 2, 2, 1.5])
+        self.assertFalse(np.isnan(result[0]))
+        self.assertTrue(np.all(np.isnan(result[1:])))
+
+        with self.assertRaises(ValueError):
+            s.max_lamda(MM1Queue.MM1Queue, 20, 1, 'l')
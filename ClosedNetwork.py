@@ -0,0 +1,280 @@
+"""
+Closed queueing networks: a fixed population of N customers cycling through a set of stations, like requests
+holding one of N pooled connections. The exact solution is the product form: station i holds j customers with
+weight f_i(j) = D_i^j / prod(min(l, c_i), l = 1..j), and the normalizing constants G(k) of the whole network,
+built by convolving the stations' weights, give the throughput G(N - 1) / G(N) and every station's queue length
+distribution. Every term is positive, so working in log space keeps it exact at any N where the recursions of
+exact Mean Value Analysis (MVA) with multi-server stations cancel catastrophically near saturation.
+Schweitzer's approximate MVA replaces the N - 1 customer network an arrival sees by (N - 1) / N of the N
+customer one and solves for the throughput by bisection instead, so its cost does not grow with N.
+"""
+import math
+import numpy as np
+
+
+def _log_factorials(n):
+    """
+    Helper function for log(j!), j = 0..n.
+    Args:
+        n (int): largest j
+
+    Returns: ndarray of n + 1 values
+    """
+    return np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+
+
+def _log_station_weights(demand, c, n):
+    """
+    Helper function for the product-form weights of a station with c servers, in log space:
+    log f(j) = j log D - log(prod(min(l, c), l = 1..j)), j = 0..n.
+    Args:
+        demand (float): service demand per cycle, visits / mu
+        c (int): number of servers
+        n (int): population
+
+    Returns: ndarray of n + 1 values
+    """
+    j = np.arange(n + 1)
+    busy = _log_factorials(min(c, n))[np.minimum(j, c)]
+    return j * math.log(demand) - busy - np.clip(j - c, 0, None) * math.log(c)
+
+
+def _log_convolve(log_g, demand, c):
+    """
+    Helper function that adds a station with c servers to a network whose normalizing constants are log_g,
+    G'(k) = sum(f(j) G(k - j), j = 0..k). Up to c customers the weights f(j) differ; from c on every customer
+    multiplies them by D / c, so that part of the sum is the linear recurrence T(k) = D / c T(k - 1) +
+    f(c) G(k - c), summed in one np.logaddexp.accumulate. The cost is O(n * min(c, n)) instead of O(n^2).
+    Args:
+        log_g (ndarray): log G(k), k = 0..n
+        demand (float): service demand per cycle of the new station
+        c (int): its number of servers
+
+    Returns: ndarray of log G'(k), k = 0..n
+    """
+    n = len(log_g) - 1
+    log_f = _log_station_weights(demand, c, n)
+    head = log_g.copy()
+    for j in range(1, min(c, n + 1)):
+        head[j:] = np.logaddexp(head[j:], log_f[j] + log_g[:n + 1 - j])
+    if c > n:
+        return head
+
+    #T(k) = r^k * sum(r^-m u(m), m = c..k) with u(m) = f(c) G(m - c)
+    log_r = math.log(demand / c)
+    m = np.arange(c, n + 1)
+    tail = m * log_r + np.logaddexp.accumulate(log_f[c] + log_g[:n + 1 - c] - m * log_r)
+    head[c:] = np.logaddexp(head[c:], tail)
+    return head
+
+
+class ClosedNetwork:
+    """
+    Closed network class holds the stations of a closed network: the visit ratio of every station (visits per
+    cycle), its service rate mu per server and its number of servers c. c = math.inf makes a delay station
+    (pure think time, nobody queues). think_time adds a delay outside the stations to every cycle.
+    """
+    __slots__ = ('_visits', '_mu', '_c', '_think_time')
+
+    def __init__(self, visits, mu, c=1, think_time=0.0):
+        """
+        Constructor for closed network class.
+        Args:
+            visits (array_like): average number of visits to every station per cycle
+            mu (array_like): average rate of service completion of every station's servers
+            c (array_like): number of servers of every station, math.inf for a delay station
+            think_time (number): delay per cycle outside the stations
+        """
+        visits = np.atleast_1d(np.asarray(visits, dtype=float))
+        if visits.ndim != 1:
+            raise ValueError('visits must be one value per station')
+        self._visits, self._mu, self._c = (np.broadcast_to(np.asarray(x, dtype=float), visits.shape)
+                                           for x in (visits, mu, c))
+        self._think_time = float(think_time)
+
+    @property
+    def visits(self):
+        """
+        Getter method for visits property
+        Returns: ndarray of visit ratios
+        """
+        return self._visits
+
+    @property
+    def mu(self):
+        """
+        Getter method for mu property
+        Returns: ndarray of service rates
+        """
+        return self._mu
+
+    @property
+    def c(self):
+        """
+        Getter method for c property
+        Returns: ndarray of numbers of servers
+        """
+        return self._c
+
+    @property
+    def think_time(self):
+        """
+        Getter method for think_time property
+        Returns: delay per cycle outside the stations
+        """
+        return self._think_time
+
+    @property
+    def demands(self):
+        """
+        Getter method for demands property
+        Returns: ndarray of service demands per cycle, visits / mu
+        """
+        return self._visits / self._mu
+
+    def is_valid(self, n) -> bool:
+        """
+        Checks the stations and the population: positive visits and mu, c a whole number of at least 1 (or
+        inf), think time >= 0 and n a whole number of at least 1.
+        Args:
+            n (number): population
+
+        Returns: True if everything is valid, False otherwise
+        """
+        c = self._c
+        whole_c = np.isinf(c) | (c == np.floor(c))
+        return bool(np.all(self._visits > 0) and np.all(self._mu > 0) and np.all((c >= 1) & whole_c)
+                    and self._think_time >= 0 and n >= 1 and n == math.floor(n))
+
+    def exact(self, n):
+        """
+        Exact product-form solution for a population of n by the convolution algorithm, in log space. The delay
+        stations and the think time together hold a Poisson number of customers, so their weights start the
+        convolution; every other station is added with _log_convolve. Station i then holds j customers with
+        probability f_i(j) G_-i(n - j) / G(n), where G_-i is the network without station i. The cost is
+        O(n * max c) per convolution and O(stations^2) convolutions.
+        Args:
+            n (int): population
+
+        Returns: dict keyed by throughput, l, w, utilization and cycle_time (see _results); nan if invalid
+        """
+        if not self.is_valid(n):
+            return self._invalid()
+
+        n = int(n)
+        s = 1 / self._mu
+        delay = np.isinf(self._c)
+        demand = self._visits * s
+        #customers at the delay stations and thinking are Poisson with the total delay as their mean
+        total_delay = self._think_time + demand[delay].sum()
+        if total_delay > 0:
+            base = np.arange(n + 1) * math.log(total_delay) - _log_factorials(n)
+        else:
+            base = np.where(np.arange(n + 1) == 0, 0.0, -np.inf)
+
+        queues = np.flatnonzero(~delay)
+        c = np.where(delay, 1, self._c).astype(int)
+        log_g = base
+        for i in queues:
+            log_g = _log_convolve(log_g, demand[i], c[i])
+        #rounding in log space can put x a few ulps past the bottleneck's capacity, which is a hard bound
+        x = math.exp(log_g[n - 1] - log_g[n])
+        if len(queues):
+            x = min(x, float(np.min(c[queues] / demand[queues])))
+
+        r = s.copy()
+        j = np.arange(n + 1)
+        for i in queues:
+            log_rest = base
+            for other in queues[queues != i]:
+                log_rest = _log_convolve(log_rest, demand[other], c[other])
+            p = np.exp(_log_station_weights(demand[i], c[i], n) + log_rest[::-1] - log_g[n])
+            r[i] = (j @ p) / (x * self._visits[i])
+
+        return self._results(x, r)
+
+    def approximate(self, n, tolerance=1e-10, max_iterations=200):
+        """
+        Schweitzer's approximate MVA (also called Bard-Schweitzer) for a population of n: the queue lengths
+        an arrival sees are taken as (n - 1) / n of the ones at n. Multi-server stations use Seidmann's
+        approximation, a single server c times as fast followed by a delay of S (c - 1) / c.
+        For a given throughput X the fixed point has a closed form,
+        Q_i = X V_i S_i / (1 - (n - 1) / n * X V_i S_i / c_i), and X Z + sum(Q_i) grows with X up to the bound
+        X_max where the bottleneck's denominator reaches 0, so X is found by bisecting its headroom
+        e = 1 - X / X_max against the population n. Working with e keeps the denominators free of cancellation
+        when the bottlenecks are nearly balanced and e is tiny. Every step is O(stations) whatever n is.
+        Args:
+            n (number): population
+            tolerance (float): stop once e is known to this relative accuracy
+            max_iterations (int): upper bound on the number of bisection steps
+
+        Returns: dict keyed by throughput, l, w, utilization and cycle_time (see _results); nan if invalid
+        """
+        if not self.is_valid(n):
+            return self._invalid()
+
+        s = 1 / self._mu
+        delay = np.isinf(self._c)
+        c = np.where(delay, 1.0, self._c)
+        fast = np.where(delay, 0.0, s / c)
+        #Seidmann: the rest of the service time is spent as a delay that nobody queues for
+        fixed = np.where(delay, s, s - fast)
+        seen = (n - 1) / n
+        demand = self._visits * s
+        queued = seen * self._visits * fast
+        top = queued.max()
+        if top == 0:
+            #nobody queues behind anybody, so the response times are the service times
+            x = n / (self._think_time + demand.sum())
+            return self._results(x, fast + fixed)
+
+        #denominators 1 - seen X V_i S_i / c_i at X = (1 - e) X_max, written without cancellation
+        rest = (top - queued) / top
+        share = queued / top
+
+        def population(e):
+            x = (1 - e) / top
+            return x * self._think_time + (x * demand / (rest + e * share)).sum()
+
+        #e = 1 is X = 0, below the population; halve e until the population is above n
+        hi, lo = 1.0, 0.5
+        while population(lo) <= n:
+            hi, lo = lo, lo / 2
+        for _ in range(max_iterations):
+            mid = math.sqrt(lo * hi)
+            if population(mid) > n:
+                lo = mid
+            else:
+                hi = mid
+            if hi - lo <= tolerance * hi:
+                break
+
+        e = math.sqrt(lo * hi)
+        x = (1 - e) / top
+        q = x * demand / (rest + e * share)
+        return self._results(x, fast * (1 + seen * q) + fixed)
+
+    def _results(self, x, r):
+        """
+        Helper function that derives the result dict from the throughput and the response times.
+        Args:
+            x (float): throughput, cycles per unit time
+            r (ndarray): response time of every station per visit
+
+        Returns: dict with throughput, l (customers at every station), w (response time per visit),
+            utilization (busy fraction of each server, 0 for delay stations) and cycle_time (time per cycle
+            spent at the stations)
+        """
+        c = self._c
+        utilization = np.where(np.isinf(c), 0.0, x * self.demands / np.where(np.isinf(c), 1.0, c))
+        return {'throughput': float(x), 'l': x * self._visits * r, 'w': r, 'utilization': utilization,
+                'cycle_time': float(self._visits @ r)}
+
+    def _invalid(self):
+        """
+        Helper function for the results of an invalid network or population.
+        Returns: dict like _results with every value nan
+        """
+        nan = np.full(self._visits.shape, np.nan)
+        return {'throughput': math.nan, 'l': nan, 'w': nan.copy(), 'utilization': nan.copy(),
+                'cycle_time': math.nan}
@@ -0,0 +1,23 @@
+"""
+Benchmark of the closed network solvers: the exact convolution against Schweitzer's approximate MVA as the
+population grows, on an app server with four workers, a database and a disk visited twice per request.
+Run with: python ClosedNetwork_bench.py
+"""
+import timeit
+import ClosedNetwork
+
+
+def main():
+    network = ClosedNetwork.ClosedNetwork([1, 1, 2], [2, 5, 8], [4, 1, 1])
+    print(f'{"n":>8} {"exact (ms)":>11} {"approx (ms)":>12} {"X exact":>10} {"X approx":>10}')
+    for n in (10, 100, 1000, 10000, 50000):
+        number = max(1, 1000 // n)
+        exact_time = timeit.timeit(lambda: network.exact(n), number=number) / number * 1e3
+        approximate_time = timeit.timeit(lambda: network.approximate(n), number=number) / number * 1e3
+        exact = network.exact(n)['throughput']
+        approximate = network.approximate(n)['throughput']
+        print(f'{n:>8} {exact_time:>11.2f} {approximate_time:>12.2f} {exact:>10.6f} {approximate:>10.6f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+from unittest import TestCase
+import itertools
+import math
+import numpy as np
+import ClosedNetwork as cn
+
+
+def brute_force(demands, c, n):
+    #product-form solution summed over every way of placing n customers; c = inf is a delay station
+    def weight(d, servers, k):
+        return d ** k / math.prod(min(i, servers) for i in range(1, k + 1))
+
+    def states(total):
+        for split in itertools.product(range(total + 1), repeat=len(demands)):
+            if sum(split) == total:
+                yield split
+
+    def normalizer(total):
+        return sum(math.prod(weight(d, s, k) for d, s, k in zip(demands, c, split)) for split in states(total))
+
+    g = normalizer(n)
+    l = np.zeros(len(demands))
+    for split in states(n):
+        l += np.array(split) * math.prod(weight(d, s, k) for d, s, k in zip(demands, c, split)) / g
+    return normalizer(n - 1) / g, l
+
+
+class TestClosedNetwork(TestCase):
+    def setUp(self):
+        #an app server with four workers, a database and a disk, visited twice per request
+        self.network = cn.ClosedNetwork([1, 1, 2], [2, 5, 8], [4, 1, 1])
+
+    def test_exact_single_server(self):
+        network = cn.ClosedNetwork([1, 2], [4, 5])
+        for n in (1, 2, 6):
+            x, l = brute_force(network.demands, [1, 1], n)
+            m = network.exact(n)
+            self.assertAlmostEqual(x, m['throughput'])
+            np.testing.assert_allclose(l, m['l'])
+            self.assertAlmostEqual(n, m['l'].sum())
+
+    def test_exact_multi_server(self):
+        for n in (1, 3, 7):
+            x, l = brute_force(self.network.demands, [4, 1, 1], n)
+            m = self.network.exact(n)
+            self.assertAlmostEqual(x, m['throughput'])
+            np.testing.assert_allclose(l, m['l'])
+            #Little's Law at every station
+            np.testing.assert_allclose(m['l'], m['throughput'] * self.network.visits * m['w'])
+            self.assertAlmostEqual(n / m['throughput'], m['cycle_time'])
+
+    def test_think_time(self):
+        #a think time is a delay station
+        network = cn.ClosedNetwork([1, 1], [2, 5], [3, 1], think_time=0.8)
+        delay = cn.ClosedNetwork([1, 1, 1], [2, 5, 1 / 0.8], [3, 1, math.inf])
+        x, l = brute_force(delay.demands, [3, 1, math.inf], 5)
+        for m in (network.exact(5), delay.exact(5)):
+            self.assertAlmostEqual(x, m['throughput'])
+            np.testing.assert_allclose(l[:2], m['l'][:2])
+        self.assertEqual(0, delay.exact(5)['utilization'][2])
+
+    def test_approximate(self):
+        #Schweitzer is within a few percent of exact MVA with single servers
+        network = cn.ClosedNetwork([1, 1, 2], [2, 5, 10])
+        for n in (2, 5, 50):
+            exact = network.exact(n)
+            approximate = network.approximate(n)
+            self.assertAlmostEqual(1, approximate['throughput'] / exact['throughput'], delta=0.05)
+            self.assertAlmostEqual(n, approximate['l'].sum(), places=6)
+        #Seidmann's multi-server approximation is rougher at small n but closes in as n grows
+        for n, delta in ((5, 0.15), (50, 0.01)):
+            ratio = self.network.approximate(n)['throughput'] / self.network.exact(n)['throughput']
+            self.assertAlmostEqual(1, ratio, delta=delta)
+
+    def test_exact_saturated(self):
+        #a multi-server bottleneck far into saturation: X and the utilizations stay within their bounds
+        network = cn.ClosedNetwork([1, 1], [1, 20], [8, 1])
+        x, l = brute_force(network.demands, [8, 1], 40)
+        m = network.exact(40)
+        self.assertAlmostEqual(1, m['throughput'] / x, places=12)
+        np.testing.assert_allclose(l, m['l'], rtol=1e-12)
+        for n in (50, 200, 2000):
+            m = network.exact(n)
+            self.assertLessEqual(m['throughput'], 8)
+            self.assertAlmostEqual(8, m['throughput'], places=9)
+            self.assertTrue(np.all((m['utilization'] >= 0) & (m['utilization'] <= 1)))
+            self.assertAlmostEqual(n, m['l'].sum(), places=6)
+        #the machine repairman: 16 servers and a think time, the rest of the customers think
+        m = cn.ClosedNetwork([1], [1], [16], think_time=2).exact(200)
+        self.assertLessEqual(m['throughput'], 16)
+        self.assertAlmostEqual(16, m['throughput'], places=9)
+        self.assertAlmostEqual(200, m['l'][0] + m['throughput'] * 2, places=6)
+
+    def test_large_population(self):
+        m = self.network.approximate(50000)
+        #throughput is capped by the bottleneck: the disk with 2 / 8 per cycle
+        self.assertAlmostEqual(4, m['throughput'], places=3)
+        self.assertAlmostEqual(1, m['utilization'][2], places=4)
+        self.assertGreater(m['l'][2], 49000)
+        self.assertAlmostEqual(m['throughput'], self.network.exact(50000)['throughput'], places=3)
+
+    def test_approximate_balanced(self):
+        #nearly balanced bottlenecks share the population without stalling; the customers add up to n
+        network = cn.ClosedNetwork([1, 1, 1], [1, 1.0001, 1.0002])
+        m = network.approximate(50000)
+        self.assertTrue(0.999 < m['throughput'] < 1)
+        self.assertAlmostEqual(50000, m['l'].sum(), places=3)
+        self.assertTrue(m['l'][0] > m['l'][1] > m['l'][2])
+        m = cn.ClosedNetwork([1, 1, 1], 1).approximate(50000)
+        np.testing.assert_allclose(np.full(3, 50000 / 3), m['l'])
+        #a short bisection is less accurate but still an answer
+        m = self.network.approximate(50, max_iterations=2)
+        self.assertFalse(math.isnan(m['throughput']))
+
+    def test_invalid_values(self):
+        m = self.network.exact(0)
+        self.assertTrue(math.isnan(m['throughput']))
+        self.assertTrue(np.all(np.isnan(m['l'])))
+        self.assertTrue(math.isnan(cn.ClosedNetwork([1, 1], [2, -1]).approximate(3)['throughput']))
+        self.assertTrue(math.isnan(cn.ClosedNetwork([1, 1], 2, [1, 1.5]).exact(3)['throughput']))
+        with self.assertRaises(ValueError):
+            cn.ClosedNetwork([[1, 1]], 2)
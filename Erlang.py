@@ -0,0 +1,164 @@
+"""
+Numerically stable Erlang formulas shared by the multi-server queues.
+Everything is built on the Erlang-B recurrence
+    B(0) = 1,  B(k) = a * B(k-1) / (k + a * B(k-1))
+which needs O(c) float operations, no factorials, and never overflows. The normalizing sum
+S(c) = sum(a^i / i!, i = 0..c) that p0 needs is carried alongside it in log space, using
+S(k) / S(k-1) = 1 / (1 - B(k)) = 1 + a * B(k-1) / k.
+Scalar arguments run a plain Python loop; array arguments broadcast and run the same loop vectorized.
+"""
+import math
+import numpy as np
+from numbers import Number
+
+
+def erlang_b_log_s(a, c, with_log_s=True):
+    """
+    Runs the Erlang-B recurrence up to c servers.
+    Args:
+        a (number or array_like): offered load lamda / mu
+        c (int or array_like): number of servers
+        with_log_s (bool): whether to carry log S(c) as well; skipping it saves a log per step
+
+    Returns: tuple of (Erlang-B blocking probability, log of the normalizing sum S(c) or None)
+    """
+    if isinstance(a, Number) and isinstance(c, Number):
+        a = float(a)
+        b = 1.0
+        log_s = 0.0
+        for k in range(1, int(c) + 1):
+            ab = a * b
+            if with_log_s:
+                log_s += math.log1p(ab / k)
+            b = ab / (k + ab)
+        return b, (log_s if with_log_s else None)
+
+    a, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(c))
+    shape = a.shape
+
+    #sort by c, largest first, so the elements that still have servers left to add at step k are a prefix
+    order = np.argsort(-c.ravel(), kind='stable')
+    a = a.ravel()[order]
+    c = c.ravel()[order]
+    c_max = int(c[0]) if len(c) else 0
+    active_counts = np.searchsorted(-c, -np.arange(1, c_max + 1), side='right')
+
+    b = np.ones(a.shape)
+    log_s = np.zeros(a.shape) if with_log_s else None
+    for k in range(1, c_max + 1):
+        n = active_counts[k - 1]
+        ab = a[:n] * b[:n]
+        if with_log_s:
+            log_s[:n] += np.log1p(ab / k)
+        b[:n] = ab / (k + ab)
+
+    unsorted_b = np.empty_like(b)
+    unsorted_b[order] = b
+    if not with_log_s:
+        return unsorted_b.reshape(shape), None
+    unsorted_log_s = np.empty_like(log_s)
+    unsorted_log_s[order] = log_s
+    return unsorted_b.reshape(shape), unsorted_log_s.reshape(shape)
+
+
+def erlang_b_curve(a, c_max):
+    """
+    Runs the Erlang-B recurrence once up to c_max servers and keeps every step, so the results for all
+    server counts cost O(c_max) in total instead of one recurrence per server count.
+    Args:
+        a (number): offered load lamda / mu
+        c_max (int): largest number of servers
+
+    Returns: tuple of ndarrays (Erlang-B blocking probability, log of S(c)) indexed by c = 0..c_max
+    """
+    a = float(a)
+    b = [1.0]
+    bk = 1.0
+    for k in range(1, c_max + 1):
+        ab = a * bk
+        bk = ab / (k + ab)
+        b.append(bk)
+
+    b = np.array(b)
+    log_s = np.zeros(c_max + 1)
+    np.cumsum(np.log1p(a * b[:-1] / np.arange(1, c_max + 1)), out=log_s[1:])
+    return b, log_s
+
+
+def erlang_b(a, c):
+    """
+    Erlang-B formula, the blocking probability of an M/M/c/c loss system.
+    Args:
+        a (number or array_like): offered load lamda / mu
+        c (int or array_like): number of servers
+
+    Returns: blocking probability (float or ndarray)
+    """
+    return erlang_b_log_s(a, c, with_log_s=False)[0]
+
+
+def erlang_c(a, c):
+    """
+    Erlang-C formula, the probability that an arriving customer has to wait in an M/M/c queue.
+    Args:
+        a (number or array_like): offered load lamda / mu, must be less than c
+        c (int or array_like): number of servers
+
+    Returns: probability of waiting (float or ndarray)
+    """
+    return erlang_c_p0(a, c)[0]
+
+
+def erlang_c_p0(a, c):
+    """
+    Calculates the Erlang-C probability of waiting together with p0, the probability of an empty
+    M/M/c system, from a single pass of the recurrence.
+    Args:
+        a (number or array_like): offered load lamda / mu, must be less than c
+        c (int or array_like): number of servers
+
+    Returns: tuple of (probability of waiting, p0)
+    """
+    b, log_s = erlang_b_log_s(a, c)
+    if isinstance(b, float):
+        ro = a / c
+        return b / (1 - ro * (1 - b)), math.exp(-log_s) / (1 - b + b / (1 - ro))
+
+    ro = np.divide(a, c)
+    return b / (1 - ro * (1 - b)), np.exp(-log_s) / (1 - b + b / (1 - ro))
+
+
+def erlang_b_servers(a, p_max):
+    """
+    Finds the smallest number of servers c with Erlang-B blocking B(c) < p_max for every element of the
+    broadcast a and p_max arrays. B falls with every server added, so each query runs the recurrence until it
+    drops below its target and leaves the loop; the cost is O(c) steps for the largest answer, and a step
+    only touches the queries that are still searching.
+    Args:
+        a (array_like): offered loads lamda / mu, greater than 0
+        p_max (array_like): blocking targets between 0 and 1
+
+    Returns: float ndarray with the smallest c for every query, nan where an argument is invalid
+    """
+    a, p_max = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(p_max, dtype=float))
+    shape = a.shape
+    a, p_max = a.ravel(), p_max.ravel()
+    valid = (a > 0) & (p_max > 0) & (p_max <= 1)
+    result = np.full(a.shape, np.nan)
+
+    #the queries still searching, kept packed so finished ones cost nothing
+    index = np.flatnonzero(valid)
+    a_k, p_k = a[index], p_max[index]
+    b = np.ones(index.shape)
+    k = 0
+    while len(index):
+        k += 1
+        ab = a_k * b
+        b = ab / (k + ab)
+        done = b < p_k
+        if done.any():
+            result[index[done]] = k
+            searching = ~done
+            index, a_k, p_k, b = index[searching], a_k[searching], p_k[searching], b[searching]
+
+    return result.reshape(shape)
@@ -0,0 +1,459 @@
+import Erlang
+import MMcQueue
+import QueueMetrics
+import math
+import numpy as np
+from numbers import Number
+
+#integrand values this far (in log) below the peak are under double precision and dropped
+LOG_TOLERANCE = 45.0
+#scenarios integrated together, which bounds the size of the quadrature grid
+CHUNK = 2048
+#bisection steps for the integration limits and the percentiles
+BISECTIONS = 60
+
+
+def _panel_rule():
+    """
+    Helper function for the fixed quadrature rule on [0, 1] that _waiting_integral scales to both sides of the
+    peak: 8-point Gauss-Legendre on panels that shrink geometrically towards 0, where the integrand peaks and
+    its scale can be tiny, and are even further out, where it falls off by up to LOG_TOLERANCE.
+    Returns: tuple of ndarrays (nodes, weights)
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(8)
+    edges = np.unique(np.concatenate((2.0 ** -np.arange(30, 0, -1), np.linspace(0, 1, 17))))
+    widths = np.diff(edges)[:, None]
+    return (edges[:-1, None] + widths * (nodes + 1) / 2).ravel(), (widths * weights / 2).ravel()
+
+
+_NODES, _WEIGHTS = _panel_rule()
+
+
+def _log_integrand(a, y, v):
+    """
+    Helper function for the exponent of the waiting-state integrand, y (1 - e^-v) - a v, which is concave in v.
+    """
+    return -a * v - y * np.expm1(-v)
+
+
+def _waiting_integral(a, y, v0):
+    """
+    Helper function for the waiting states of the M/M/c+M queue in integral form. With a = c mu / theta and
+    y = lamda / theta, state c + j weighs t_j = prod(y / (a + i), i = 1..j) relative to state c, and
+    sum(t_j z^j) = a * integral(e^(-a v + y z (1 - e^-v)), v = 0..inf), so the weights sum to
+    T = a * integral(e^f) with f = _log_integrand, and sum(j t_j) = a * integral(y (1 - e^-v) e^f).
+    Summing t_j term by term takes O(1 / theta) terms; here f is cut off LOG_TOLERANCE below its peak on both
+    sides and each side gets the fixed _panel_rule, so the cost is the same whatever theta is.
+    Args:
+        a (ndarray): flat array of c mu / theta
+        y (ndarray): flat array of lamda / theta
+        v0 (ndarray): flat array of lower limits, at least 0
+
+    Returns: tuple of flat ndarrays (log of integral(e^f, v = v0..inf), y times the mean of 1 - e^-v under e^f)
+    """
+    log_integral, mean = np.empty(a.shape), np.empty(a.shape)
+    for start in range(0, len(a), CHUNK):
+        part = slice(start, start + CHUNK)
+        log_integral[part], mean[part] = _integrate_chunk(a[part], y[part], v0[part])
+    return log_integral, mean
+
+
+def _integrate_chunk(a, y, v0):
+    """
+    Helper function that does the work of _waiting_integral for at most CHUNK scenarios.
+    Returns: tuple of flat ndarrays, see _waiting_integral
+    """
+    peak = np.maximum(np.log(y / a), v0)
+    top = _log_integrand(a, y, peak)
+    floor = top - LOG_TOLERANCE
+
+    #right of the peak: double the reach until the integrand is below the floor, then bisect
+    reach = np.ones(a.shape)
+    while True:
+        short = _log_integrand(a, y, peak + reach) > floor
+        if not short.any():
+            break
+        reach = np.where(short, 2 * reach, reach)
+    lo = np.zeros(a.shape)
+    for _ in range(BISECTIONS):
+        mid = (lo + reach) / 2
+        above = _log_integrand(a, y, peak + mid) > floor
+        lo = np.where(above, mid, lo)
+        reach = np.where(above, reach, mid)
+
+    #left of the peak the integrand may still be above the floor at v0
+    lo, hi = v0, peak
+    for _ in range(BISECTIONS):
+        mid = (lo + hi) / 2
+        above = _log_integrand(a, y, mid) > floor
+        lo = np.where(above, lo, mid)
+        hi = np.where(above, mid, hi)
+    left = peak - np.where(_log_integrand(a, y, v0) >= floor, v0, hi)
+
+    total = np.zeros(a.shape)
+    moment = np.zeros(a.shape)
+    for span in (reach, -left):
+        v = peak[:, None] + span[:, None] * _NODES
+        weight = (np.exp(_log_integrand(a[:, None], y[:, None], v) - top[:, None])
+                  * np.abs(span)[:, None] * _WEIGHTS)
+        total += weight.sum(axis=1)
+        moment += (weight * -np.expm1(-v)).sum(axis=1)
+    return top + np.log(total), y * moment / total
+
+
+def _abandonment_metrics(lamda, mu, c, theta):
+    """
+    Helper function for the M/M/c+M metrics of the broadcast arguments. Relative to S(c) = sum(r^n / n!,
+    n = 0..c), the states below c weigh 1 - B in total and the states from c on weigh B * T, where B is
+    Erlang B, so only the O(c) Erlang recurrence and the waiting-state integral are needed.
+    Args:
+        lamda (number or ndarray): average rates of arrival
+        mu (number or ndarray): average rates of service completion
+        c (number or ndarray): numbers of servers
+        theta (number or ndarray): patience rates, greater than 0
+
+    Returns: tuple of flat ndarrays (p0, lq, probability of waiting, log p0, log of the integral behind T)
+    """
+    lamda, mu, c, theta = (np.atleast_1d(x).ravel() for x in np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (lamda, mu, c, theta))))
+    c = c.astype(int)
+    if len(c) == 1:
+        #a single queue runs the scalar recurrence, which is much faster than the vectorized one for one element
+        b, log_s = Erlang.erlang_b_log_s(float(lamda[0] / mu[0]), int(c[0]))
+    else:
+        b, log_s = Erlang.erlang_b_log_s(lamda / mu, c)
+    a = c * mu / theta
+    log_integral, mean_j = _waiting_integral(a, lamda / theta, np.zeros(a.shape))
+
+    with np.errstate(divide='ignore'):
+        log_waiting = np.log(b) + np.log(a) + log_integral
+    log_z = np.logaddexp(np.log1p(-b), log_waiting)
+    p_wait = np.exp(log_waiting - log_z)
+    log_p0 = -log_s - log_z
+    return np.exp(log_p0), p_wait * mean_j, p_wait, log_p0, log_integral
+
+
+def _wait_exceedance(t, a, y, theta, p_wait, log_integral):
+    """
+    Helper function for P(Wq > t), flat arrays. A customer who finds c + j customers reaches a server after
+    the j customers ahead of them have left, one at a time at rate c mu + i theta, i = j..0. Weighted by t_j,
+    those hypoexponential waits have the density c mu e^f(theta t) (see _waiting_integral), so the virtual
+    wait V of a waiting customer has P(V > t) = integral(e^f, v = theta t..inf) / integral(e^f, v = 0..inf).
+    The customer's own patience is independent of V, so P(Wq > t) = p_wait * P(V > t) * e^(-theta t).
+    Args:
+        t (ndarray): waiting times
+        a (ndarray): c mu / theta
+        y (ndarray): lamda / theta
+        theta (ndarray): patience rates
+        p_wait (ndarray): probabilities of waiting
+        log_integral (ndarray): log of integral(e^f, v = 0..inf)
+
+    Returns: flat ndarray of probabilities
+    """
+    v0 = theta * np.clip(t, 0, None)
+    log_tail = _waiting_integral(a, y, v0)[0]
+    return np.where(t >= 0, p_wait * np.exp(log_tail - log_integral - v0), 1.0)
+
+
+class ErlangAQueue(MMcQueue.MMcQueue):
+    """
+    Erlang A queue class is an MMC queue whose waiting customers abandon: each one gives up after an
+    exponential patience with rate theta (M/M/c+M).
+    Abandonment keeps the queue bounded, so it has a steady state and finite metrics even when
+    ro = lamda / (c * mu) >= 1; the queue is feasible whenever it is valid.
+    wq and w are averaged over every arrival, including those that abandon, and so is the waiting time
+    distribution behind wait_exceedance and wait_percentile.
+    """
+    __slots__ = ('_theta', '_p_wait')
+
+    #p_wait is set by _calc_metrics alongside lq and p0
+    _metric_fields = MMcQueue.MMcQueue._metric_fields + ('_p_wait',)
+
+    def __init__(self, lamda, mu, c, theta):
+        """
+        Constructor for Erlang A queue class. Uses the same arguments as MMC queue with the addition of theta.
+        Args:
+            lamda (number): average rate of arrival (scalar or iterable)
+            mu (number): average rate of service completion
+            c (number): number of servers in the queue
+            theta (number): patience rate, one over the average time a customer is willing to wait
+        """
+        super().__init__(lamda, mu, c)
+        self.theta = theta
+
+    def __str__(self):
+        """
+        Method that returns a string representation of a queue's object state.
+        Returns: String
+        """
+        m = self.metrics()
+        return (
+            f'ErlangAQueue instance at {id(self)}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t theta: {self.theta}'
+            f'\n\t P0: {m.p0}'
+            f'\n\t P wait: {self.p_wait}'
+            f'\n\t P abandon: {self.p_abandon}'
+            f'\n\t lq: {m.lq}'
+            f'\n\t l: {m.l}'
+            f'\n\t wq: {m.wq}'
+            f'\n\t w: {m.w}'
+            f'\n\t c: {self.c}'
+        )
+
+    @property
+    def theta(self):
+        """
+        Getter method for property theta
+        Returns: the patience rate of waiting customers
+        """
+        return self._theta
+
+    @theta.setter
+    def theta(self, theta):
+        """
+        Setter method for property theta; does error checking on the argument. Without abandonment
+        (theta = 0) use MMcQueue instead.
+        Args:
+            theta (number): patience rate
+        Returns: None
+        """
+        self._recalc_needed = True
+        if isinstance(theta, Number) and 0 < theta < math.inf:
+            self._theta = theta
+        else:
+            self._theta = math.nan
+
+    @property
+    def p_wait(self):
+        """
+        Getter method for p_wait property. Values for p_wait are set in calc_metrics.
+        Returns: probability that an arriving customer finds every server busy and has to wait
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+        return self._p_wait
+
+    @property
+    def p_abandon(self):
+        """
+        Getter method for p_abandon property. Waiting customers abandon at rate theta each, so
+        abandonments happen at rate theta * lq.
+        Returns: probability that an arriving customer abandons before service
+        """
+        return self.theta * self.lq / self.lamda
+
+    @property
+    def lamda_eff(self):
+        """
+        Getter method for lamda_eff property
+        Returns: rate of the arrivals that are served
+        """
+        return self.lamda * (1 - self.p_abandon)
+
+    @property
+    def l(self):
+        """
+        Getter method for l property; the customers in service are lamda_eff / mu.
+        Returns: average number of people in the system
+        """
+        return self.lq + self.lamda_eff / self.mu
+
+    @property
+    def utilization(self):
+        """
+        Getter method for utilization property. Unlike ro, which is the offered load per server, this is the
+        fraction of time each server is busy.
+        Returns: lamda_eff / (c * mu)
+        """
+        return self.lamda_eff / (self.c * self.mu)
+
+    def metrics(self):
+        """
+        Calculates every metric once and returns them together. Customers in service are lamda_eff / mu;
+        r and ro stay the offered load, as in the properties.
+        Returns: QueueMetrics snapshot
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+
+        lamda = self._lamda
+        lq = self._lq
+        l = lq + lamda * (1 - self._theta * lq / lamda) / self._mu
+        return QueueMetrics.QueueMetrics(lamda, self._mu, self.r, self.ro, self._p0, lq, l, lq / lamda,
+                                         l / lamda)
+
+    def is_valid(self) -> bool:
+        """
+        Checks to see if lamda, mu, c and theta are not nan
+
+        Returns: True if all arguments are valid, False otherwise
+        """
+        return super().is_valid() and not math.isnan(self.theta)
+
+    def is_feasible(self) -> bool:
+        """
+        Abandonment keeps the queue stable for any load, so every valid queue is feasible.
+
+        Returns: True if all arguments are valid
+        """
+        return self.is_valid()
+
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key, adding theta to the MMcQueue key.
+        Returns: tuple key
+        """
+        return super()._cache_key() + (self._theta,)
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, c, theta):
+        """
+        Calculates the M/M/c+M metrics for every element of the broadcast lamda, mu, c and theta arrays in one
+        pass: one Erlang-B recurrence over all the scenarios and one waiting-state integral each.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            theta (array_like): patience rates
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq, ro, p_wait and p_abandon
+        """
+        lamda, mu, c, theta = cls._batch_params(lamda, mu, c, theta)
+        ro = lamda / (mu * c)
+        valid = ~np.isnan(ro) & np.isfinite(theta)
+
+        #placeholder values where the scenario will be masked out anyway
+        results = _abandonment_metrics(*(np.where(valid, x, 1.0) for x in (lamda, mu, c, theta)))
+        p0, lq, p_wait = (np.where(valid, x.reshape(ro.shape), np.nan) for x in results[:3])
+
+        p_abandon = theta * lq / lamda
+        l = lq + lamda * (1 - p_abandon) / mu
+        return {'lq': lq, 'p0': p0, 'l': l, 'w': l / lamda, 'wq': lq / lamda, 'ro': ro, 'p_wait': p_wait,
+                'p_abandon': p_abandon}
+
+    def staffing_curve(self, c_max, c_min=1):
+        """
+        Calculates the metrics of this queue's lamda, mu and theta for every number of servers from c_min to
+        c_max with one batch_metrics call. An invalid lamda, mu or theta gives math.nan everywhere.
+        Args:
+            c_max (int): largest number of servers
+            c_min (int): smallest number of servers
+
+        Returns: dict of NumPy arrays keyed by c, p0, lq, wq, w, p_wait and p_abandon
+        """
+        cs = np.arange(c_min, c_max + 1)
+        m = self.batch_metrics(self.lamda, self.mu, cs, self.theta)
+        return {'c': cs, 'p0': m['p0'], 'lq': m['lq'], 'wq': m['wq'], 'w': m['w'], 'p_wait': m['p_wait'],
+                'p_abandon': m['p_abandon']}
+
+    @classmethod
+    def batch_wait_percentile(cls, lamda, mu, c, theta, q):
+        """
+        Calculates waiting time percentiles for every element of the broadcast lamda, mu, c, theta and q arrays
+        in one pass. P(Wq > t) <= p_wait e^(-theta t) bounds every answer, so all the brackets are bisected
+        together on the vectorized P(Wq > t) straight away.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            theta (array_like): patience rates
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times t with P(Wq <= t) = q; nan for invalid queues or q outside [0, 1],
+            inf for q = 1
+        """
+        params = np.broadcast_arrays(*cls._batch_params(lamda, mu, c, theta), np.asarray(q, dtype=float))
+        shape = params[0].shape
+        lamda, mu, c, theta, q = (np.atleast_1d(x).ravel() for x in params)
+        valid = ~np.isnan(lamda / mu / c) & np.isfinite(theta)
+        lamda, mu, c, theta = (np.where(valid, x, 1.0) for x in (lamda, mu, c, theta))
+        _, _, p_wait, _, log_integral = _abandonment_metrics(lamda, mu, c, theta)
+        a = c.astype(int) * mu / theta
+        y = lamda / theta
+
+        target = 1 - q
+        #neither the wait nor the patience has an upper bound, so q = 1 is left out here and comes back as inf
+        needed = valid & (target < p_wait) & (q < 1)
+        lo = np.zeros(q.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            hi = np.where(needed, np.log(p_wait / target) / theta, 0.0)
+        for _ in range(BISECTIONS):
+            mid = (lo + hi) / 2
+            over = _wait_exceedance(mid, a, y, theta, p_wait, log_integral) > target
+            lo = np.where(over, mid, lo)
+            hi = np.where(over, hi, mid)
+
+        t = np.where(needed, (lo + hi) / 2, np.where(q == 1, np.inf, 0.0))
+        return np.where(valid & (q >= 0) & (q <= 1), t, np.nan).reshape(shape)
+
+    def wait_exceedance(self, t):
+        """
+        Calculates P(Wq > t) for a whole array of t at once, over every arrival like wq: a customer's wait
+        ends when they reach a server or abandon, whichever is first (see _wait_exceedance).
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        c = int(self.c)
+        _, _, p_wait, _, log_integral = _abandonment_metrics(self.lamda, self.mu, c, self.theta)
+        flat = np.atleast_1d(t).ravel()
+        full = np.ones(flat.shape)
+        return _wait_exceedance(flat, full * c * self.mu / self.theta, full * self.lamda / self.theta,
+                                full * self.theta, p_wait, log_integral).reshape(t.shape)
+
+    def wait_percentile(self, q):
+        """
+        Calculates waiting time percentiles, e.g. q = 0.95 for p95, for a whole array of q at once, by
+        bisection on wait_exceedance.
+        Args:
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times; nan for an invalid queue or q outside [0, 1], inf for q = 1
+        """
+        return self.batch_wait_percentile(self.lamda, self.mu, self.c, self.theta, q)
+
+    def state_probabilities(self, n):
+        """
+        Calculates P(N = n) for a whole array of n at once, in log space. Above c the balance equations give
+        P(N = n) = P(N = n - 1) * lamda / (c mu + (n - c) theta).
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        c = int(self.c)
+        log_p0 = float(_abandonment_metrics(self.lamda, self.mu, c, self.theta)[3][0])
+        k = np.clip(n, 0, None)
+        j_max = int(k.max()) - c if k.size else 0
+        #log of prod(lamda / (c mu + i theta)) for the waiting states, relative to state c
+        log_t = np.concatenate(([0.0], np.cumsum(math.log(self.lamda) - np.log(
+            c * self.mu + np.arange(1, max(j_max, 0) + 1) * self.theta))))
+        log_p = self._log_state_terms(np.minimum(k, c), log_p0) + log_t[np.clip(k - c, 0, None)]
+        return np.where(n >= 0, np.exp(log_p), 0.0)
+
+    def _calc_metrics(self):
+        """
+        Calculates and stores lq, p0 and the probability of waiting for an Erlang A queue.
+        This is called whenever lamda, mu, c or theta is set or changed.
+
+        Returns: None
+        """
+        if not self.is_valid():
+            self._lq = math.nan
+            self._p0 = math.nan
+            self._p_wait = math.nan
+            return
+
+        p0, lq, p_wait, _, _ = _abandonment_metrics(self.lamda, self.mu, int(self.c), self.theta)
+        self._p0, self._lq, self._p_wait = float(p0[0]), float(lq[0]), float(p_wait[0])
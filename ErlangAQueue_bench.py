@@ -0,0 +1,47 @@
+"""
+Benchmark of the M/M/c+M metrics: large c far past saturation, patience rates down to 10^-12, where the waiting
+states number about 1 / theta, and batch_metrics over many scenarios.
+Run with: python ErlangAQueue_bench.py
+"""
+import timeit
+import numpy as np
+import ErlangAQueue
+
+
+def single(lamda, mu, c, theta):
+    """
+    Builds a queue and reads wq, which runs the full metrics calculation.
+    Args:
+        lamda (number): average rate of arrival
+        mu (number): average rate of service completion
+        c (int): number of servers
+        theta (number): patience rate
+
+    Returns: wq
+    """
+    return ErlangAQueue.ErlangAQueue(lamda, mu, c, theta).wq
+
+
+def main():
+    print(f'{"lamda":>8} {"c":>6} {"theta":>8} {"time (ms)":>10} {"p_abandon":>10}')
+    for lamda, c, theta in ((5500, 5000, 0.2), (110, 100, 1e-2), (110, 100, 1e-6), (110, 100, 1e-8),
+                            (110, 100, 1e-12)):
+        number = 20
+        elapsed = timeit.timeit(lambda: single(lamda, 1, c, theta), number=number) / number * 1e3
+        p_abandon = ErlangAQueue.ErlangAQueue(lamda, 1, c, theta).p_abandon
+        print(f'{lamda:>8} {c:>6} {theta:>8.0e} {elapsed:>10.2f} {p_abandon:>10.6f}')
+
+    print(f'\n{"scenarios":>10} {"batch (ms)":>11} {"per scenario (us)":>18}')
+    for size in (100, 10000, 100000):
+        lamda = np.linspace(50, 150, size)
+        elapsed = timeit.timeit(lambda: ErlangAQueue.ErlangAQueue.batch_metrics(lamda, 1, 100, 0.1), number=1)
+        print(f'{size:>10} {elapsed * 1e3:>11.1f} {elapsed / size * 1e6:>18.1f}')
+
+    queue = ErlangAQueue.ErlangAQueue(110, 1, 100, 1e-8)
+    elapsed = timeit.timeit(lambda: queue.wait_percentile([0.5, 0.9, 0.99]), number=5) / 5 * 1e3
+    print(f'\nErlangAQueue(110, 1, 100, 1e-8) p50/p90/p99 in {elapsed:.1f} ms: '
+          f'{queue.wait_percentile([0.5, 0.9, 0.99])}')
+
+
+if __name__ == '__main__':
+    main()
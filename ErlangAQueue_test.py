@@ -0,0 +1,159 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MMcQueue
+import ErlangAQueue as q
+
+
+def brute_force(lamda, mu, c, theta, n_max=400):
+    #state probabilities straight from the birth-death balance equations, truncated far out in the tail
+    p = [1.0]
+    for n in range(1, n_max + 1):
+        p.append(p[-1] * lamda / (mu * min(n, c) + theta * max(n - c, 0)))
+    p = np.array(p) / sum(p)
+    lq = sum((n - c) * p[n] for n in range(c, n_max + 1))
+    return p, lq
+
+
+def brute_force_exceedance(lamda, mu, c, theta, t, j_max=200):
+    #P(Wq > t) by uniformization of the pure-death chain of the customers ahead, started from the arrival's state
+    p, _ = brute_force(lamda, mu, c, theta, c + j_max)
+    rates = c * mu + theta * np.arange(j_max + 1)
+    fastest = rates.max()
+    #phase k means k more departures before service, left at rate rates[k - 1]
+    step = np.diag(np.concatenate(([1.0], 1 - rates / fastest))) + np.diag(rates / fastest, 1).T
+    x = np.concatenate(([0.0], p[c:]))
+    exceed = 0.0
+    poisson = math.exp(-fastest * t)
+    for n in range(3000):
+        exceed += poisson * x[1:].sum()
+        x = x @ step
+        poisson *= fastest * t / (n + 1)
+    return exceed * math.exp(-theta * t)
+
+
+class TestErlangAQueue(TestCase):
+    def setUp(self):
+        self.queue = q.ErlangAQueue(15, 4, 3, 0.5)
+
+    def test_init(self):
+        self.assertAlmostEqual(15, self.queue._lamda)
+        self.assertAlmostEqual(4, self.queue._mu)
+        self.assertAlmostEqual(3, self.queue._c)
+        self.assertAlmostEqual(0.5, self.queue._theta)
+        self.assertTrue(self.queue._recalc_needed)
+
+    def test_metrics(self):
+        #ro = 1.25: infeasible for MMcQueue but abandonment keeps it finite
+        self.assertTrue(self.queue.is_feasible())
+        p, lq = brute_force(15, 4, 3, 0.5)
+        self.assertAlmostEqual(p[0], self.queue.p0)
+        self.assertAlmostEqual(lq, self.queue.lq)
+        self.assertAlmostEqual(p[3:].sum(), self.queue.p_wait)
+        self.assertAlmostEqual(0.5 * lq / 15, self.queue.p_abandon)
+        self.assertAlmostEqual(lq / 15, self.queue.wq)
+        #the servers are busy on average as much as the served customers need
+        busy = sum(min(n, 3) * p[n] for n in range(len(p)))
+        self.assertAlmostEqual(busy, self.queue.lamda_eff / 4)
+        self.assertAlmostEqual(lq + busy, self.queue.l)
+        self.assertAlmostEqual(busy / 3, self.queue.utilization)
+        np.testing.assert_allclose(p[:40], self.queue.state_probabilities(np.arange(40)), atol=1e-15)
+
+        m = self.queue.metrics()
+        self.assertAlmostEqual(self.queue.l, m.l)
+        self.assertAlmostEqual(self.queue.w, m.w)
+        self.assertAlmostEqual(self.queue.wq, m.wq)
+
+    def test_limits(self):
+        #theta = mu is the infinite-server queue: N is Poisson(r) and lq = E[(N - c)+]
+        queue = q.ErlangAQueue(15, 4, 3, 4)
+        r = 3.75
+        poisson = np.array([math.exp(-r + n * math.log(r) - math.lgamma(n + 1)) for n in range(200)])
+        self.assertAlmostEqual((np.clip(np.arange(200) - 3, 0, None) * poisson).sum(), queue.lq)
+        #very patient customers with ro < 1 approach MMcQueue
+        self.assertAlmostEqual(MMcQueue.MMcQueue(10, 4, 3).lq, q.ErlangAQueue(10, 4, 3, 1e-9).lq, places=5)
+
+    def test_large_c(self):
+        queue = q.ErlangAQueue(5500, 1, 5000, 0.2)
+        self.assertTrue(math.isfinite(queue.wq))
+        #overloaded, the servers carry c mu and the excess abandons: P(abandon) is about 1 - c mu / lamda
+        self.assertAlmostEqual(1 - 5000 / 5500, queue.p_abandon, places=3)
+        self.assertAlmostEqual(1, queue.p_wait, places=6)
+
+    def test_small_theta(self):
+        #around 10^4 waiting states carry the mass here, which the term by term sum checks
+        p, lq = brute_force(110, 1, 100, 1e-3, 15000)
+        queue = q.ErlangAQueue(110, 1, 100, 1e-3)
+        self.assertAlmostEqual(1, lq / queue.lq, places=9)
+        self.assertAlmostEqual(1, p[100:].sum() / queue.p_wait, places=9)
+        #10^10 waiting states is out of reach for the sum, but the balance of rates still holds
+        queue = q.ErlangAQueue(110, 1, 100, 1e-8)
+        self.assertAlmostEqual(1 / 11, queue.p_abandon, places=6)
+        self.assertAlmostEqual(1, queue.utilization, places=6)
+
+    def test_wait_exceedance(self):
+        t = np.array([-1, 0, 0.1, 0.5, 1, 3])
+        expected = [1] + [brute_force_exceedance(15, 4, 3, 0.5, x) for x in t[1:]]
+        np.testing.assert_allclose(expected, self.queue.wait_exceedance(t), rtol=1e-9)
+        self.assertAlmostEqual(self.queue.p_wait, float(self.queue.wait_exceedance(0)))
+        #wq is the integral of P(Wq > t), here by the trapezoid rule
+        t = np.linspace(0, 40, 40001)
+        exceed = self.queue.wait_exceedance(t)
+        self.assertAlmostEqual(self.queue.wq, float(((exceed[1:] + exceed[:-1]) / 2).sum() * (t[1] - t[0])),
+                               places=6)
+        self.queue.theta = -1
+        self.assertTrue(np.isnan(self.queue.wait_exceedance([0, 1])).all())
+
+    def test_wait_percentile(self):
+        qs = np.array([0, 0.05, 0.5, 0.9, 0.99, 1, 1.5])
+        t = self.queue.wait_percentile(qs)
+        self.assertEqual(0, t[0])
+        #p_wait is about 0.94, so the 5th percentile customer does not wait
+        self.assertEqual(0, t[1])
+        np.testing.assert_allclose(1 - qs[2:5], self.queue.wait_exceedance(t[2:5]), rtol=1e-9)
+        self.assertEqual(math.inf, t[5])
+        self.assertTrue(math.isnan(t[6]))
+
+        theta = np.array([0.5, 2, 1e-6, -1])
+        batch = q.ErlangAQueue.batch_wait_percentile(15, 4, 3, theta[:, None], np.array([0.5, 0.9]))
+        self.assertEqual((4, 2), batch.shape)
+        for i, patience in enumerate(theta[:3]):
+            np.testing.assert_allclose(q.ErlangAQueue(15, 4, 3, patience).wait_percentile([0.5, 0.9]),
+                                       batch[i])
+        self.assertTrue(np.isnan(batch[3]).all())
+
+    def test_staffing_curve(self):
+        curve = self.queue.staffing_curve(6, 2)
+        np.testing.assert_array_equal(np.arange(2, 7), curve['c'])
+        for i, c in enumerate(range(2, 7)):
+            queue = q.ErlangAQueue(15, 4, c, 0.5)
+            for name in ('p0', 'lq', 'wq', 'w', 'p_wait', 'p_abandon'):
+                self.assertAlmostEqual(getattr(queue, name), curve[name][i])
+        self.queue.lamda = -1
+        self.assertTrue(np.isnan(self.queue.staffing_curve(4)['lq']).all())
+
+    def test_invalid_values(self):
+        self.queue.theta = 0
+        self.assertFalse(self.queue.is_valid())
+        self.assertTrue(math.isnan(self.queue.lq))
+        self.assertTrue(math.isnan(self.queue.p_wait))
+        self.queue.theta = 'fast'
+        self.assertTrue(math.isnan(self.queue.theta))
+        self.queue.theta = 0.5
+        self.assertFalse(math.isnan(self.queue.lq))
+
+    def test_batch_metrics(self):
+        lamda = np.array([15, 12, 6, -1])
+        m = q.ErlangAQueue.batch_metrics(lamda, 4, 3, np.array([0.5, 2, 0.1, 0.5]))
+        for i, theta in enumerate((0.5, 2, 0.1)):
+            queue = q.ErlangAQueue(float(lamda[i]), 4, 3, theta)
+            for name in ('lq', 'p0', 'l', 'w', 'wq', 'p_wait', 'p_abandon'):
+                self.assertAlmostEqual(getattr(queue, name), m[name][i])
+        self.assertTrue(math.isnan(m['lq'][3]))
+        self.assertAlmostEqual(self.queue.lq, float(q.ErlangAQueue.batch_metrics(15, 4, 3, 0.5)['lq']))
+
+    def test_str(self):
+        s = str(q.ErlangAQueue(5, 2, 3, 1))
+        self.assertIsInstance(s, str)
+        self.assertIn('ErlangAQueue instance', s)
+        self.assertIn('theta:', s)
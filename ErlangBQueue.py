@@ -0,0 +1,263 @@
+import Erlang
+import MMcQueue
+import QueueMetrics
+import math
+import numpy as np
+
+
+class ErlangBQueue(MMcQueue.MMcQueue):
+    """
+    Erlang B queue class is the M/M/c/c loss system: c servers and no waiting room, so an arrival that finds
+    every server busy is turned away instead of queueing.
+    The blocking probability comes from the Erlang-B recurrence, which needs O(c) float operations and stays
+    stable for c in the millions. Nobody waits, so lq and wq are 0, and Little's Laws use the carried arrival
+    rate lamda_eff = lamda * (1 - p_block).
+    A loss system always has a steady state, so the queue is feasible whenever it is valid.
+    """
+    __slots__ = ('_p_block',)
+
+    #p_block is set by _calc_metrics alongside lq and p0
+    _metric_fields = MMcQueue.MMcQueue._metric_fields + ('_p_block',)
+
+    def __str__(self):
+        """
+        Method that returns a string representation of a queue's object state.
+        Returns: String
+        """
+        m = self.metrics()
+        return (
+            f'ErlangBQueue instance at {id(self)}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t lamda_eff: {self.lamda_eff}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t P0: {m.p0}'
+            f'\n\t P block: {self.p_block}'
+            f'\n\t carried load: {self.carried_load}'
+            f'\n\t utilization: {self.utilization}'
+            f'\n\t c: {self.c}'
+        )
+
+    @property
+    def p_block(self):
+        """
+        Getter method for p_block property, the Erlang B formula. Values for p_block are set in calc_metrics.
+        Returns: the probability that an arrival finds every server busy and is turned away
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+        return self._p_block
+
+    @property
+    def lamda_eff(self):
+        """
+        Getter method for lamda_eff property
+        Returns: rate of the arrivals that are served
+        """
+        return self.lamda * (1 - self.p_block)
+
+    @property
+    def carried_load(self):
+        """
+        Getter method for carried_load property, the part of the offered load r that is served.
+        Returns: average number of busy servers, r * (1 - p_block)
+        """
+        return self.r * (1 - self.p_block)
+
+    @property
+    def utilization(self):
+        """
+        Getter method for utilization property. Unlike ro, which is the offered load per server, this is the
+        fraction of time each server is busy.
+        Returns: carried load / c
+        """
+        return self.carried_load / self.c
+
+    @property
+    def l(self):
+        """
+        Getter method for l property; everyone in the system is in service.
+        Returns: average number of people in the system
+        """
+        return self.lq + self.carried_load
+
+    @property
+    def w(self):
+        """
+        Getter method for w property calculated using Little's Laws with lamda_eff
+        Returns: time a served customer spends in the system
+        """
+        return self.l / self.lamda_eff
+
+    @property
+    def wq(self):
+        """
+        Getter method for wq property calculated using Little's Laws with lamda_eff
+        Returns: time a served customer spends waiting in the queue
+        """
+        return self.lq / self.lamda_eff
+
+    @property
+    def p_wait(self):
+        """
+        Getter method for p_wait property
+        Returns: probability that a served customer has to wait, which is 0 without a waiting room
+        """
+        if not self.is_valid():
+            return math.nan
+
+        return 0.0
+
+    def metrics(self):
+        """
+        Calculates every metric once and returns them together, with Little's Laws on lamda_eff.
+        r and ro stay the offered load, as in the properties.
+        Returns: QueueMetrics snapshot
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+
+        lamda_eff = self._lamda * (1 - self._p_block)
+        lq = self._lq
+        l = lq + lamda_eff / self._mu
+        return QueueMetrics.QueueMetrics(self._lamda, self._mu, self.r, self.ro, self._p0, lq, l,
+                                         lq / lamda_eff, l / lamda_eff)
+
+    def is_feasible(self) -> bool:
+        """
+        A loss system is stable for any load, so every valid queue is feasible.
+
+        Returns: True if all arguments are valid
+        """
+        return self.is_valid()
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, c):
+        """
+        Calculates the M/M/c/c metrics for every element of the broadcast lamda, mu and c arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq, ro, p_block, lamda_eff, carried_load and
+            utilization
+        """
+        lamda, mu, c = cls._batch_params(lamda, mu, c)
+        r = lamda / mu
+        ro = r / c
+        valid = ~np.isnan(ro)
+
+        #placeholder values where the scenario will be masked out anyway
+        b, log_s = Erlang.erlang_b_log_s(np.where(valid, r, 1.0), np.where(valid, c, 1).astype(int))
+        nan = np.full(ro.shape, np.nan)
+        p_block = np.where(valid, b, nan)
+        p0 = np.where(valid, np.exp(-log_s), nan)
+        lq = np.where(valid, 0.0, nan)
+        lamda_eff = lamda * (1 - p_block)
+        carried_load = r * (1 - p_block)
+        l = lq + carried_load
+        return {'lq': lq, 'p0': p0, 'l': l, 'w': l / lamda_eff, 'wq': lq / lamda_eff, 'ro': ro,
+                'p_block': p_block, 'lamda_eff': lamda_eff, 'carried_load': carried_load,
+                'utilization': carried_load / c}
+
+    @classmethod
+    def servers_needed(cls, lamda, mu, p_max):
+        """
+        Finds the smallest number of servers that keeps the blocking probability below p_max, for every
+        element of the broadcast lamda, mu and p_max arrays in one pass (see Erlang.erlang_b_servers).
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            p_max (array_like): blocking targets between 0 and 1
+
+        Returns: float ndarray with the smallest c for every query, nan where an argument is invalid
+        """
+        lamda, mu = cls._batch_params(lamda, mu)
+        return Erlang.erlang_b_servers(lamda / mu, p_max)
+
+    def staffing_curve(self, c_max, c_min=1):
+        """
+        Calculates the blocking probability and utilization of this queue's lamda and mu for every number of
+        servers from c_min to c_max, from a single pass of the Erlang-B recurrence.
+        An invalid lamda or mu gives math.nan everywhere.
+        Args:
+            c_max (int): largest number of servers
+            c_min (int): smallest number of servers
+
+        Returns: dict of NumPy arrays keyed by c, p0, p_block, carried_load and utilization
+        """
+        cs = np.arange(c_min, c_max + 1)
+        if math.isnan(self.lamda) or math.isnan(self.mu):
+            nan = np.full(cs.shape, np.nan)
+            return {'c': cs, 'p0': nan, 'p_block': nan, 'carried_load': nan, 'utilization': nan}
+
+        b, log_s = Erlang.erlang_b_curve(self.r, c_max)
+        b = b[c_min:]
+        carried_load = self.r * (1 - b)
+        return {'c': cs, 'p0': np.exp(-log_s[c_min:]), 'p_block': b, 'carried_load': carried_load,
+                'utilization': carried_load / cs}
+
+    @classmethod
+    def batch_wait_percentile(cls, lamda, mu, c, q):
+        """
+        Waiting time percentiles for every element of the broadcast lamda, mu, c and q arrays. Served
+        customers never wait, so every percentile is 0.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times; nan for invalid queues or q outside [0, 1]
+        """
+        lamda, mu, c, q = np.broadcast_arrays(*cls._batch_params(lamda, mu, c), np.asarray(q, dtype=float))
+        valid = ~np.isnan(lamda) & ~np.isnan(mu) & ~np.isnan(c) & (q >= 0) & (q <= 1)
+        return np.where(valid, 0.0, np.nan)
+
+    def state_probabilities(self, n):
+        """
+        Calculates P(N = n), the truncated Poisson distribution p0 * r^n / n!, for a whole array of n at once
+        in log space; states above c have probability 0.
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        log_p0 = -Erlang.erlang_b_log_s(self.r, int(self.c))[1]
+        return np.where((n >= 0) & (n <= self.c), np.exp(self._log_state_terms(n, log_p0)), 0.0)
+
+    def wait_exceedance(self, t):
+        """
+        Calculates P(Wq > t) for served customers, for a whole array of t at once: 0 for every t >= 0.
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        return np.where(t >= 0, 0.0, 1.0)
+
+    def _calc_metrics(self):
+        """
+        Calculates and stores lq, p0 and the blocking probability for an Erlang B queue.
+        p0 = 1 / S(c) comes out of the same recurrence as the blocking probability.
+        This is called whenever lamda, mu or c is set or changed.
+
+        Returns: None
+        """
+        if not self.is_valid():
+            self._lq = math.nan
+            self._p0 = math.nan
+            self._p_block = math.nan
+            return
+
+        self._p_block, log_s = Erlang.erlang_b_log_s(self.r, int(self.c))
+        self._p0 = math.exp(-log_s)
+        self._lq = 0.0
@@ -0,0 +1,99 @@
+from unittest import TestCase
+import math
+import numpy as np
+import Erlang
+import MMcKQueue
+import ErlangBQueue as q
+
+
+class TestErlangBQueue(TestCase):
+    def setUp(self):
+        self.queue = q.ErlangBQueue(15, 4, 3)
+
+    def test_init(self):
+        self.assertAlmostEqual(15, self.queue._lamda)
+        self.assertAlmostEqual(4, self.queue._mu)
+        self.assertAlmostEqual(3, self.queue._c)
+        self.assertTrue(self.queue._recalc_needed)
+
+    def test_metrics(self):
+        #ro = 1.25 is fine without a waiting room
+        self.assertTrue(self.queue.is_feasible())
+        a = 3.75
+        p = np.array([a ** n / math.factorial(n) for n in range(4)])
+        p = p / p.sum()
+        self.assertAlmostEqual(p[0], self.queue.p0)
+        self.assertAlmostEqual(p[-1], self.queue.p_block)
+        self.assertEqual(0, self.queue.lq)
+        self.assertEqual(0, self.queue.wq)
+        self.assertEqual(0, self.queue.p_wait)
+        self.assertAlmostEqual(15 * (1 - p[-1]), self.queue.lamda_eff)
+        self.assertAlmostEqual(a * (1 - p[-1]), self.queue.carried_load)
+        self.assertAlmostEqual(self.queue.carried_load, self.queue.l)
+        self.assertAlmostEqual(a * (1 - p[-1]) / 3, self.queue.utilization)
+        self.assertAlmostEqual(0.25, self.queue.w)
+        np.testing.assert_allclose(p, self.queue.state_probabilities(np.arange(4)))
+        self.assertEqual(0, self.queue.state_probabilities(4))
+
+        m = self.queue.metrics()
+        self.assertAlmostEqual(self.queue.w, m.w)
+        self.assertAlmostEqual(self.queue.l, m.l)
+
+        #the same system as a finite buffer with K = c
+        k = MMcKQueue.MMcKQueue(15, 4, 3, 3)
+        self.assertAlmostEqual(k.p_block, self.queue.p_block)
+        self.assertAlmostEqual(k.p0, self.queue.p0)
+
+    def test_large_c(self):
+        #c = 10^6 stays in range on both sides of ro = 1
+        for lamda in (0.99e6, 1.01e6):
+            queue = q.ErlangBQueue(lamda, 1, 10 ** 6)
+            self.assertTrue(0 < queue.p_block < 1)
+            self.assertTrue(0 <= queue.p0 < 1)
+            self.assertTrue(queue.carried_load <= 10 ** 6)
+        #overloaded, the servers carry c and block the rest: B is about 1 - 1 / ro
+        self.assertAlmostEqual(1 - 1 / 1.01, queue.p_block, places=3)
+
+    def test_waits(self):
+        self.assertEqual(0, self.queue.wait_exceedance(0))
+        self.assertEqual(1, self.queue.wait_exceedance(-1))
+        np.testing.assert_array_equal([0, 0], self.queue.wait_percentile([0.5, 0.99]))
+
+    def test_invalid_values(self):
+        queue = q.ErlangBQueue(-15, 4, 3)
+        self.assertFalse(queue.is_feasible())
+        self.assertTrue(math.isnan(queue.p_block))
+        self.assertTrue(math.isnan(queue.lq))
+        self.assertTrue(math.isnan(queue.p_wait))
+        self.queue.c = 0
+        self.assertTrue(math.isnan(self.queue.p_block))
+
+    def test_batch_metrics(self):
+        lamda = np.array([15, 12, 6, -1])
+        m = q.ErlangBQueue.batch_metrics(lamda, 4, np.array([3, 3, 5, 3]))
+        for i, c in enumerate((3, 3, 5)):
+            queue = q.ErlangBQueue(float(lamda[i]), 4, c)
+            for name in ('lq', 'p0', 'l', 'w', 'wq', 'p_block', 'lamda_eff', 'carried_load', 'utilization'):
+                self.assertAlmostEqual(getattr(queue, name), m[name][i])
+        self.assertTrue(math.isnan(m['p_block'][3]))
+
+    def test_staffing_curve(self):
+        curve = self.queue.staffing_curve(8)
+        np.testing.assert_array_equal(np.arange(1, 9), curve['c'])
+        for i, c in enumerate(curve['c']):
+            self.assertAlmostEqual(Erlang.erlang_b(3.75, int(c)), curve['p_block'][i])
+
+    def test_servers_needed(self):
+        lamda = np.array([15, 150, 1500])
+        c = q.ErlangBQueue.servers_needed(lamda, 4, 0.01)
+        for i in range(3):
+            #c meets the target and c - 1 does not
+            self.assertLess(q.ErlangBQueue(float(lamda[i]), 4, c[i]).p_block, 0.01)
+            self.assertGreaterEqual(q.ErlangBQueue(float(lamda[i]), 4, c[i] - 1).p_block, 0.01)
+        self.assertTrue(math.isnan(q.ErlangBQueue.servers_needed(-1, 4, 0.01)))
+
+    def test_str(self):
+        s = str(q.ErlangBQueue(5, 2, 3))
+        self.assertIsInstance(s, str)
+        self.assertIn('ErlangBQueue instance', s)
+        self.assertIn('P block:', s)
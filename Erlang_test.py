@@ -0,0 +1,72 @@
+from unittest import TestCase
+import math
+import numpy as np
+import Erlang as e
+
+
+class TestErlang(TestCase):
+    def factorial_p0(self, a, c):
+        #Reference p0 using the textbook factorial sums; only usable for small c
+        term_1 = sum([(a ** i) / math.factorial(i) for i in range(c)])
+        term_2 = (a ** c) / (math.factorial(c) * (1 - a / c))
+        return 1.0 / (term_1 + term_2)
+
+    def test_erlang_b(self):
+        #B(1) = a / (1 + a) and B(2) = a^2 / 2 / (1 + a + a^2 / 2)
+        self.assertAlmostEqual(0.75 / 1.75, e.erlang_b(0.75, 1))
+        self.assertAlmostEqual(0.28125 / 2.03125, e.erlang_b(0.75, 2))
+
+        #zero servers blocks everything
+        self.assertAlmostEqual(1.0, e.erlang_b(3, 0))
+
+    def test_erlang_c_p0_matches_factorials(self):
+        for a, c in ((0.75, 2), (4.5, 5), (40, 50), (120, 140)):
+            p_wait, p0 = e.erlang_c_p0(a, c)
+            expected_p0 = self.factorial_p0(a, c)
+            expected_p_wait = (a ** c) / (math.factorial(c) * (1 - a / c)) * expected_p0
+            self.assertAlmostEqual(1, p0 / expected_p0, places=10)
+            self.assertAlmostEqual(expected_p_wait, p_wait, places=10)
+
+    def test_large_c(self):
+        #factorials overflow here, the recurrence must stay finite and in range
+        p_wait, p0 = e.erlang_c_p0(99000, 100000)
+        self.assertTrue(0 < p_wait < 1)
+        self.assertTrue(0 <= p0 < 1)
+
+        #with a fixed utilization, the probability of waiting falls as the pool grows
+        self.assertLess(e.erlang_c(9500, 10000), e.erlang_c(950, 1000))
+
+    def test_arrays(self):
+        a = np.array([0.75, 4.5, 40])
+        c = np.array([2, 5, 50])
+        p_wait, p0 = e.erlang_c_p0(a, c)
+        for i in range(3):
+            scalar_p_wait, scalar_p0 = e.erlang_c_p0(float(a[i]), int(c[i]))
+            self.assertAlmostEqual(scalar_p_wait, p_wait[i])
+            self.assertAlmostEqual(scalar_p0, p0[i])
+
+        #uniform c takes the unmasked path and should agree too
+        np.testing.assert_allclose(e.erlang_b(a, 50), [e.erlang_b(float(x), 50) for x in a])
+
+    def test_erlang_b_curve(self):
+        #every step of the curve should match a fresh run of the recurrence
+        b, log_s = e.erlang_b_curve(7.5, 20)
+        self.assertEqual(21, len(b))
+        for c in (0, 1, 8, 20):
+            expected_b, expected_log_s = e.erlang_b_log_s(7.5, c)
+            self.assertAlmostEqual(expected_b, b[c])
+            self.assertAlmostEqual(expected_log_s, log_s[c])
+
+    def test_erlang_b_servers(self):
+        #the answer is the first c of the curve whose blocking is under the target
+        a = np.array([[0.5], [7.5], [40.0]])
+        p_max = np.array([0.5, 0.1, 0.01, 1e-6])
+        c = e.erlang_b_servers(a, p_max)
+        self.assertEqual((3, 4), c.shape)
+        for i in range(3):
+            b, _ = e.erlang_b_curve(float(a[i, 0]), 200)
+            for j in range(4):
+                self.assertEqual(np.argmax(b < p_max[j]), c[i, j])
+
+        #invalid loads and targets give nan
+        self.assertTrue(np.all(np.isnan(e.erlang_b_servers([-1, 5, 5], [0.1, 0, 1.5]))))
@@ -0,0 +1,365 @@
+import Erlang
+import MMcQueue
+import math
+import numpy as np
+from numbers import Number
+
+#approximations GGcQueue knows, selected with its method argument
+METHODS = ('allen-cunneen', 'kingman')
+
+
+def _scale_wq(lamda, mu, c, ro, wq_mmc, ca, cs, method):
+    """
+    Helper function that turns the M/M/c wq into the G/G/c approximation, for scalars or broadcast arrays.
+    Both approximations scale by (ca^2 + cs^2) / 2, which is 1 for Poisson arrivals and exponential service.
+    Allen-Cunneen scales the exact M/M/c wq. Kingman's formula, in Sakasegawa's multi-server form, replaces
+    the Erlang-C part by ro^(sqrt(2 (c + 1)) - 1) / (c (1 - ro) mu), which needs no recurrence; both are
+    exact for M/G/1.
+    Args:
+        lamda (number or ndarray): average rates of arrival
+        mu (number or ndarray): average rates of service completion
+        c (number or ndarray): numbers of servers
+        ro (number or ndarray): traffic intensities, below 1
+        wq_mmc (number or ndarray): M/M/c time spent waiting in the queue
+        ca (number or ndarray): coefficients of variation of the interarrival times
+        cs (number or ndarray): coefficients of variation of the service times
+        method (str): one of METHODS
+
+    Returns: approximate time spent waiting in the queue
+    """
+    variability = (ca ** 2 + cs ** 2) / 2
+    if method == 'allen-cunneen':
+        return wq_mmc * variability
+    return ro ** (np.sqrt(2 * (c + 1)) - 1) / (c * (1 - ro) * mu) * variability
+
+
+def _exponential_exceedance(t, p_wait, wq):
+    """
+    Helper function for the approximate P(Wq > t) = p_wait * e^(-p_wait t / wq), an exponential tail behind
+    the M/M/c probability of waiting with its rate matched to the approximate wq. wq = 0 (ca = cs = 0) means
+    nobody waits.
+    Args:
+        t (ndarray): waiting times
+        p_wait (number or ndarray): probabilities of waiting
+        wq (number or ndarray): approximate times spent waiting in the queue, finite
+
+    Returns: ndarray of probabilities
+    """
+    wq = np.asarray(wq, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tail = np.where(wq > 0, p_wait * np.exp(-p_wait / wq * np.clip(t, 0, None)), 0.0)
+    return np.where(t >= 0, tail, 1.0)
+
+
+def _exponential_percentile(q, p_wait, wq):
+    """
+    Helper function that inverts _exponential_exceedance: t = ln(p_wait / (1 - q)) * wq / p_wait once q is
+    past 1 - p_wait, and 0 for every q when wq = 0.
+    Args:
+        q (ndarray): probabilities between 0 and 1
+        p_wait (number or ndarray): probabilities of waiting
+        wq (number or ndarray): approximate times spent waiting in the queue, finite
+
+    Returns: ndarray of waiting times; nan for q outside [0, 1]
+    """
+    wq = np.asarray(wq, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.where((q > 1 - p_wait) & (wq > 0), np.log(p_wait / (1 - q)) * wq / p_wait, 0.0)
+    return np.where((q >= 0) & (q <= 1), t, np.nan)
+
+
+class GGcQueue(MMcQueue.MMcQueue):
+    """
+    GGc queue class approximates a multi-server queue with general arrivals and service, described by the
+    coefficients of variation ca of the interarrival times and cs of the service times (ca = cs = 1 is M/M/c).
+    wq is the M/M/c result scaled by (ca^2 + cs^2) / 2 (Allen-Cunneen), or Kingman's formula in its
+    multi-server form; lq follows from Little's Law. p0 and the probability of waiting are the M/M/c values,
+    which is what both approximations assume.
+    """
+    __slots__ = ('_ca', '_cs', '_method')
+
+    def __init__(self, lamda, mu, c, ca=1.0, cs=1.0, method='allen-cunneen'):
+        """
+        Constructor for GGc queue class. Uses the same arguments as MMC queue with the addition of ca, cs and
+        the approximation method.
+        Args:
+            lamda (number): average rate of arrival (scalar or iterable)
+            mu (number): average rate of service completion
+            c (number): number of servers in the queue
+            ca (number): coefficient of variation of the interarrival times
+            cs (number): coefficient of variation of the service times
+            method (str): 'allen-cunneen' or 'kingman'
+        """
+        super().__init__(lamda, mu, c)
+        self.ca = ca
+        self.cs = cs
+        self.method = method
+
+    def __str__(self):
+        """
+        Method that returns a string representation of a queue's object state.
+        Returns: String
+        """
+        m = self.metrics()
+        return (
+            f'GGcQueue instance at {id(self)}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t ca: {self.ca}'
+            f'\n\t cs: {self.cs}'
+            f'\n\t method: {self.method}'
+            f'\n\t P0: {m.p0}'
+            f'\n\t lq: {m.lq}'
+            f'\n\t l: {m.l}'
+            f'\n\t wq: {m.wq}'
+            f'\n\t w: {m.w}'
+            f'\n\t c: {self.c}'
+        )
+
+    @property
+    def ca(self):
+        """
+        Getter method for property ca
+        Returns: coefficient of variation of the interarrival times
+        """
+        return self._ca
+
+    @ca.setter
+    def ca(self, ca):
+        """
+        Setter method for property ca; does error checking on the argument.
+        Args:
+            ca (number): coefficient of variation of the interarrival times
+        Returns: None
+        """
+        self._recalc_needed = True
+        self._ca = self._check_cv(ca)
+
+    @property
+    def cs(self):
+        """
+        Getter method for property cs
+        Returns: coefficient of variation of the service times
+        """
+        return self._cs
+
+    @cs.setter
+    def cs(self, cs):
+        """
+        Setter method for property cs; does error checking on the argument.
+        Args:
+            cs (number): coefficient of variation of the service times
+        Returns: None
+        """
+        self._recalc_needed = True
+        self._cs = self._check_cv(cs)
+
+    @property
+    def method(self):
+        """
+        Getter method for property method
+        Returns: name of the approximation
+        """
+        return self._method
+
+    @method.setter
+    def method(self, method):
+        """
+        Setter method for property method. Unlike a bad number, an unknown name is a programming error.
+        Args:
+            method (str): one of METHODS
+        Returns: None
+        """
+        if method not in METHODS:
+            raise ValueError(f'method must be one of {METHODS}')
+        self._recalc_needed = True
+        self._method = method
+
+    @staticmethod
+    def _check_cv(cv):
+        """
+        Helper function that validates a coefficient of variation.
+        Args:
+            cv (number): coefficient of variation
+        Returns: cv if it is a number >= 0, math.nan otherwise
+        """
+        if isinstance(cv, Number) and 0 <= cv < math.inf:
+            return cv
+        return math.nan
+
+    def is_valid(self) -> bool:
+        """
+        Checks to see if lamda, mu, c, ca and cs are not nan
+
+        Returns: True if all arguments are valid, False otherwise
+        """
+        return super().is_valid() and not math.isnan(self.ca) and not math.isnan(self.cs)
+
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key, adding ca, cs and the method to the MMcQueue key.
+        Returns: tuple key
+        """
+        return super()._cache_key() + (self._ca, self._cs, self._method)
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, c, ca=1.0, cs=1.0, method='allen-cunneen'):
+        """
+        Calculates the G/G/c metrics for every element of the broadcast lamda, mu, c, ca and cs arrays in one
+        pass, on top of MMcQueue.batch_metrics.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            ca (array_like): coefficients of variation of the interarrival times
+            cs (array_like): coefficients of variation of the service times
+            method (str): 'allen-cunneen' or 'kingman'
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq, ro and p_wait
+        """
+        if method not in METHODS:
+            raise ValueError(f'method must be one of {METHODS}')
+
+        m = super().batch_metrics(lamda, mu, c)
+        lamda, mu, c = cls._batch_params(lamda, mu, c)
+        ca, cs = (np.asarray(x, dtype=float) for x in (ca, cs))
+        #the same check as _check_cv: a finite number >= 0
+        ca, cs = (np.where(np.isfinite(x) & (x >= 0), x, np.nan) for x in (ca, cs))
+        lamda, mu, c, ca, cs = np.broadcast_arrays(lamda, mu, c, ca, cs)
+        ro = lamda / (mu * c)
+        valid = ~np.isnan(ro) & ~np.isnan(ca) & ~np.isnan(cs)
+        feasible = valid & (ro < 1)
+
+        #infeasible elements are masked out afterwards, so silence the warnings they raise here
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wq = _scale_wq(lamda, mu, c, ro, m['wq'], ca, cs, method)
+            #the Erlang C probability of waiting that both approximations start from, 1 where infeasible
+            p_wait = np.where(feasible, m['lq'] * (1 - ro) / ro, 1.0)
+
+        results = cls._batch_results(lamda, lamda / mu, ro, lamda * wq, m['p0'], valid, feasible)
+        results['p_wait'] = np.where(valid, p_wait, np.nan)
+        return results
+
+    def staffing_curve(self, c_max, c_min=1):
+        """
+        Calculates the metrics of this queue's lamda, mu, ca, cs and method for every number of servers from
+        c_min to c_max with one batch_metrics call; p0 and p_wait are the M/M/c ones. Server counts that cannot
+        keep up (ro >= 1) get math.inf, with a probability of waiting of 1. An invalid lamda, mu, ca or cs gives
+        math.nan everywhere.
+        Args:
+            c_max (int): largest number of servers
+            c_min (int): smallest number of servers
+
+        Returns: dict of NumPy arrays keyed by c, p0, lq, wq, w and p_wait
+        """
+        servers = np.arange(c_min, c_max + 1)
+        m = self.batch_metrics(self.lamda, self.mu, servers, self.ca, self.cs, self.method)
+        return {'c': servers, 'p0': m['p0'], 'lq': m['lq'], 'wq': m['wq'], 'w': m['w'], 'p_wait': m['p_wait']}
+
+    def state_probabilities(self, n):
+        """
+        Approximates P(N = n) by the M/M/c distribution of the same lamda, mu and c for a whole array of n at
+        once. Both approximations keep the M/M/c p0 and probability of waiting and only rescale wq, so this
+        is the distribution they assume; its mean queue length is the M/M/c one, not this queue's lq.
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities; nan if the queue is invalid and 0 if it is infeasible
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        return super().state_probabilities(n)
+
+    def wait_exceedance(self, t):
+        """
+        Approximates P(Wq > t) for a whole array of t at once by an exponential tail behind the M/M/c
+        probability of waiting, with its rate matched to the approximate wq:
+        P(Wq > t) = p_wait * e^(-p_wait t / wq), and 0 for every t >= 0 when wq = 0.
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid and 1 if it is infeasible
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.ones(t.shape)
+
+        return _exponential_exceedance(t, self.p_wait, self.wq)
+
+    def wait_percentile(self, q):
+        """
+        Approximates waiting time percentiles, e.g. q = 0.95 for p95, for a whole array of q at once from the
+        same exponential tail as wait_exceedance.
+        Args:
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times; nan for an invalid queue or q outside [0, 1], inf if it is infeasible
+        """
+        q = np.asarray(q, dtype=float)
+        if not self.is_valid():
+            return np.full(q.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.where((q >= 0) & (q <= 1), np.inf, np.nan)
+
+        return _exponential_percentile(q, self.p_wait, self.wq)
+
+    @classmethod
+    def batch_wait_percentile(cls, lamda, mu, c, q, ca=1.0, cs=1.0, method='allen-cunneen'):
+        """
+        Approximates waiting time percentiles for every element of the broadcast lamda, mu, c, q, ca and cs
+        arrays in one pass, from the exponential tail of wait_exceedance.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            q (array_like): probabilities between 0 and 1
+            ca (array_like): coefficients of variation of the interarrival times
+            cs (array_like): coefficients of variation of the service times
+            method (str): 'allen-cunneen' or 'kingman'
+
+        Returns: ndarray of waiting times; nan for invalid queues or q outside [0, 1], inf for infeasible queues
+        """
+        m = cls.batch_metrics(lamda, mu, c, ca, cs, method)
+        q = np.asarray(q, dtype=float)
+        wq, p_wait, q = np.broadcast_arrays(m['wq'], m['p_wait'], q)
+        feasible = np.isfinite(wq)
+        t = _exponential_percentile(q, p_wait, np.where(feasible, wq, 0.0))
+
+        t = np.where(feasible, t, np.where(np.isnan(wq), np.nan, np.inf))
+        return np.where((q >= 0) & (q <= 1), t, np.nan)
+
+    @property
+    def p_wait(self):
+        """
+        Getter method for p_wait property, the M/M/c Erlang C probability of waiting that both approximations
+        start from.
+        Returns: probability of waiting; 1 if the queue is infeasible
+        """
+        if not self.is_valid():
+            return math.nan
+
+        elif not self.is_feasible():
+            return 1.0
+
+        return Erlang.erlang_c(self.r, self.c)
+
+    def _calc_metrics(self):
+        """
+        Calculates and stores lq and p0 for a GGc queue: the M/M/c values, then lq is rescaled.
+        This is called whenever lamda, mu, c, ca, cs or the method is set or changed.
+
+        Returns: None
+        """
+        super()._calc_metrics()
+        if not self.is_feasible():
+            return
+
+        wq = _scale_wq(self.lamda, self.mu, self.c, self.ro, self._lq / self.lamda, self.ca, self.cs,
+                       self.method)
+        self._lq = float(self.lamda * wq)
@@ -0,0 +1,134 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MG1Queue
+import MMcQueue
+import GGcQueue as q
+
+
+class TestGGcQueue(TestCase):
+    def setUp(self):
+        self.queue = q.GGcQueue(10, 4, 3, ca=1.5, cs=0.5)
+
+    def test_init(self):
+        self.assertAlmostEqual(10, self.queue._lamda)
+        self.assertAlmostEqual(3, self.queue._c)
+        self.assertAlmostEqual(1.5, self.queue._ca)
+        self.assertAlmostEqual(0.5, self.queue._cs)
+        self.assertEqual('allen-cunneen', self.queue.method)
+        self.assertTrue(self.queue._recalc_needed)
+
+    def test_allen_cunneen(self):
+        mmc = MMcQueue.MMcQueue(10, 4, 3)
+        #(1.5^2 + 0.5^2) / 2 = 1.25 times the M/M/c wait
+        self.assertAlmostEqual(1.25 * mmc.wq, self.queue.wq)
+        self.assertAlmostEqual(1.25 * mmc.lq, self.queue.lq)
+        self.assertAlmostEqual(self.queue.wq + 0.25, self.queue.w)
+        self.assertAlmostEqual(mmc.p0, self.queue.p0)
+        self.assertAlmostEqual(mmc.p_wait, self.queue.p_wait)
+        #Poisson arrivals and exponential service give M/M/c back
+        self.assertAlmostEqual(mmc.lq, q.GGcQueue(10, 4, 3).lq)
+
+    def test_kingman(self):
+        #single server: both approximations are the exact Pollaczek-Khinchine result for Poisson arrivals
+        mg1 = MG1Queue.MG1Queue(3, 4, 0.5 / 4)
+        for method in q.METHODS:
+            self.assertAlmostEqual(mg1.lq, q.GGcQueue(3, 4, 1, ca=1, cs=0.5, method=method).lq)
+        #with many servers Kingman lands within about 15% of the Erlang-C based value
+        kingman = q.GGcQueue(90, 1, 100, ca=1.5, cs=0.5, method='kingman')
+        allen_cunneen = q.GGcQueue(90, 1, 100, ca=1.5, cs=0.5)
+        self.assertAlmostEqual(1, kingman.wq / allen_cunneen.wq, delta=0.2)
+        with self.assertRaises(ValueError):
+            q.GGcQueue(3, 4, 1, method='exact')
+
+    def test_waits(self):
+        #the exponential tail is matched to p_wait and wq
+        self.assertAlmostEqual(self.queue.p_wait, self.queue.wait_exceedance(0))
+        t = np.linspace(0, 20, 200001)
+        tail = self.queue.wait_exceedance(t)
+        self.assertAlmostEqual(self.queue.wq, ((tail[1:] + tail[:-1]) / 2 * np.diff(t)).sum(), places=6)
+        p95 = self.queue.wait_percentile(0.95)
+        self.assertAlmostEqual(0.05, self.queue.wait_exceedance(p95))
+        self.assertEqual(0, self.queue.wait_percentile(0.1))
+
+    def test_no_variability(self):
+        #ca = cs = 0 is D/D/c: nobody ever waits, although the M/M/c p_wait behind the approximation is not 0
+        queue = q.GGcQueue(2, 1, 3, 0, 0)
+        self.assertEqual(0, queue.wq)
+        np.testing.assert_array_equal([1, 0, 0], queue.wait_exceedance([-1, 0, 1]))
+        np.testing.assert_array_equal([0, 0, 0], queue.wait_percentile([0, 0.5, 1]))
+
+    def test_staffing_curve(self):
+        curve = self.queue.staffing_curve(6)
+        np.testing.assert_array_equal(np.arange(1, 7), curve['c'])
+        for i, c in enumerate(range(1, 7)):
+            queue = q.GGcQueue(self.queue.lamda, self.queue.mu, c, self.queue.ca, self.queue.cs)
+            for name in ('p0', 'lq', 'wq', 'w', 'p_wait'):
+                self.assertAlmostEqual(getattr(queue, name), curve[name][i])
+        self.queue.cs = -1
+        self.assertTrue(np.isnan(self.queue.staffing_curve(4)['p_wait']).all())
+
+    def test_state_probabilities(self):
+        #the M/M/c distribution that the approximations assume
+        mmc = MMcQueue.MMcQueue(self.queue.lamda, self.queue.mu, self.queue.c)
+        n = np.arange(-1, 30)
+        np.testing.assert_allclose(mmc.state_probabilities(n), self.queue.state_probabilities(n))
+        self.assertAlmostEqual(self.queue.p0, float(self.queue.state_probabilities(0)))
+        self.queue.ca = -1
+        self.assertTrue(np.isnan(self.queue.state_probabilities(n)).all())
+
+    def test_batch_wait_percentile(self):
+        qs = np.array([0.1, 0.5, 0.95, 1, 2])
+        ca = np.array([[1.5], [0.7]])
+        for method in q.METHODS:
+            batch = q.GGcQueue.batch_wait_percentile(10, 4, 3, qs, ca, 0.5, method)
+            self.assertEqual((2, 5), batch.shape)
+            for i in range(2):
+                queue = q.GGcQueue(10, 4, 3, float(ca[i, 0]), 0.5, method)
+                np.testing.assert_allclose(queue.wait_percentile(qs), batch[i])
+        np.testing.assert_array_equal([math.inf, math.nan],
+                                      q.GGcQueue.batch_wait_percentile([12, -1], 4, 3, 0.9, 1.5, 0.5))
+
+    def test_invalid_values(self):
+        self.queue.ca = -1
+        self.assertTrue(math.isnan(self.queue.ca))
+        self.assertFalse(self.queue.is_valid())
+        self.assertTrue(math.isnan(self.queue.lq))
+        self.queue.ca = 1.5
+        self.queue.lamda = 12
+        self.assertFalse(self.queue.is_feasible())
+        self.assertTrue(math.isinf(self.queue.lq))
+
+    def test_batch_metrics(self):
+        lamda = np.array([10, 3, 12, -1])
+        ca = np.array([[1.5], [0.7]])
+        for method in q.METHODS:
+            m = q.GGcQueue.batch_metrics(lamda, 4, 3, ca, 0.5, method)
+            self.assertEqual((2, 4), m['lq'].shape)
+            for i in range(2):
+                for j in range(2):
+                    queue = q.GGcQueue(float(lamda[j]), 4, 3, float(ca[i, 0]), 0.5, method)
+                    for name in ('lq', 'p0', 'l', 'w', 'wq'):
+                        self.assertAlmostEqual(getattr(queue, name), m[name][i, j])
+            self.assertTrue(np.all(np.isinf(m['lq'][:, 2])))
+            self.assertTrue(np.all(np.isnan(m['lq'][:, 3])))
+            self.assertAlmostEqual(q.GGcQueue(10, 4, 3, 1.5, 0.5, method).p_wait, m['p_wait'][0, 0])
+        #inf is no more a coefficient of variation here than it is for the scalar class
+        self.assertTrue(math.isnan(q.GGcQueue(10, 4, 3, math.inf).lq))
+        self.assertTrue(np.isnan(q.GGcQueue.batch_metrics(10, 4, 3, [math.inf, 1], [1, math.inf])['lq']).all())
+
+    def test_many_scenarios(self):
+        #a million scenarios in one call
+        rng = np.random.default_rng(1)
+        n = 10 ** 6
+        c = rng.integers(1, 20, n)
+        lamda = rng.uniform(0.1, 0.95, n) * c
+        m = q.GGcQueue.batch_metrics(lamda, 1, c, rng.uniform(0, 2, n), rng.uniform(0, 2, n))
+        self.assertTrue(np.all(np.isfinite(m['wq'])))
+        self.assertTrue(np.all(m['wq'] >= 0))
+
+    def test_str(self):
+        s = str(q.GGcQueue(5, 2, 3))
+        self.assertIsInstance(s, str)
+        self.assertIn('GGcQueue instance', s)
+        self.assertIn('method:', s)
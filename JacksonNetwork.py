@@ -0,0 +1,396 @@
+"""
+Open Jackson networks: M/M/c nodes with Poisson arrivals from outside and probabilistic routing between them.
+The traffic equations lamda = gamma + P^T lamda are solved once, and every node is then an independent MMcQueue
+with its total arrival rate, so the per-node metrics come from MMcQueue.batch_metrics.
+Small dense routing matrices are solved with a linear solve. Sparse routing, given as COO triplets
+(JacksonNetwork.from_triplets) or as any matrix with a tocoo method such as scipy.sparse, and dense matrices of
+SPARSE_NODES nodes or more are split into strongly connected groups of nodes that are solved one after the other
+in topological order: single nodes by one division, small groups densely and large ones with GMRES whose
+products are one np.bincount each. That costs O(nonzeros) per product and never forms an n by n matrix, which is
+what makes 10^4+ nodes practical without SciPy.
+"""
+import math
+import numpy as np
+import MMcQueue
+
+#dense routing matrices at least this large, and strongly connected groups of nodes at least this large, are
+# solved with sparse methods rather than a dense linear solve
+SPARSE_NODES = 500
+#a group is closed if it keeps more than 1 - TOLERANCE of its customers; _gmres stops once the residual is below
+# TOLERANCE times the size of the right-hand side and the solution
+TOLERANCE = 1e-12
+#GMRES restarts after this many Arnoldi vectors, which bounds its memory to GMRES_RESTART arrays of the group size
+GMRES_RESTART = 50
+#upper bound on the GMRES matrix-vector products before the solve is reported as not converged
+MAX_ITERATIONS = 10000
+
+
+def _topological_components(n, rows, cols):
+    """
+    Helper function that labels the strongly connected components of the routing graph with Tarjan's algorithm,
+    iteratively so long tandem lines do not hit the recursion limit. Tarjan finishes a component only after
+    every component it leads to, so the labels are reversed to number them in topological order.
+    Args:
+        n (int): number of nodes
+        rows (ndarray): node indices the customers leave
+        cols (ndarray): node indices the customers go to
+
+    Returns: ndarray of component labels, with every edge going from a label to the same or a larger one
+    """
+    order = np.argsort(rows, kind='stable')
+    targets = cols[order].tolist()
+    starts = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n)))).tolist()
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    label = [0] * n
+    count = visited = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = visited
+        visited += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [[root, starts[root]]]
+        while work:
+            frame = work[-1]
+            v, e = frame
+            while e < starts[v + 1]:
+                w = targets[e]
+                e += 1
+                if index[w] == -1:
+                    break
+                if on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                #every edge of v is done: close its component if v is the root, then return to the caller
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        label[w] = count
+                        if w == v:
+                            break
+                    count += 1
+                continue
+
+            frame[1] = e
+            index[w] = low[w] = visited
+            visited += 1
+            stack.append(w)
+            on_stack[w] = True
+            work.append([w, starts[w]])
+
+    return count - 1 - np.array(label, dtype=np.intp)
+
+
+def _gmres(matvec, b):
+    """
+    Helper function that solves A x = b with restarted GMRES, given only the product A v. The Arnoldi basis is
+    orthogonalized twice by classical Gram-Schmidt, and the least squares problem is kept triangular with Givens
+    rotations so the residual is known after every product.
+    Args:
+        matvec (function): returns A v for an ndarray v
+        b (ndarray): right-hand side
+
+    Returns: ndarray x
+    Raises: np.linalg.LinAlgError if the residual is not below TOLERANCE after MAX_ITERATIONS products
+    """
+    size = len(b)
+    x = np.zeros(size)
+    b_norm = np.linalg.norm(b)
+    products = 0
+    while True:
+        r = b - matvec(x)
+        beta = np.linalg.norm(r)
+        target = TOLERANCE * (b_norm + np.linalg.norm(x))
+        if beta <= target:
+            return x
+        if products >= MAX_ITERATIONS:
+            raise np.linalg.LinAlgError(f'GMRES did not converge in {MAX_ITERATIONS} iterations '
+                                        f'(relative residual {beta / b_norm:.1e})')
+
+        basis = np.empty((GMRES_RESTART + 1, size))
+        h = np.zeros((GMRES_RESTART + 1, GMRES_RESTART))
+        cos, sin = np.zeros(GMRES_RESTART), np.zeros(GMRES_RESTART)
+        g = np.zeros(GMRES_RESTART + 1)
+        basis[0] = r / beta
+        g[0] = beta
+        k = 0
+        while k < GMRES_RESTART and products < MAX_ITERATIONS:
+            w = matvec(basis[k])
+            products += 1
+            for _ in range(2):
+                coefficients = basis[:k + 1] @ w
+                w -= coefficients @ basis[:k + 1]
+                h[:k + 1, k] += coefficients
+            h[k + 1, k] = np.linalg.norm(w)
+            if h[k + 1, k] > 0:
+                basis[k + 1] = w / h[k + 1, k]
+
+            for i in range(k):
+                h[i, k], h[i + 1, k] = (cos[i] * h[i, k] + sin[i] * h[i + 1, k],
+                                        -sin[i] * h[i, k] + cos[i] * h[i + 1, k])
+            radius = np.hypot(h[k, k], h[k + 1, k])
+            cos[k], sin[k] = h[k, k] / radius, h[k + 1, k] / radius
+            h[k, k], h[k + 1, k] = radius, 0.0
+            g[k], g[k + 1] = cos[k] * g[k], -sin[k] * g[k]
+            k += 1
+            if abs(g[k]) <= target:
+                break
+
+        #h[:k, :k] is upper triangular
+        y = np.linalg.solve(h[:k, :k], g[:k])
+        x = x + y @ basis[:k]
+
+
+class JacksonNetwork:
+    """
+    Jackson network class holds a routing matrix, the external arrival rates and the mu and c of every node.
+    routing[i, j] is the probability that a customer leaving node i goes to node j next; whatever is left of
+    a row, 1 - sum(routing[i]), is the probability of leaving the network.
+    """
+    __slots__ = ('_routing', '_gamma', '_mu', '_c', '_lamda')
+
+    def __init__(self, routing, gamma, mu, c=1):
+        """
+        Constructor for Jackson network class. Solves the traffic equations, raising np.linalg.LinAlgError if
+        they cannot be solved to TOLERANCE.
+        Args:
+            routing (array_like or sparse matrix): n by n routing probabilities; a sparse matrix is anything with
+                a tocoo method, such as scipy.sparse, and is kept as COO triplets
+            gamma (array_like): external arrival rate of every node, 0 where nothing arrives from outside
+            mu (array_like): average rate of service completion of every node's servers
+            c (array_like): number of servers of every node
+        """
+        if hasattr(routing, 'tocoo'):
+            coo = routing.tocoo()
+            if coo.shape[0] != coo.shape[1]:
+                raise ValueError('routing must be a square matrix')
+            self._setup((coo.row, coo.col, coo.data), coo.shape[0], gamma, mu, c)
+            return
+
+        routing = np.asarray(routing, dtype=float)
+        if routing.ndim != 2 or routing.shape[0] != routing.shape[1]:
+            raise ValueError('routing must be a square matrix')
+        self._setup(routing, routing.shape[0], gamma, mu, c)
+
+    @classmethod
+    def from_triplets(cls, rows, cols, probabilities, gamma, mu, c=1):
+        """
+        Builds a network from sparse routing in COO form: a customer leaving node rows[k] goes to node cols[k]
+        with probability probabilities[k], and repeated pairs add up. The number of nodes is the length of
+        gamma, mu or c, or the largest node index plus 1 if that is more.
+        Args:
+            rows (array_like): integer node indices the customers leave
+            cols (array_like): integer node indices the customers go to
+            probabilities (array_like): routing probabilities
+            gamma (array_like): external arrival rate of every node, 0 where nothing arrives from outside
+            mu (array_like): average rate of service completion of every node's servers
+            c (array_like): number of servers of every node
+
+        Returns: JacksonNetwork
+        """
+        rows, cols = (np.asarray(x) for x in (rows, cols))
+        probabilities = np.asarray(probabilities, dtype=float)
+        if rows.ndim != 1 or rows.shape != cols.shape or rows.shape != probabilities.shape:
+            raise ValueError('rows, cols and probabilities must be 1-d arrays of the same length')
+        if rows.size and not (np.issubdtype(rows.dtype, np.integer) and np.issubdtype(cols.dtype, np.integer)
+                              and rows.min() >= 0 and cols.min() >= 0):
+            raise ValueError('rows and cols must be node indices, integers >= 0')
+
+        largest = int(max(rows.max(), cols.max())) if rows.size else -1
+        n = max(np.size(gamma), np.size(mu), np.size(c), largest + 1)
+        network = cls.__new__(cls)
+        network._setup((rows, cols, probabilities), n, gamma, mu, c)
+        return network
+
+    def _setup(self, routing, n, gamma, mu, c):
+        """
+        Helper function for the constructors: checks the routing, stores the nodes and solves the traffic
+        equations.
+        Args:
+            routing (ndarray or tuple): dense n by n matrix, or (rows, cols, probabilities) COO triplets
+            n (int): number of nodes
+            gamma (array_like): external arrival rates
+            mu (array_like): service rates
+            c (array_like): numbers of servers
+
+        Returns: None
+        """
+        if isinstance(routing, tuple):
+            rows, cols, probabilities = routing
+            row_sums = np.bincount(rows, weights=probabilities, minlength=n)
+            negative = probabilities.size and probabilities.min() < 0
+        else:
+            row_sums = routing.sum(axis=1)
+            negative = np.any(routing < 0)
+        if negative or np.any(row_sums > 1 + 1e-9):
+            raise ValueError('routing probabilities must be >= 0 with every row summing to at most 1')
+
+        self._routing = routing
+        self._gamma, self._mu, self._c = (np.broadcast_to(np.asarray(x, dtype=float), (n,))
+                                          for x in (gamma, mu, c))
+        self._lamda = self._solve_traffic()
+
+    @property
+    def routing(self):
+        """
+        Getter method for routing property
+        Returns: the dense routing matrix, or the (rows, cols, probabilities) triplets of sparse routing
+        """
+        return self._routing
+
+    @property
+    def gamma(self):
+        """
+        Getter method for gamma property
+        Returns: ndarray of external arrival rates
+        """
+        return self._gamma
+
+    @property
+    def mu(self):
+        """
+        Getter method for mu property
+        Returns: ndarray of service rates
+        """
+        return self._mu
+
+    @property
+    def c(self):
+        """
+        Getter method for c property
+        Returns: ndarray of numbers of servers
+        """
+        return self._c
+
+    @property
+    def lamda(self):
+        """
+        Getter method for lamda property, the solution of the traffic equations.
+        Returns: ndarray of total arrival rates of every node; nan if the routing never lets customers leave
+        """
+        return self._lamda
+
+    def _solve_traffic(self):
+        """
+        Helper function that solves (I - P^T) lamda = gamma: a dense linear solve for small dense routing,
+        _solve_sparse_traffic otherwise.
+        Returns: ndarray of total arrival rates; nan if some customers can never leave
+        Raises: np.linalg.LinAlgError if GMRES does not converge on a large strongly connected group of nodes
+        """
+        routing = self._routing
+        if isinstance(routing, tuple):
+            return self._solve_sparse_traffic(*routing)
+
+        n = len(self._gamma)
+        if n >= SPARSE_NODES:
+            rows, cols = np.nonzero(routing)
+            return self._solve_sparse_traffic(rows, cols, routing[rows, cols])
+
+        try:
+            return np.linalg.solve(np.eye(n) - routing.T, self._gamma)
+        except np.linalg.LinAlgError:
+            return np.full(n, np.nan)
+
+    def _solve_sparse_traffic(self, rows, cols, probabilities):
+        """
+        Helper function that solves the traffic equations one strongly connected group of nodes at a time, in
+        topological order, so every group only sees arrivals from groups that are already solved. A node on
+        its own is one division, lamda_i = inflow_i / (1 - P_ii), which makes tandem lines and other acyclic
+        routing a single O(nodes + nonzeros) pass. Groups of fewer than SPARSE_NODES nodes get a dense linear
+        solve and larger ones _gmres, with P^T x as one np.bincount over the group's own probabilities.
+        Args:
+            rows (ndarray): node indices the customers leave
+            cols (ndarray): node indices the customers go to
+            probabilities (ndarray): routing probabilities
+
+        Returns: ndarray of total arrival rates; nan if some customers can never leave
+        """
+        n = len(self._gamma)
+        nonzero = probabilities > 0
+        rows, cols, probabilities = rows[nonzero], cols[nonzero], probabilities[nonzero]
+        group = _topological_components(n, rows, cols)
+
+        #a group none of whose nodes lets more than TOLERANCE of its customers out of the group is closed
+        inside = group[rows] == group[cols]
+        kept = np.bincount(rows[inside], weights=probabilities[inside], minlength=n)
+        if np.any(np.bincount(group, weights=kept < 1 - TOLERANCE) == 0):
+            return np.full(n, np.nan)
+
+        nodes = np.argsort(group, kind='stable')
+        node_start = np.concatenate(([0], np.cumsum(np.bincount(group))))
+        order = np.argsort(group[rows], kind='stable')
+        rows, cols, probabilities = rows[order], cols[order], probabilities[order]
+        edge_start = np.searchsorted(group[rows], np.arange(len(node_start))).tolist()
+        local = np.empty(n, dtype=np.intp)
+        group_list, nodes_list, kept_list = group.tolist(), nodes.tolist(), kept.tolist()
+
+        inflow = self._gamma.tolist()
+        lamda = [0.0] * n
+        rows_list, cols_list, probabilities_list = rows.tolist(), cols.tolist(), probabilities.tolist()
+        for k, (first, last) in enumerate(zip(node_start[:-1].tolist(), node_start[1:].tolist())):
+            start, stop = edge_start[k], edge_start[k + 1]
+            if last - first == 1:
+                i = nodes_list[first]
+                lamda[i] = inflow[i] / (1 - kept_list[i])
+                for e in range(start, stop):
+                    if cols_list[e] != i:
+                        inflow[cols_list[e]] += probabilities_list[e] * lamda[i]
+                continue
+
+            m = last - first
+            local[nodes[first:last]] = np.arange(m)
+            group_rows, group_cols = rows[start:stop], cols[start:stop]
+            internal = group[group_cols] == k
+            local_rows, local_cols = local[group_rows[internal]], local[group_cols[internal]]
+            weights = probabilities[start:stop][internal]
+            b = np.array([inflow[i] for i in nodes_list[first:last]])
+            if m < SPARSE_NODES:
+                matrix = np.eye(m)
+                np.add.at(matrix, (local_cols, local_rows), -weights)
+                x = np.linalg.solve(matrix, b)
+            else:
+                x = _gmres(lambda v: v - np.bincount(local_cols, weights=weights * v[local_rows], minlength=m), b)
+            for i, value in zip(nodes_list[first:last], x.tolist()):
+                lamda[i] = value
+            for e in range(start, stop):
+                if group_list[cols_list[e]] != k:
+                    inflow[cols_list[e]] += probabilities_list[e] * lamda[rows_list[e]]
+
+        return np.array(lamda)
+
+    def metrics(self):
+        """
+        Calculates every node's metrics and the end-to-end ones in one call. Nodes that cannot keep up
+        (ro >= 1) get math.inf like MMcQueue does, and so do the network totals.
+        Returns: dict of NumPy arrays keyed by lamda, ro, p0, lq, l, wq and w for the nodes, plus l_total and
+            w_total, the average number of customers in the network and the average time a customer spends in
+            it (nan if nothing arrives from outside), and bottleneck, the index of the node with the highest
+            utilization, with its bottleneck_utilization
+        """
+        #nodes that nobody visits are idle rather than invalid; an idle node still takes 1 / mu to pass
+        idle = self._lamda == 0
+        m = MMcQueue.MMcQueue.batch_metrics(np.where(idle, 1.0, self._lamda), self._mu, self._c)
+        idle_values = {'ro': 0.0, 'p0': 1.0, 'lq': 0.0, 'l': 0.0, 'wq': 0.0, 'w': 1 / self._mu}
+        result = {'lamda': self._lamda}
+        for name, value in idle_values.items():
+            result[name] = np.where(idle, value, m[name])
+
+        l_total = result['l'].sum()
+        result['l_total'] = l_total
+        #Little's Law for the whole network, with the external arrivals as its throughput; nan without any
+        throughput = self._gamma.sum()
+        result['w_total'] = l_total / throughput if throughput > 0 else math.nan
+        if np.isnan(result['ro']).all():
+            result['bottleneck'], result['bottleneck_utilization'] = -1, np.nan
+        else:
+            result['bottleneck'] = int(np.nanargmax(result['ro']))
+            result['bottleneck_utilization'] = result['ro'][result['bottleneck']]
+        return result
@@ -0,0 +1,141 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MMcQueue
+import JacksonNetwork as j
+
+
+class TestJacksonNetwork(TestCase):
+    def setUp(self):
+        #node 0 feeds node 1 or node 2; node 2 sends a fifth of its customers back to node 0
+        self.routing = np.array([[0, 0.6, 0.4],
+                                 [0, 0, 0],
+                                 [0.2, 0, 0]])
+        self.network = j.JacksonNetwork(self.routing, [4, 1, 0], [6, 2, 1], [1, 2, 3])
+
+    def test_traffic(self):
+        #lamda0 = 4 + 0.2 lamda2, lamda2 = 0.4 lamda0
+        lamda0 = 4 / (1 - 0.08)
+        np.testing.assert_allclose([lamda0, 1 + 0.6 * lamda0, 0.4 * lamda0], self.network.lamda)
+
+    def test_metrics(self):
+        m = self.network.metrics()
+        for i, (mu, c) in enumerate(((6, 1), (2, 2), (1, 3))):
+            queue = MMcQueue.MMcQueue(float(self.network.lamda[i]), mu, c)
+            for name in ('lq', 'l', 'wq', 'w', 'p0', 'ro'):
+                self.assertAlmostEqual(getattr(queue, name), m[name][i])
+        self.assertAlmostEqual(m['l'].sum(), m['l_total'])
+        self.assertAlmostEqual(m['l_total'] / 5, m['w_total'])
+        self.assertEqual(int(np.argmax(m['ro'])), m['bottleneck'])
+        self.assertAlmostEqual(m['ro'].max(), m['bottleneck_utilization'])
+
+    def test_tandem(self):
+        #a line of M/M/1 nodes: the end-to-end time is the sum of the node times
+        n = 600
+        routing = np.eye(n, k=1)
+        gamma = np.zeros(n)
+        gamma[0] = 1
+        mu = np.linspace(2, 1.5, n)
+        m = j.JacksonNetwork(routing, gamma, mu).metrics()
+        np.testing.assert_allclose(np.ones(n), m['lamda'])
+        self.assertAlmostEqual((1 / (mu - 1)).sum(), m['w_total'])
+        self.assertEqual(n - 1, m['bottleneck'])
+
+    def test_overloaded_and_idle(self):
+        m = j.JacksonNetwork(self.routing, [4, 1, 0], [4, 2, 1], [1, 2, 3]).metrics()
+        self.assertTrue(math.isinf(m['lq'][0]))
+        self.assertTrue(math.isinf(m['w_total']))
+        #a node nobody visits is idle
+        m = j.JacksonNetwork(np.zeros((2, 2)), [1, 0], [2, 3]).metrics()
+        self.assertEqual(0, m['l'][1])
+        self.assertEqual(1, m['p0'][1])
+        self.assertEqual(0, m['bottleneck'])
+
+    def test_invalid_routing(self):
+        with self.assertRaises(ValueError):
+            j.JacksonNetwork([[0, 0.7], [0.6, 0.6]], [1, 1], 3)
+        with self.assertRaises(ValueError):
+            j.JacksonNetwork([0.5, 0.5], [1, 1], 3)
+        #customers that can never leave have no steady state
+        network = j.JacksonNetwork([[0, 1], [1, 0]], [1, 0], 3)
+        self.assertTrue(np.all(np.isnan(network.lamda)))
+        self.assertEqual(-1, network.metrics()['bottleneck'])
+
+    def test_sparse(self):
+        n = 20000
+        rows = np.arange(n - 1)
+        gamma = np.ones(n)
+        network = j.JacksonNetwork.from_triplets(rows, rows + 1, np.full(n - 1, 0.5), gamma, 3)
+        m = network.metrics()
+        #lamda_k = 1 + lamda_(k-1) / 2 climbs to 2
+        self.assertAlmostEqual(2, m['lamda'][-1])
+        dense = j.JacksonNetwork(np.eye(50, k=1) / 2, gamma[:50], 3).metrics()
+        np.testing.assert_allclose(dense['l'], m['l'][:50])
+        self.assertEqual(3, len(network.routing))
+
+    def test_triplets(self):
+        #the setUp network as triplets; repeated pairs add up
+        network = j.JacksonNetwork.from_triplets([0, 0, 2, 0], [1, 2, 0, 1], [0.3, 0.4, 0.2, 0.3], [4, 1, 0],
+                                                 [6, 2, 1], [1, 2, 3])
+        np.testing.assert_allclose(self.network.lamda, network.lamda)
+        #a node past the last index with an edge is still a node
+        self.assertEqual(3, len(j.JacksonNetwork.from_triplets([0], [1], [0.5], [1, 0, 2], 3).lamda))
+        with self.assertRaises(ValueError):
+            j.JacksonNetwork.from_triplets([0, 0], [1, 2], [0.7, 0.6], [1, 1, 1], 3)
+        with self.assertRaises(ValueError):
+            j.JacksonNetwork.from_triplets([0.5], [1], [0.5], [1, 1], 3)
+        with self.assertRaises(ValueError):
+            j.JacksonNetwork.from_triplets([0, 1], [1], [0.5], [1, 1], 3)
+
+    def test_large_dense(self):
+        #a dense matrix this large is one strongly connected group, solved by GMRES without forming I - P^T
+        n = 2 * j.SPARSE_NODES
+        routing = np.zeros((n, n))
+        routing[np.arange(n - 1), np.arange(1, n)] = 0.9
+        routing[-1, 0] = 0.5
+        network = j.JacksonNetwork(routing, np.ones(n), 20)
+        np.testing.assert_allclose(np.linalg.solve(np.eye(n) - routing.T, np.ones(n)), network.lamda, rtol=1e-10)
+
+    def test_rework(self):
+        #a node that sends 99.99% of its customers back to itself sees them 10^4 times
+        network = j.JacksonNetwork.from_triplets([0], [0], [0.9999], [1], 2)
+        self.assertAlmostEqual(10000, network.lamda[0], places=6)
+        self.assertAlmostEqual(10000, j.JacksonNetwork([[0.9999]], [1], 2).lamda[0], places=6)
+
+    def test_long_tandem(self):
+        #a 10^4 node line is one pass in topological order, however slowly the traffic decays along it
+        n = 10000
+        rows = np.arange(n - 1)
+        gamma = np.zeros(n)
+        gamma[0] = 1
+        network = j.JacksonNetwork.from_triplets(rows, rows + 1, np.full(n - 1, 0.9999), gamma, 2)
+        np.testing.assert_allclose(0.9999 ** np.arange(n), network.lamda, rtol=1e-10)
+
+    def test_groups(self):
+        #a line feeding a large loop feeding a small loop, checked against the dense solve
+        n = 2 * j.SPARSE_NODES
+        routing = np.zeros((n, n))
+        routing[np.arange(n - 1), np.arange(1, n)] = 0.95
+        routing[j.SPARSE_NODES + 10, 5] = 0.04
+        routing[n - 2, n - 10] = 0.03
+        routing[n - 1, n - 1] = 0.2
+        gamma = np.linspace(0, 1, n)
+        network = j.JacksonNetwork(routing, gamma, 100)
+        np.testing.assert_allclose(np.linalg.solve(np.eye(n) - routing.T, gamma), network.lamda, rtol=1e-10)
+
+    def test_not_converged(self):
+        #GMRES reports that it ran out of iterations instead of returning nan
+        self.addCleanup(setattr, j, 'MAX_ITERATIONS', j.MAX_ITERATIONS)
+        j.MAX_ITERATIONS = 3
+        n = 2 * j.SPARSE_NODES
+        rows = np.arange(n)
+        gamma = np.zeros(n)
+        gamma[0] = 1
+        with self.assertRaises(np.linalg.LinAlgError):
+            j.JacksonNetwork.from_triplets(rows, (rows + 1) % n, np.full(n, 0.999), gamma, 2)
+
+    def test_no_arrivals(self):
+        m = j.JacksonNetwork(self.routing, [0, 0, 0], [6, 2, 1]).metrics()
+        np.testing.assert_allclose(np.zeros(3), m['lamda'])
+        self.assertEqual(0, m['l_total'])
+        self.assertTrue(math.isnan(m['w_total']))
@@ -1,12 +1,16 @@
 import BaseQueue
+import PKQueue
 import math
+import numpy as np
 
-class MD1Queue(BaseQueue.BaseQueue):
+class MD1Queue(PKQueue.PKQueue, BaseQueue.BaseQueue):
     """
     MD1Queue implements an MM1 queue with Poisson arrivals and deterministic service times.
     Contains the values that result from Little's Laws calculations.
     Checks validity and feasibility of inputs.
     """
+    __slots__ = ()
+
     def __init__(self, lamda, mu):
         """
         Constructor for MD1 Priority queue class.
@@ -23,18 +27,46 @@ class MD1Queue(BaseQueue.BaseQueue):
         Method that prints a string representation of an MD1 queue's object state.
         Returns: None
         """
+        m = self.metrics()
         return (
             f'MD1Queue instance at {id(self)}'
-            f'\n\t lamda: {self.lamda}'
-            f'\n\t mu: {self.mu}'
-            f'\n\t p: {self.ro}'
-            f'\n\t P0: {self.p0}'
-            f'\n\t Lq: {self.lq}'
-            f'\n\t l: {self.l}'
-            f'\n\t Wq: {self.wq}'
-            f'\n\t w: {self.w}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t p: {m.ro}'
+            f'\n\t P0: {m.p0}'
+            f'\n\t Lq: {m.lq}'
+            f'\n\t l: {m.l}'
+            f'\n\t Wq: {m.wq}'
+            f'\n\t w: {m.w}'
         )
 
+    def _service_sigma(self):
+        """
+        Helper function for the service time standard deviation used by the distribution methods.
+        Returns: 0, since service times are deterministic
+        """
+        return 0.0
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu):
+        """
+        Calculates the M/D/1 metrics for every element of the broadcast lamda and mu arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lamda, mu = cls._batch_params(lamda, mu)
+        ro = lamda / mu
+        valid = ~np.isnan(ro)
+
+        #infeasible elements are masked out afterwards, so silence the warnings they raise here
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lq = lamda ** 2 / (2 * mu * (mu - lamda))
+
+        return cls._batch_results(lamda, ro, ro, lq, 1 - ro, valid, valid & (ro < 1))
+
     def _calc_metrics(self):
         """
         Calculates Lq and P0 of MD1 queue
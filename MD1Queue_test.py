@@ -1,5 +1,6 @@
 from unittest import TestCase
 import math
+import numpy as np
 import MD1Queue as q
 
 class TestMD1Queue(TestCase):
@@ -50,9 +51,33 @@ class TestMD1Queue(TestCase):
         """
         self.queue.lamda = 20
         self.queue.mu = 25
-        self.queue.sigma = 0.04
 
         self.assertAlmostEqual(0.8, self.queue.ro)
         self.assertAlmostEqual(2.4, self.queue.l)
         self.assertAlmostEqual(0.08, self.queue.wq)
         self.assertAlmostEqual(0.12, self.queue.w)
+
+
+    def test_batch_metrics(self):
+        #Each element should match the scalar queue, including the nan/inf handling
+        lamdas = [10, 20, 30, -1]
+        m = q.MD1Queue.batch_metrics(lamdas, 25)
+
+        for i, lamda in enumerate(lamdas):
+            queue = q.MD1Queue(lamda, 25)
+            for name in ('lq', 'p0', 'l', 'w', 'wq', 'ro'):
+                np.testing.assert_allclose(getattr(queue, name), m[name][i])
+
+    def test_distributions(self):
+        probabilities = self.queue.state_probabilities(np.arange(500))
+        self.assertAlmostEqual(self.queue.p0, probabilities[0])
+        self.assertAlmostEqual(self.queue.l, (np.arange(500) * probabilities).sum())
+        self.assertAlmostEqual(self.queue.ro, self.queue.wait_exceedance(0))
+        p95 = self.queue.wait_percentile(0.95)
+        self.assertAlmostEqual(0.05, self.queue.wait_exceedance(p95))
+
+        self.queue.lamda = 25
+        self.assertTrue(np.all(np.isinf(self.queue.wait_percentile([0.5, 0.95]))))
+        self.assertEqual(1, self.queue.wait_exceedance(1.0))
+        self.queue.mu = -1
+        self.assertTrue(np.isnan(self.queue.state_probabilities(3)))
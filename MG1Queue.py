@@ -1,13 +1,17 @@
 import BaseQueue
+import PKQueue
 import math
+import numpy as np
 from numbers import Number
 
-class MG1Queue(BaseQueue.BaseQueue):
+class MG1Queue(PKQueue.PKQueue, BaseQueue.BaseQueue):
     """
     MG1 queue applies to any single server queue with Poisson arrivals (regardless of service time distribution type).
     Contains the values that result from Little's Laws calculations.
     Calculates metrics using the Checks validity and feasibility of inputs.
     """
+    __slots__ = ('_sigma',)
+
     def __init__(self, lamda, mu, sigma = 0.0):
         super().__init__(lamda, mu)
         self.sigma = sigma  #validate via setter
@@ -17,17 +21,18 @@ class MG1Queue(BaseQueue.BaseQueue):
         Method that prints a string representation of a queue's object state.
         Returns: None
         """
+        m = self.metrics()
         return (
             f"MG1Queue instance at {id(self)}"
-            f"\n\t lamda: {self.lamda}"
-            f"\n\t mu: {self.mu}"
+            f"\n\t lamda: {m.lamda}"
+            f"\n\t mu: {m.mu}"
             f"\n\t sigma: {self.sigma}"
-            f"\n\t ro: {self.ro}"
-            f"\n\t P0: {self.p0}"
-            f"\n\t Lq: {self.lq}"
-            f"\n\t l: {self.l}"
-            f"\n\t Wq: {self.wq}"
-            f"\n\t w: {self.w}"
+            f"\n\t ro: {m.ro}"
+            f"\n\t P0: {m.p0}"
+            f"\n\t Lq: {m.lq}"
+            f"\n\t l: {m.l}"
+            f"\n\t Wq: {m.wq}"
+            f"\n\t w: {m.w}"
         )
 
     #service time variance property
@@ -72,6 +77,44 @@ class MG1Queue(BaseQueue.BaseQueue):
         rho = self.lamda / self.mu
         return rho < 1
 
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key, adding sigma to the BaseQueue key.
+        Returns: tuple key
+        """
+        return super()._cache_key() + (self._sigma,)
+
+    def _service_sigma(self):
+        """
+        Helper function for the service time standard deviation used by the distribution methods.
+        Service times are taken as gamma with this sigma, or deterministic when sigma is 0.
+        Returns: sigma
+        """
+        return self.sigma
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, sigma=0.0):
+        """
+        Calculates the M/G/1 metrics for every element of the broadcast lamda, mu and sigma arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            sigma (array_like): service time standard deviations, must be >= 0
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lamda, mu = cls._batch_params(lamda, mu)
+        sigma = np.asarray(sigma, dtype=float)
+        lamda, mu, sigma = np.broadcast_arrays(lamda, mu, np.where(sigma >= 0, sigma, np.nan))
+        ro = lamda / mu
+        valid = ~np.isnan(ro) & ~np.isnan(sigma)
+
+        #infeasible elements are masked out afterwards, so silence the warnings they raise here
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lq = (ro ** 2 + (lamda ** 2) * (sigma ** 2)) / (2 * (1 - ro))
+
+        return cls._batch_results(lamda, ro, ro, lq, 1 - ro, valid, valid & (ro < 1))
+
     def _calc_metrics(self):
         #Compute Lq and P0 for MG1
         if not self.is_valid():
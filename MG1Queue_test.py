@@ -1,5 +1,7 @@
 from unittest import TestCase
 import math
+import numpy as np
+import MD1Queue
 import MG1Queue as q
 
 class TestMG1Queue(TestCase):
@@ -128,4 +130,27 @@ class TestMG1Queue(TestCase):
         self.assertAlmostEqual(0.16, self.queue.wq)
         self.assertAlmostEqual(0.2, self.queue.w)
 
-
+    def test_batch_metrics(self):
+        #Each element should match the scalar queue, including the nan/inf handling
+        lamdas = np.array([20, 20, 26, 20])
+        sigmas = np.array([0.04, 0.0, 0.04, -0.04])
+        m = q.MG1Queue.batch_metrics(lamdas, 25, sigmas)
+        self.assertAlmostEqual(3.2, m['lq'][0])
+
+        for i in range(len(lamdas)):
+            queue = q.MG1Queue(int(lamdas[i]), 25, float(sigmas[i]))
+            for name in ('lq', 'p0', 'l', 'w', 'wq', 'ro'):
+                np.testing.assert_allclose(getattr(queue, name), m[name][i])
+
+    def test_distributions(self):
+        queue = q.MG1Queue(15, 20, 0.08)
+        probabilities = queue.state_probabilities(np.arange(2000))
+        self.assertAlmostEqual(queue.l, (np.arange(2000) * probabilities).sum())
+        #the mean of Wq from its tail matches wq
+        t = np.linspace(0, 20, 20001)
+        tail = queue.wait_exceedance(t)
+        self.assertAlmostEqual(queue.wq, ((tail[1:] + tail[:-1]) / 2 * np.diff(t)).sum(), places=4)
+
+        #with sigma 0 it agrees with MD1Queue
+        np.testing.assert_allclose(MD1Queue.MD1Queue(15, 20).wait_percentile([0.9, 0.99]),
+                                   q.MG1Queue(15, 20, 0).wait_percentile([0.9, 0.99]))
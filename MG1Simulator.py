@@ -0,0 +1,154 @@
+import math
+import numpy as np
+import MD1Queue
+
+DISTRIBUTIONS = ('deterministic', 'exponential', 'gamma', 'lognormal', 'pareto')
+
+
+def fit_service_distribution(name, mu, sigma):
+    """
+    Builds a service time sampler with mean 1 / mu and standard deviation sigma.
+    'exponential' and 'deterministic' only match the mean, since their standard deviation is fixed by it.
+    Pareto uses the classic (type I) form, with the shape alpha > 2 that gives the requested variance.
+    Args:
+        name (str): one of DISTRIBUTIONS
+        mu (number): average rate of service completion
+        sigma (number): service time standard deviation
+
+    Returns: function of (rng, size) returning an ndarray of service times
+    """
+    mean = 1 / mu
+    cv = sigma / mean
+    if name == 'deterministic' or (cv == 0 and name != 'exponential'):
+        return lambda rng, size: np.full(size, mean)
+
+    if name == 'exponential':
+        return lambda rng, size: rng.exponential(mean, size)
+
+    if name == 'gamma':
+        shape = 1 / cv ** 2
+        return lambda rng, size: rng.gamma(shape, mean / shape, size)
+
+    if name == 'lognormal':
+        s2 = math.log1p(cv ** 2)
+        return lambda rng, size: rng.lognormal(math.log(mean) - s2 / 2, math.sqrt(s2), size)
+
+    if name == 'pareto':
+        alpha = 1 + math.sqrt(1 + 1 / cv ** 2)
+        scale = mean * (alpha - 1) / alpha
+        #numpy draws the Lomax (type II) form; shifting by one gives type I
+        return lambda rng, size: scale * (rng.pareto(alpha, size) + 1)
+
+    raise ValueError(f'service distribution must be one of {DISTRIBUTIONS}, not {name!r}')
+
+
+class MG1Simulator:
+    """
+    Single-server FIFO simulation driven by the Lindley recursion W(n+1) = max(0, W(n) + S(n) - A(n+1)),
+    used to check the Pollaczek-Khinchine metrics of MG1Queue (and MD1Queue, MM1Queue) against real
+    service distributions. Each chunk is evaluated with NumPy prefix sums and a running minimum instead of a
+    loop per customer; only the last waiting time carries over, so memory is bounded by the chunk size.
+    """
+    def __init__(self, queue, service='gamma', seed=None, chunk_size=1 << 20):
+        """
+        Constructor for MG1Simulator class.
+        Args:
+            queue (BaseQueue): single-server queue whose lamda, mu and sigma are simulated. Queues without a
+                sigma use 0 for MD1Queue and 1 / mu (exponential) otherwise.
+            service (str or callable): a name from DISTRIBUTIONS fitted to mu and sigma, or a function of
+                (rng, size) returning service times
+            seed (int or SeedSequence): seed of the random stream, for reproducible runs
+            chunk_size (int): number of customers evaluated per chunk
+        """
+        #a multi-server queue would silently be simulated with one server
+        if getattr(queue, 'c', 1) != 1:
+            raise ValueError(f'MG1Simulator simulates a single server, not c = {queue.c}')
+
+        self.lamda = queue.lamda
+        self.mu = queue.mu
+        if hasattr(queue, 'sigma'):
+            self.sigma = queue.sigma
+        elif isinstance(queue, MD1Queue.MD1Queue):
+            self.sigma = 0.0
+        else:
+            self.sigma = 1 / self.mu
+
+        if callable(service):
+            self._service = service
+        elif self.is_valid():
+            self._service = fit_service_distribution(service, self.mu, self.sigma)
+        else:
+            self._service = None
+        self.chunk_size = chunk_size
+        self._rng = np.random.default_rng(seed)
+
+    def iter_chunks(self, n_customers):
+        """
+        Simulates customers chunk by chunk.
+        Args:
+            n_customers (int): number of customers to simulate
+
+        Returns: generator of (waits, services, gaps) per chunk, where gaps[i] is the time from customer i's
+            arrival to the next arrival
+        """
+        carry = 0.0
+        done = 0
+        while done < n_customers:
+            n = min(self.chunk_size, n_customers - done)
+            gaps = self._rng.exponential(1 / self.lamda, n)
+            services = self._service(self._rng, n)
+            x = services - gaps
+
+            #W(i) = U(i) - min(-W(0), U(1), ..., U(i)) where U is the running sum of S - A
+            u = np.empty(n)
+            u[0] = 0.0
+            np.cumsum(x[:-1], out=u[1:])
+            floor = u.copy()
+            floor[0] = -carry
+            waits = u - np.minimum.accumulate(floor)
+
+            carry = max(0.0, waits[-1] + x[-1])
+            done += n
+            yield waits, services, gaps
+
+    def run(self, n_customers, warmup=0):
+        """
+        Simulates the queue and estimates its metrics. wq and w are averages over customers; lq and l follow
+        from Little's Laws with the observed arrival rate; p0 is the fraction of time the server was idle.
+        Args:
+            n_customers (int): number of customers to simulate, including the warm-up
+            warmup (int): number of customers at the start to leave out of the estimates
+
+        Returns: dict with lq, l, wq, w, p0 and n (customers counted); all nan if the queue is invalid
+        """
+        if not self.is_valid() or n_customers <= warmup:
+            return {'lq': math.nan, 'l': math.nan, 'wq': math.nan, 'w': math.nan, 'p0': math.nan, 'n': 0}
+
+        seen = 0
+        wait_sum = 0.0
+        service_sum = 0.0
+        time_sum = 0.0
+        idle_sum = 0.0
+        for waits, services, gaps in self.iter_chunks(n_customers):
+            skip = min(max(warmup - seen, 0), len(waits))
+            seen += len(waits)
+            waits, services, gaps = waits[skip:], services[skip:], gaps[skip:]
+            wait_sum += waits.sum()
+            service_sum += services.sum()
+            time_sum += gaps.sum()
+            #the server idles whenever the next customer arrives after this one leaves
+            idle_sum += np.maximum(gaps - waits - services, 0).sum()
+
+        n = n_customers - warmup
+        wq = wait_sum / n
+        w = (wait_sum + service_sum) / n
+        lamda = n / time_sum
+        return {'lq': float(lamda * wq), 'l': float(lamda * w), 'wq': float(wq), 'w': float(w),
+                'p0': float(idle_sum / time_sum), 'n': n}
+
+    def is_valid(self):
+        """
+        Checks to see if lamda, mu and sigma are usable numbers.
+        Returns: True if the queue can be simulated
+        """
+        return not (math.isnan(self.lamda) or math.isnan(self.mu) or math.isnan(self.sigma))
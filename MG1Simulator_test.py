@@ -0,0 +1,68 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MD1Queue
+import MG1Queue
+import MM1Queue
+import MMcQueue
+import MG1Simulator as s
+
+
+class TestFitServiceDistribution(TestCase):
+    def test_moments(self):
+        rng = np.random.default_rng(1)
+        for name in ('gamma', 'lognormal', 'pareto'):
+            sample = s.fit_service_distribution(name, 25, 0.03)(rng, 2000000)
+            self.assertAlmostEqual(0.04, sample.mean(), places=3)
+            self.assertLess(abs(sample.std() - 0.03), 0.003)
+
+        self.assertTrue(np.all(s.fit_service_distribution('deterministic', 25, 0.03)(rng, 10) == 0.04))
+        self.assertAlmostEqual(0.04, s.fit_service_distribution('exponential', 25, 0)(rng, 1000000).mean(), places=3)
+
+        with self.assertRaises(ValueError):
+            s.fit_service_distribution('weibull', 25, 0.03)
+
+
+class TestMG1Simulator(TestCase):
+    def assert_close_to(self, queue, result, tolerance):
+        for name in ('lq', 'wq', 'w', 'p0'):
+            self.assertLess(abs(result[name] - getattr(queue, name)), tolerance * getattr(queue, name))
+
+    def test_lindley_matches_loop(self):
+        #the vectorized recursion, across chunk boundaries, should match the plain loop
+        sim = s.MG1Simulator(MG1Queue.MG1Queue(20, 25, 0.03), seed=4, chunk_size=7)
+        waits, services, gaps = [np.concatenate(parts) for parts in zip(*sim.iter_chunks(50))]
+        expected = [0.0]
+        for i in range(49):
+            expected.append(max(0.0, expected[-1] + services[i] - gaps[i]))
+        np.testing.assert_allclose(expected, waits, atol=1e-12)
+
+    def test_mg1(self):
+        queue = MG1Queue.MG1Queue(20, 25, 0.03)
+        result = s.MG1Simulator(queue, 'lognormal', seed=1).run(2000000, warmup=1000)
+        self.assertEqual(1999000, result['n'])
+        self.assert_close_to(queue, result, 0.05)
+
+    def test_md1_and_mm1(self):
+        queue = MD1Queue.MD1Queue(20, 25)
+        self.assert_close_to(queue, s.MG1Simulator(queue, seed=2).run(1000000), 0.05)
+
+        queue = MM1Queue.MM1Queue(15, 20)
+        self.assert_close_to(queue, s.MG1Simulator(queue, seed=3).run(1000000), 0.05)
+
+    def test_user_distribution(self):
+        #a user supplied sampler with mean 0.04 and standard deviation 0.04 / sqrt(3)
+        queue = MG1Queue.MG1Queue(20, 25, 0.04 / math.sqrt(3))
+        uniform = lambda rng, size: rng.uniform(0, 0.08, size)
+        self.assert_close_to(queue, s.MG1Simulator(queue, uniform, seed=5).run(1000000), 0.05)
+
+    def test_invalid(self):
+        result = s.MG1Simulator(MG1Queue.MG1Queue(20, 25, -1)).run(1000)
+        self.assertTrue(math.isnan(result['wq']))
+        self.assertEqual(0, result['n'])
+
+    def test_multi_server_rejected(self):
+        with self.assertRaises(ValueError):
+            s.MG1Simulator(MMcQueue.MMcQueue(20, 25, 2))
+        #c = 1 is a single server
+        self.assertEqual(20, s.MG1Simulator(MMcQueue.MMcQueue(20, 25, 1)).lamda)
@@ -1,13 +1,16 @@
 import math
 from math import isnan
+import numpy as np
 import BaseQueue
+import PKQueue
 
 
-class MM1Queue(BaseQueue.BaseQueue):
+class MM1Queue(PKQueue.PKQueue, BaseQueue.BaseQueue):
     """
     MM1 queue class is a Base Queue class that implements single server queue (c = 1).
     Checks for validity and feasibility of inputs.
     """
+    __slots__ = ()
 
     def __init__(self, lamda, mu):
         """
@@ -24,17 +27,45 @@ class MM1Queue(BaseQueue.BaseQueue):
         Returns: String
 
         """
+        m = self.metrics()
         return (
             f'MM1Queue instance at {id(self)}'
-            f'\n\t lamda: {self.lamda}'
-            f'\n\t mu: {self.mu}'
-            f'\n\t ro: {self.ro}'
-            f'\n\t lq: {self.lq}'
-            f'\n\t l: {self.l}'
-            f'\n\t wq: {self.wq}'
-            f'\n\t w: {self.w}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t ro: {m.ro}'
+            f'\n\t lq: {m.lq}'
+            f'\n\t l: {m.l}'
+            f'\n\t wq: {m.wq}'
+            f'\n\t w: {m.w}'
         )
 
+    def _service_sigma(self):
+        """
+        Helper function for the service time standard deviation used by the distribution methods.
+        Returns: 1 / mu, since service times are exponential
+        """
+        return 1 / self.mu
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu):
+        """
+        Calculates the M/M/1 metrics for every element of the broadcast lamda and mu arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lamda, mu = cls._batch_params(lamda, mu)
+        ro = lamda / mu
+        valid = ~np.isnan(ro)
+
+        #infeasible elements are masked out afterwards, so silence the warnings they raise here
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lq = lamda ** 2 / (mu * (mu - lamda))
+
+        return cls._batch_results(lamda, ro, ro, lq, 1 - ro, valid, valid & (ro < 1))
+
     def _calc_metrics(self):
         """
         Calculates Lq and P0 for M/M/1 queue
@@ -1,5 +1,6 @@
 from unittest import TestCase
 import math
+import numpy as np
 import MM1Queue as q
 
 
@@ -120,3 +121,26 @@ class TestMM1Queue(TestCase):
         self.assertIn('lq:', s)
         self.assertIn('wq:', s)
         self.assertIn('w:', s)
+
+
+    def test_batch_metrics(self):
+        #Each broadcast element should match the scalar queue, including the nan/inf handling
+        lamdas = np.array([[10], [15], [25], [0]])
+        mus = np.array([20, 30])
+        m = q.MM1Queue.batch_metrics(lamdas, mus)
+        self.assertEqual((4, 2), m['lq'].shape)
+
+        for i, lamda in enumerate(lamdas[:, 0]):
+            for j, mu in enumerate(mus):
+                queue = q.MM1Queue(int(lamda), int(mu))
+                for name in ('lq', 'p0', 'l', 'w', 'wq', 'ro'):
+                    np.testing.assert_allclose(getattr(queue, name), m[name][i, j])
+
+    def test_distributions(self):
+        #P(N = n) = (1 - ro) ro^n and P(Wq > t) = ro e^-(mu - lamda) t
+        n = np.arange(50)
+        np.testing.assert_allclose(self.queue.state_probabilities(n), 0.25 * 0.75 ** n, atol=1e-10)
+        np.testing.assert_allclose(self.queue.wait_exceedance([0.0, 0.2]), 0.75 * np.exp(-5 * np.array([0.0, 0.2])),
+                                   rtol=1e-6)
+        p95 = self.queue.wait_percentile(0.95)
+        self.assertAlmostEqual(math.log(0.75 / 0.05) / 5, p95, places=6)
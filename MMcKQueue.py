@@ -0,0 +1,470 @@
+import Erlang
+import MMcQueue
+import QueueMetrics
+import math
+import numpy as np
+from numbers import Number
+
+
+def _finite_buffer(r, c, k):
+    """
+    Helper function for the M/M/c/K metrics, for scalars or broadcast arrays.
+    Relative to S(c) = sum(r^n / n!, n = 0..c), the states below c weigh 1 - B in total and state c + j weighs
+    B * ro^j for j = 0..m with m = K - c, where B is Erlang B. The geometric tail is summed in closed form in
+    log space, so the cost is the O(c) Erlang recurrence whatever K is, and ro >= 1 or K = 10^6 neither
+    overflow nor cancel.
+    Args:
+        r (number or ndarray): offered load lamda / mu
+        c (int or ndarray): numbers of servers
+        k (int or ndarray): system capacities, at least c
+
+    Returns: tuple of (p0, lq, blocking probability, probability of finding every server busy, log p0,
+        log of P(N = c))
+    """
+    b, log_s = Erlang.erlang_b_log_s(r, c)
+    b, log_s, r, c, k = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (b, log_s, r, c, k)])
+    m = k - c
+    n1 = m + 1
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        log_ro = np.log(r / c)
+        log_h = _log_geometric_sum(log_ro, n1)
+        #mean queue length among the states c..K, from the truncated geometric distribution; the series
+        # avoids the cancellation between the two terms when ro is close to 1
+        mean_j = np.where(np.abs(n1 * log_ro) < 1e-3, m / 2 + m * (m + 2) * log_ro / 12,
+                          1 / np.expm1(-log_ro) - n1 / np.expm1(-n1 * log_ro))
+
+        log_b = np.log(b)
+        log_z = np.logaddexp(np.log1p(-b), log_b + log_h)
+        log_pc = log_b - log_z
+        p_busy = np.exp(log_pc + log_h)
+        p_block = np.exp(log_pc + m * log_ro)
+        log_p0 = -log_s - log_z
+    lq = np.where(p_busy > 0, p_busy * mean_j, 0.0)
+
+    if np.ndim(p_busy) == 0:
+        return float(np.exp(log_p0)), float(lq), float(p_block), float(p_busy), float(log_p0), float(log_pc)
+    return np.exp(log_p0), lq, p_block, p_busy, log_p0, log_pc
+
+
+def _log_geometric_sum(log_ro, n):
+    """
+    Helper function for log(sum(ro^j, j = 0..n - 1)) = log(expm1(n L) / expm1(L)), L = log ro, written so that
+    it neither overflows for ro > 1 nor cancels for ro close to 1.
+    Args:
+        log_ro (number or ndarray): log of the traffic intensity
+        n (number or ndarray): number of terms; 0 terms give -inf
+
+    Returns: ndarray of log sums
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        grow = log_ro > 0
+        log_sum = np.where(grow, n * log_ro + np.log(-np.expm1(-n * log_ro)) - np.log(np.expm1(log_ro)),
+                           np.log(-np.expm1(n * log_ro)) - np.log(-np.expm1(log_ro)))
+        log_sum = np.where(log_ro == 0, np.log(n), log_sum)
+    return np.where(n > 0, log_sum, -np.inf)
+
+
+def _log_factorials(n):
+    """
+    Helper function for log(j!), j = 0..n, as a table that _wait_exceedance indexes.
+    Args:
+        n (int): largest j
+
+    Returns: ndarray of n + 1 values
+    """
+    return np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, n + 1)))))
+
+
+def _wait_exceedance(x, log_q0, log_ro, m, log_factorial):
+    """
+    Helper function for P(Wq > t) of admitted customers, for flat arrays of scenarios at once. A customer
+    admitted with i others waiting waits for i + 1 service completions at rate c mu, so with x = c mu t
+    P(Wq > t) = sum(P(Poisson(x) = i) * P(at least i others waiting on admission), i = 0..m - 1),
+    where admission finds c + j customers with probability q0 * ro^j, so the second factor is a geometric sum.
+    Poisson weights beyond 40 standard deviations of the mean are below double precision, so every scenario
+    only sums over a window of about 80 sqrt(x) states around x, gathered into one padded array.
+    Args:
+        x (ndarray): c mu t, at least 0
+        log_q0 (ndarray): log of the probability that an admitted customer finds exactly c in the system
+        log_ro (ndarray): log of the traffic intensity
+        m (ndarray): number of waiting places K - c
+        log_factorial (ndarray): _log_factorials up to at least max(m), built once by the caller so repeated
+            calls such as the bisection steps of a percentile do not rebuild it
+
+    Returns: ndarray of probabilities
+    """
+    spread = 40 * np.sqrt(x) + 40
+    lo = np.clip(np.floor(x - spread), 0, None)
+    width = int(min(np.max(np.ceil(2 * spread) + 2), np.max(m))) if x.size else 0
+    if width <= 0:
+        return np.zeros(x.shape)
+
+    i = lo[:, None] + np.arange(width)
+    inside = i < m[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_pmf = np.where(x[:, None] > 0, i * np.log(x)[:, None] - x[:, None],
+                           np.where(i == 0, 0.0, -np.inf)) - log_factorial[np.where(inside, i, 0).astype(int)]
+        log_tail = log_q0[:, None] + i * log_ro[:, None] + _log_geometric_sum(log_ro[:, None], m[:, None] - i)
+        terms = np.where(inside, np.exp(log_pmf + log_tail), 0.0)
+    return np.clip(terms.sum(axis=1), 0.0, 1.0)
+
+
+class MMcKQueue(MMcQueue.MMcQueue):
+    """
+    MMcK queue class is an MMC queue with a finite capacity K: at most K customers are in the system, c of
+    them in service, and arrivals that find it full are turned away.
+    Little's Laws use the effective arrival rate lamda_eff = lamda * (1 - p_block) of the admitted customers.
+    A bounded system always has a steady state, so the queue is feasible whenever it is valid, even when
+    ro = lamda / (c * mu) >= 1.
+    """
+    __slots__ = ('_K', '_p_block', '_p_busy', '_log_p0', '_log_pc')
+
+    #set by _calc_metrics alongside lq and p0: the blocking probability, the probability that every server is
+    # busy, and log P(N = 0) and log P(N = c), which p_wait and the distributions start from
+    _metric_fields = MMcQueue.MMcQueue._metric_fields + ('_p_block', '_p_busy', '_log_p0', '_log_pc')
+
+    def __init__(self, lamda, mu, c, K):
+        """
+        Constructor for MMcK queue class. Uses the same arguments as MMC queue with the addition of K.
+        Args:
+            lamda (number): average rate of arrival (scalar or iterable)
+            mu (number): average rate of service completion
+            c (number): number of servers in the queue
+            K (number): capacity of the system (waiting and in service), at least c
+        """
+        super().__init__(lamda, mu, c)
+        self.K = K
+
+    def __str__(self):
+        """
+        Method that returns a string representation of a queue's object state.
+        Returns: String
+        """
+        m = self.metrics()
+        return (
+            f'MMcKQueue instance at {id(self)}'
+            f'\n\t lamda: {m.lamda}'
+            f'\n\t lamda_eff: {self.lamda_eff}'
+            f'\n\t mu: {m.mu}'
+            f'\n\t P0: {m.p0}'
+            f'\n\t P block: {self.p_block}'
+            f'\n\t lq: {m.lq}'
+            f'\n\t l: {m.l}'
+            f'\n\t wq: {m.wq}'
+            f'\n\t w: {m.w}'
+            f'\n\t c: {self.c}'
+            f'\n\t K: {self.K}'
+        )
+
+    @property
+    def K(self):
+        """
+        Getter method for property K
+        Returns: the capacity of the system
+        """
+        return self._K
+
+    @K.setter
+    def K(self, K):
+        """
+        Setter method for property K; does error checking on the argument. K below c is caught by is_valid,
+        since c can be set after K.
+        Args:
+            K (number): capacity of the system
+        Returns: None
+        """
+        self._recalc_needed = True
+        if isinstance(K, Number) and 0 < K < math.inf:
+            self._K = K
+        else:
+            self._K = math.nan
+
+    @property
+    def p_block(self):
+        """
+        Getter method for p_block property. Values for p_block are set in calc_metrics.
+        Returns: the probability that an arrival finds the system full and is turned away
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+        return self._p_block
+
+    @property
+    def lamda_eff(self):
+        """
+        Getter method for lamda_eff property
+        Returns: rate of the arrivals that are admitted
+        """
+        return self.lamda * (1 - self.p_block)
+
+    @property
+    def l(self):
+        """
+        Getter method for l property; the customers in service are lamda_eff / mu.
+        Returns: average number of people in the system
+        """
+        return self.lq + self.lamda_eff / self.mu
+
+    @property
+    def w(self):
+        """
+        Getter method for w property calculated using Little's Laws with lamda_eff
+        Returns: time an admitted customer spends in the system
+        """
+        return self.l / self.lamda_eff
+
+    @property
+    def wq(self):
+        """
+        Getter method for wq property calculated using Little's Laws with lamda_eff
+        Returns: time an admitted customer spends waiting in the queue
+        """
+        return self.lq / self.lamda_eff
+
+    @property
+    def utilization(self):
+        """
+        Getter method for utilization property. Unlike ro, which is the offered load per server, this is the
+        fraction of time each server is busy.
+        Returns: lamda_eff / (c * mu)
+        """
+        return self.lamda_eff / (self.c * self.mu)
+
+    def metrics(self):
+        """
+        Calculates every metric once and returns them together, with Little's Laws on lamda_eff.
+        r and ro stay the offered load, as in the properties.
+        Returns: QueueMetrics snapshot
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+
+        lamda_eff = self._lamda * (1 - self._p_block)
+        lq = self._lq
+        l = lq + lamda_eff / self._mu
+        return QueueMetrics.QueueMetrics(self._lamda, self._mu, self.r, self.ro, self._p0, lq, l,
+                                         lq / lamda_eff, l / lamda_eff)
+
+    def is_valid(self) -> bool:
+        """
+        Checks to see if lamda, mu, c and K are not nan and K is at least c
+
+        Returns: True if all arguments are valid, False otherwise
+        """
+        if not super().is_valid() or math.isnan(self.K):
+            return False
+
+        return self.K >= self.c
+
+    def is_feasible(self) -> bool:
+        """
+        A finite system is stable for any load, so every valid queue is feasible.
+
+        Returns: True if all arguments are valid
+        """
+        return self.is_valid()
+
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key, adding K to the MMcQueue key.
+        Returns: tuple key
+        """
+        return super()._cache_key() + (self._K,)
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, c, K):
+        """
+        Calculates the M/M/c/K metrics for every element of the broadcast lamda, mu, c and K arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            K (array_like): system capacities
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq, ro, p_block, lamda_eff and p_wait, the
+            probability that an admitted customer has to wait
+        """
+        lamda, mu, c, K = cls._batch_params(lamda, mu, c, K)
+        r = lamda / mu
+        ro = r / c
+        valid = ~np.isnan(ro) & (K >= c)
+
+        #placeholder values where the scenario will be masked out anyway
+        p0, lq, p_block, p_busy, _, _ = _finite_buffer(np.where(valid, r, 1.0), np.where(valid, c, 1).astype(int),
+                                                       np.floor(np.where(valid, K, 1)))
+        nan = np.full(ro.shape, np.nan)
+        p0, lq, p_block, p_busy = (np.where(valid, x, nan) for x in (p0, lq, p_block, p_busy))
+        lamda_eff = lamda * (1 - p_block)
+        l = lq + lamda_eff / mu
+        return {'lq': lq, 'p0': p0, 'l': l, 'w': l / lamda_eff, 'wq': lq / lamda_eff, 'ro': ro,
+                'p_block': p_block, 'lamda_eff': lamda_eff, 'p_wait': (p_busy - p_block) / (1 - p_block)}
+
+    def staffing_curve(self, c_max, c_min=1):
+        """
+        Calculates the metrics of this queue's lamda, mu and K for every number of servers from c_min to c_max
+        with one batch_metrics call. Server counts above K are invalid and get math.nan.
+        Args:
+            c_max (int): largest number of servers
+            c_min (int): smallest number of servers
+
+        Returns: dict of NumPy arrays keyed by c, p0, lq, wq, w, p_wait and p_block
+        """
+        cs = np.arange(c_min, c_max + 1)
+        m = self.batch_metrics(self.lamda, self.mu, cs, self.K)
+        return {'c': cs, 'p0': m['p0'], 'lq': m['lq'], 'wq': m['wq'], 'w': m['w'], 'p_wait': m['p_wait'],
+                'p_block': m['p_block']}
+
+    @classmethod
+    def batch_wait_percentile(cls, lamda, mu, c, K, q):
+        """
+        Calculates waiting time percentiles of admitted customers for every element of the broadcast lamda,
+        mu, c, K and q arrays in one pass: the upper bounds double until they bracket the answers, then all
+        brackets are bisected together on the vectorized P(Wq > t).
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            K (array_like): system capacities
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times t with P(Wq <= t) = q; nan for invalid queues or q outside [0, 1],
+            inf for q = 1
+        """
+        params = np.broadcast_arrays(*cls._batch_params(lamda, mu, c, K), np.asarray(q, dtype=float))
+        shape = params[0].shape
+        lamda, mu, c, K, q = (x.ravel() for x in params)
+        valid = ~np.isnan(lamda / mu / c) & (K >= c)
+        c = np.where(valid, c, 1).astype(int)
+        k = np.floor(np.where(valid, K, 1))
+        r = np.where(valid, lamda / mu, 1.0)
+        rate = np.where(valid, c * mu, 1.0)
+        log_q0, log_ro, m = cls._admitted_wait(r, c, k)
+        log_factorial = _log_factorials(int(np.max(m, initial=0)))
+
+        target = 1 - q
+        #the wait has no upper bound, so q = 1 is left out here and comes back as inf
+        p_any = _wait_exceedance(np.zeros(q.shape), log_q0, log_ro, m, log_factorial)
+        needed = valid & (target < p_any) & (q < 1)
+        lo = np.zeros(q.shape)
+        #a wait is at most K - c service completions, so this bounds the bulk of it
+        hi = m + 1.0
+        while True:
+            short = needed & (_wait_exceedance(hi, log_q0, log_ro, m, log_factorial) > target)
+            if not short.any():
+                break
+            lo = np.where(short, hi, lo)
+            hi = np.where(short, 2 * hi, hi)
+
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            over = _wait_exceedance(mid, log_q0, log_ro, m, log_factorial) > target
+            lo = np.where(over, mid, lo)
+            hi = np.where(over, hi, mid)
+
+        t = np.where(needed, (lo + hi) / 2 / rate, np.where(q == 1, np.inf, 0.0))
+        return np.where(valid & (q >= 0) & (q <= 1), t, np.nan).reshape(shape)
+
+    @staticmethod
+    def _admitted_wait(r, c, k):
+        """
+        Helper function for the parameters of _wait_exceedance: an admitted customer finds c + j customers,
+        j = 0..K - c - 1, with probability q0 * ro^j, where q0 = P(N = c) / (1 - p_block).
+        Args:
+            r (number or ndarray): offered load lamda / mu
+            c (int or ndarray): numbers of servers
+            k (int or ndarray): system capacities, at least c
+
+        Returns: tuple of flat ndarrays (log q0, log ro, K - c)
+        """
+        _, _, p_block, _, _, log_pc = _finite_buffer(r, c, k)
+        r, c, k, p_block, log_pc = (np.atleast_1d(np.asarray(x, dtype=float)).ravel()
+                                    for x in np.broadcast_arrays(r, c, k, p_block, log_pc))
+        with np.errstate(divide='ignore'):
+            return log_pc - np.log1p(-p_block), np.log(r / c), k - c
+
+    def _calc_metrics(self):
+        """
+        Calculates and stores lq, p0, the blocking probability, the probability that every server is busy and
+        log P(N = 0) and log P(N = c) for an MMcK queue.
+        This is called whenever lamda, mu, c or K is set or changed.
+
+        Returns: None
+        """
+        if not self.is_valid():
+            self._lq = math.nan
+            self._p0 = math.nan
+            self._p_block = math.nan
+            self._p_busy = math.nan
+            self._log_p0 = math.nan
+            self._log_pc = math.nan
+            return
+
+        (self._p0, self._lq, self._p_block, self._p_busy, self._log_p0,
+         self._log_pc) = _finite_buffer(self.r, int(self.c), math.floor(self.K))
+
+    @property
+    def p_wait(self):
+        """
+        Getter method for p_wait property
+        Returns: probability that an admitted customer has to wait
+        """
+        if self._recalc_needed:
+            self._refresh_metrics()
+        return (self._p_busy - self._p_block) / (1 - self._p_block)
+
+    def state_probabilities(self, n):
+        """
+        Calculates P(N = n) for a whole array of n at once, in log space; states above K and non-whole n have
+        probability 0.
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        if self._recalc_needed:
+            self._refresh_metrics()
+        whole = (n >= 0) & (n <= self.K) & (np.floor(n) == n)
+        k = np.where(whole, n, 0).astype(int)
+        return np.where(whole, np.exp(self._log_state_terms(k, self._log_p0)), 0.0)
+
+    def wait_exceedance(self, t):
+        """
+        Calculates P(Wq > t) for admitted customers, for a whole array of t at once. A customer admitted with
+        j others waiting waits for j + 1 service completions at rate c mu, so
+        P(Wq > t) = sum over i of P(Poisson(c mu t) = i) * P(at least i others waiting on admission).
+        All t are evaluated together over the Poisson weights that are not negligible.
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        if self._recalc_needed:
+            self._refresh_metrics()
+        #an admitted customer finds c + j customers with probability q0 * ro^j, q0 = P(N = c) / (1 - p_block)
+        m = math.floor(self.K) - int(self.c)
+        log_q0 = self._log_pc - math.log1p(-self._p_block)
+        log_ro = math.log(self.r / int(self.c))
+        x = self.c * self.mu * np.clip(t, 0, None).ravel()
+        log_q0, log_ro, places = (np.full(x.shape, v, dtype=float) for v in (log_q0, log_ro, m))
+        p = _wait_exceedance(x, log_q0, log_ro, places, _log_factorials(m))
+        return np.where(t >= 0, p.reshape(t.shape), 1.0)
+
+    def wait_percentile(self, q):
+        """
+        Calculates waiting time percentiles of admitted customers, e.g. q = 0.95 for p95, for a whole array
+        of q at once.
+        Args:
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times t with P(Wq <= t) = q; nan for an invalid queue or q outside [0, 1],
+            inf for q = 1
+        """
+        return self.batch_wait_percentile(self.lamda, self.mu, self.c, self.K, q)
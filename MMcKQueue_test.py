@@ -0,0 +1,155 @@
+from unittest import TestCase
+import math
+import numpy as np
+import Erlang
+import MMcQueue
+import MMcKQueue as q
+
+
+def brute_force(lamda, mu, c, K):
+    #state probabilities straight from the birth-death balance equations
+    p = [1.0]
+    for n in range(1, K + 1):
+        p.append(p[-1] * lamda / (mu * min(n, c)))
+    p = np.array(p) / sum(p)
+    lq = sum((n - c) * p[n] for n in range(c, K + 1))
+    return p, lq
+
+
+class TestMMcKQueue(TestCase):
+    def setUp(self):
+        self.queue = q.MMcKQueue(15, 4, 3, 10)
+
+    def test_init(self):
+        self.assertAlmostEqual(15, self.queue._lamda)
+        self.assertAlmostEqual(4, self.queue._mu)
+        self.assertAlmostEqual(3, self.queue._c)
+        self.assertAlmostEqual(10, self.queue._K)
+        self.assertTrue(self.queue._recalc_needed)
+
+    def test_metrics(self):
+        #ro = 1.25: infeasible for MMcQueue but fine with a finite buffer
+        self.assertTrue(self.queue.is_feasible())
+        p, lq = brute_force(15, 4, 3, 10)
+        self.assertAlmostEqual(p[0], self.queue.p0)
+        self.assertAlmostEqual(p[-1], self.queue.p_block)
+        self.assertAlmostEqual(lq, self.queue.lq)
+        lamda_eff = 15 * (1 - p[-1])
+        self.assertAlmostEqual(lamda_eff, self.queue.lamda_eff)
+        self.assertAlmostEqual(lq / lamda_eff, self.queue.wq)
+        self.assertAlmostEqual(lq + lamda_eff / 4, self.queue.l)
+        self.assertAlmostEqual(self.queue.l / lamda_eff, self.queue.w)
+        self.assertAlmostEqual(lamda_eff / 12, self.queue.utilization)
+        np.testing.assert_allclose(p, self.queue.state_probabilities(np.arange(11)))
+        self.assertEqual(0, self.queue.state_probabilities(11))
+
+        m = self.queue.metrics()
+        self.assertAlmostEqual(self.queue.wq, m.wq)
+        self.assertAlmostEqual(self.queue.w, m.w)
+
+        #ro = 1 and ro < 1 as well
+        for lamda in (12, 6):
+            p, lq = brute_force(lamda, 4, 3, 10)
+            queue = q.MMcKQueue(lamda, 4, 3, 10)
+            self.assertAlmostEqual(p[-1], queue.p_block)
+            self.assertAlmostEqual(lq, queue.lq)
+
+    def test_limits(self):
+        #K = c is the Erlang loss system
+        self.assertAlmostEqual(Erlang.erlang_b(3.75, 3), q.MMcKQueue(15, 4, 3, 3).p_block)
+        self.assertEqual(0, q.MMcKQueue(15, 4, 3, 3).lq)
+        #a huge buffer with ro < 1 is MMcQueue
+        big = q.MMcKQueue(10, 4, 3, 10 ** 6)
+        self.assertAlmostEqual(MMcQueue.MMcQueue(10, 4, 3).lq, big.lq)
+        self.assertAlmostEqual(0, big.p_block)
+
+    def test_large_k(self):
+        #K = 10^6 stays finite on both sides of ro = 1
+        over = q.MMcKQueue(15, 4, 3, 10 ** 6)
+        self.assertAlmostEqual(1 - 12 / 15, over.p_block)
+        #the waiting line sits 1 / (ro - 1) = 4 short of the K - c places on average
+        self.assertAlmostEqual(10 ** 6 - 3 - 4, over.lq, delta=1e-3)
+        level = q.MMcKQueue(12, 4, 3, 10 ** 6)
+        self.assertAlmostEqual((10 ** 6 - 3) / 2, level.lq, delta=1)
+        for queue in (over, level):
+            self.assertTrue(math.isfinite(queue.wq))
+
+    def test_waits(self):
+        p, _ = brute_force(15, 4, 3, 10)
+        admitted = p[:-1] / (1 - p[-1])
+        self.assertAlmostEqual(admitted[3:].sum(), self.queue.p_wait)
+        self.assertAlmostEqual(self.queue.p_wait, self.queue.wait_exceedance(0))
+        #the mean of Wq from its tail matches wq
+        t = np.linspace(0, 10, 10001)
+        tail = self.queue.wait_exceedance(t)
+        self.assertAlmostEqual(self.queue.wq, ((tail[1:] + tail[:-1]) / 2 * np.diff(t)).sum(), places=5)
+        p95, p99, top = self.queue.wait_percentile([0.95, 0.99, 1.0])
+        self.assertAlmostEqual(0.05, self.queue.wait_exceedance(p95))
+        self.assertAlmostEqual(0.01, self.queue.wait_exceedance(p99))
+        self.assertTrue(math.isinf(top))
+
+        #p_wait and the distributions come from the stored metrics, which follow every parameter change
+        self.queue.lamda = 9
+        p, _ = brute_force(9, 4, 3, 10)
+        self.assertAlmostEqual(p[3:-1].sum() / (1 - p[-1]), self.queue.p_wait)
+        np.testing.assert_allclose(p, self.queue.state_probabilities(np.arange(11)))
+        self.assertAlmostEqual(self.queue.p_wait, self.queue.wait_exceedance(0))
+        self.queue.K = 2
+        self.assertTrue(math.isnan(self.queue.p_wait))
+
+    def test_invalid_values(self):
+        self.queue.K = 2
+        self.assertFalse(self.queue.is_valid())
+        self.assertTrue(math.isnan(self.queue.lq))
+        self.assertTrue(math.isnan(self.queue.p_block))
+        self.queue.K = -1
+        self.assertTrue(math.isnan(self.queue.K))
+        self.queue.K = 'ten'
+        self.assertTrue(math.isnan(self.queue.K))
+        self.queue.K = 10
+        self.assertFalse(math.isnan(self.queue.lq))
+
+    def test_batch_metrics(self):
+        lamda = np.array([15, 12, 6, -1, 15])
+        K = np.array([10, 10, 10, 10, 2])
+        m = q.MMcKQueue.batch_metrics(lamda, 4, 3, K)
+        for i in range(3):
+            queue = q.MMcKQueue(float(lamda[i]), 4, 3, int(K[i]))
+            for name in ('lq', 'p0', 'l', 'w', 'wq'):
+                self.assertAlmostEqual(getattr(queue, name), m[name][i])
+            self.assertAlmostEqual(queue.p_block, m['p_block'][i])
+            self.assertAlmostEqual(queue.lamda_eff, m['lamda_eff'][i])
+            self.assertAlmostEqual(queue.p_wait, m['p_wait'][i])
+        self.assertTrue(np.all(np.isnan(m['lq'][3:])))
+
+    def test_staffing_curve(self):
+        curve = self.queue.staffing_curve(12, c_min=2)
+        np.testing.assert_array_equal(np.arange(2, 13), curve['c'])
+        for i, c in enumerate(curve['c'][:9]):
+            queue = q.MMcKQueue(15, 4, int(c), 10)
+            for name in ('p0', 'lq', 'wq', 'w', 'p_wait', 'p_block'):
+                self.assertAlmostEqual(getattr(queue, name), curve[name][i])
+        #more servers than places is invalid
+        self.assertTrue(np.all(np.isnan(curve['lq'][9:])))
+
+    def test_batch_wait_percentile(self):
+        lamda = np.array([[15], [12], [6]])
+        K = np.array([10, 20, 3])
+        t = q.MMcKQueue.batch_wait_percentile(lamda, 4, 3, K, 0.95)
+        self.assertEqual((3, 3), t.shape)
+        for i in range(3):
+            for j in range(3):
+                queue = q.MMcKQueue(float(lamda[i, 0]), 4, 3, int(K[j]))
+                self.assertAlmostEqual(float(queue.wait_percentile(0.95)), t[i, j])
+                if t[i, j] > 0:
+                    self.assertAlmostEqual(0.05, float(queue.wait_exceedance(t[i, j])))
+        #no waiting room means no wait; invalid scenarios and probabilities give nan
+        np.testing.assert_array_equal(0, t[:, 2])
+        self.assertTrue(np.all(np.isnan(q.MMcKQueue.batch_wait_percentile([15, -1, 15], 4, 3, [10, 10, 2],
+                                                                          [1.5, 0.5, 0.5]))))
+
+    def test_str(self):
+        s = str(q.MMcKQueue(5, 2, 3, 6))
+        self.assertIsInstance(s, str)
+        self.assertIn('MMcKQueue instance', s)
+        self.assertIn('K:', s)
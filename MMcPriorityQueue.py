@@ -2,6 +2,8 @@ from toolz.functoolz import is_valid_args
 
 import MMcQueue
 import math
+from array import array
+import numpy as np
 from toolz import isiterable
 from numbers import Number
 
@@ -13,6 +15,9 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
     Contains the values that result from Little's Laws calculations.
     Checks for validity and feasibility of inputs.
     """
+    #lamda_k is stored as a compact array of doubles
+    __slots__ = ('_lamda_k',)
+
     def __init__(self, lamda, mu,c):
         """
         Constructor for MMC Priority queue class.
@@ -29,15 +34,16 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
         Method that prints a string representation of a queue's object state.
         Returns: None
         """
+        m = self.metrics()
         print(f'MMcPriorityQueue instance at {id(self)}'
-              f'\n\t lamda: {self.lamda}'
+              f'\n\t lamda: {m.lamda}'
               f'\n\t lamda_k: {self.lamda_k}'
-              f'\n\t mu: {self.mu}'
-              f'\n\t P0: {self.p0}'
-              f'\n\t lq: {self.lq}'
-              f'\n\t l: {self.l}'
-              f'\n\t wq: {self.wq}'
-              f'\n\t w: {self.w}'
+              f'\n\t mu: {m.mu}'
+              f'\n\t P0: {m.p0}'
+              f'\n\t lq: {m.lq}'
+              f'\n\t l: {m.l}'
+              f'\n\t wq: {m.wq}'
+              f'\n\t w: {m.w}'
               f'\n\t c: {self.c}')
 
     @property
@@ -54,6 +60,7 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
             lamda_k (number): interarrival rate of customers to the queue
         Returns: None
         """
+        self._recalc_needed = True
         if isiterable(lamda_k):
             wlamda = lamda_k
         else:
@@ -63,12 +70,12 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
 
         if all([isinstance(l, Number) and l > 0 for l in wlamda]):
             self._lamda = self._simplify_lamda(lamda_k)
-            self._lamda_k = lamda_k
+            self._lamda_k = array('d', wlamda)
         else:
             self._lamda = math.nan
             # instead of assigning the entire lamda_k to math.nan, go in and assign each index to math.nan
             # to keep lamda_k iterable
-            self._lamda_k = [math.nan for _ in wlamda]
+            self._lamda_k = array('d', [math.nan for _ in wlamda])
 
 
     @property
@@ -77,10 +84,11 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
         Getter method for lamda_k; from what I understand of the instructions,
         lamda_k is a tuple containing all lamdas that can then be called on separately
         through get_lamda_k(). lamda_k is NOT an aggregate lamda.
+        Internally it is stored as a compact array of doubles; a single lamda becomes a one class tuple.
 
         Returns: tuple of average interarrival rates for each class k
         """
-        return self._lamda_k
+        return tuple(self._lamda_k)
 
     @lamda_k.setter
     def lamda_k(self, lamda_k):
@@ -153,7 +161,7 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
             return self.lamda_k
         else:
             #use k-1 because indexing starts at 0
-            return  self.lamda_k[k-1]
+            return  self._lamda_k[k-1]
 
     def get_lq_k(self, k):
         """
@@ -238,4 +246,30 @@ class MMcPriorityQueue(MMcQueue.MMcQueue):
             return math.inf
 
         wqk = (1 - self.ro) * self.lq / (self.lamda * self.get_b_k(k-1) * self.get_b_k(k))
-        return wqk
\ No newline at end of file
+        return wqk
+
+    def get_class_metrics(self):
+        """
+        Calculates the metrics of every priority class in one pass. The sums over higher priority classes that
+        get_b_k and get_ro_k redo for each k come from a single prefix sum over lamda_k, and validity and
+        feasibility are only checked once.
+        Returns: dict of NumPy arrays keyed by wq_k, w_k, lq_k, l_k, ro_k and b_k, where index k - 1 holds
+            class k
+        """
+        lamda_k = np.array(self._lamda_k, dtype=float)
+        if not self.is_valid():
+            nan = np.full(lamda_k.shape, np.nan)
+            return {'wq_k': nan, 'w_k': nan, 'lq_k': nan, 'l_k': nan, 'ro_k': nan, 'b_k': nan}
+
+        elif not self.is_feasible():
+            inf = np.full(lamda_k.shape, np.inf)
+            return {'wq_k': inf, 'w_k': inf, 'lq_k': inf, 'l_k': inf, 'ro_k': inf, 'b_k': inf}
+
+        ro_k = np.cumsum(lamda_k) / (self.mu * self.c)
+        b_k = 1 - ro_k
+        #B(k-1) for every class, B0 = 1
+        b_prev = np.concatenate(([1.0], b_k[:-1]))
+
+        wq_k = (1 - self.ro) * self.lq / (self.lamda * b_prev * b_k)
+        w_k = wq_k + 1 / self.mu
+        return {'wq_k': wq_k, 'w_k': w_k, 'lq_k': lamda_k * wq_k, 'l_k': lamda_k * w_k, 'ro_k': ro_k, 'b_k': b_k}
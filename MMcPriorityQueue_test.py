@@ -1,6 +1,7 @@
 from unittest import TestCase
 import MMcPriorityQueue as q
 import math
+import numpy as np
 
 class TestMMcPriorityQueue(TestCase):
     def setUp(self):
@@ -113,4 +114,39 @@ class TestMMcPriorityQueue(TestCase):
 
         #test invalid values
         self.assertTrue(math.isnan(self.queue.get_wq_k(0)))
-        self.assertTrue(math.isnan(self.queue.get_wq_k(4)))
\ No newline at end of file
+        self.assertTrue(math.isnan(self.queue.get_wq_k(4)))
+
+    def test_get_class_metrics(self):
+        #every class should match the per-class getters
+        m = self.queue.get_class_metrics()
+        for k in range(1, 4):
+            self.assertAlmostEqual(self.queue.get_wq_k(k), m['wq_k'][k - 1])
+            self.assertAlmostEqual(self.queue.get_w_k(k), m['w_k'][k - 1])
+            self.assertAlmostEqual(self.queue.get_lq_k(k), m['lq_k'][k - 1])
+            self.assertAlmostEqual(self.queue.get_l_k(k), m['l_k'][k - 1])
+            self.assertAlmostEqual(self.queue.get_ro_k(k), m['ro_k'][k - 1])
+            self.assertAlmostEqual(self.queue.get_b_k(k), m['b_k'][k - 1])
+
+        #infeasible and invalid queues
+        self.queue.mu = 5
+        self.assertTrue(np.all(np.isinf(self.queue.get_class_metrics()['wq_k'])))
+        self.queue.mu = -5
+        self.assertTrue(np.all(np.isnan(self.queue.get_class_metrics()['wq_k'])))
+
+    def test_lamda_change_recalculates(self):
+        #setting lamda_k after lq has been read must not leave a stale lq behind
+        self.queue.lq
+        self.queue.lamda_k = (10, 10, 10)
+        self.assertTrue(self.queue._recalc_needed)
+        self.assertAlmostEqual(q.MMcPriorityQueue(30, 20, 2).lq, self.queue.lq)
+
+    def test_lamda_k_storage(self):
+        #lamda_k is kept as a compact array but still reads back as a tuple
+        self.assertFalse(hasattr(self.queue, '__dict__'))
+        self.assertEqual('d', self.queue._lamda_k.typecode)
+        self.assertIsInstance(self.queue.lamda_k, tuple)
+
+        #a single lamda is one class
+        self.queue.lamda = 7
+        self.assertEqual((7,), self.queue.lamda_k)
+        self.assertAlmostEqual(7, self.queue.get_lamda_k(1))
@@ -0,0 +1,312 @@
+import heapq
+import math
+import numpy as np
+
+
+class MMcPrioritySimulator:
+    """
+    Discrete-event simulation of an M/M/c priority queue, used to check MMcPriorityQueue's non-preemptive
+    formulas and to evaluate preemptive-resume priority, which has no formula in this project.
+    Class 1 has the highest priority and customers are first come, first served within a class.
+
+    Customers live in flat per-block NumPy arrays rather than one Python object each, and arrivals, classes
+    and service times are drawn from NumPy in blocks. The queue of each class is a cursor into the block's
+    customers grouped by class, plus a heap of preempted customers waiting to resume. A heap of the classes
+    that have someone waiting picks the next class in O(log K), and a heap of server completion times is the
+    event calendar. Only customers still in the system are carried from one block to the next.
+    """
+    def __init__(self, queue, preemptive=False, seed=None, block_size=65536):
+        """
+        Constructor for MMcPrioritySimulator class.
+        Args:
+            queue (MMcPriorityQueue): queue whose lamda_k, mu and c are simulated
+            preemptive (bool): False for non-preemptive priority, True for preemptive-resume
+            seed (int or SeedSequence): seed of the random stream, for reproducible runs
+            block_size (int): number of arrivals drawn per block
+        """
+        self.lamda_k = np.array(queue.lamda_k, dtype=float)
+        self.mu = queue.mu
+        self.c = queue.c
+        self.preemptive = preemptive
+        self.block_size = block_size
+        self._rng = np.random.default_rng(seed)
+
+    def is_valid(self):
+        """
+        Checks to see if lamda_k, mu and c are usable numbers.
+        Returns: True if the queue can be simulated
+        """
+        return not (np.any(np.isnan(self.lamda_k)) or math.isnan(self.mu) or math.isnan(self.c))
+
+    def run(self, n_customers, warmup=0):
+        """
+        Simulates the queue and estimates per-class metrics. wq_k and w_k are averages over the customers of
+        each class; lq_k and l_k follow from Little's Laws with the observed arrival rate of each class.
+        After the last arrival the customers still in the system are served, so every counted customer is
+        included.
+        Args:
+            n_customers (int): number of customers to simulate, including the warm-up
+            warmup (int): number of customers at the start to leave out of the estimates
+
+        Returns: dict of NumPy arrays keyed by wq_k, w_k, lq_k, l_k and n_k (customers counted per class),
+            where index k - 1 holds class k; nan everywhere if the queue is invalid
+        """
+        n_classes = len(self.lamda_k)
+        if not self.is_valid() or n_customers - warmup < 2:
+            nan = np.full(n_classes, np.nan)
+            return {'wq_k': nan, 'w_k': nan, 'lq_k': nan, 'l_k': nan, 'n_k': np.zeros(n_classes, dtype=int)}
+
+        self._start(n_classes, warmup)
+        lamda = self.lamda_k.sum()
+        cumulative = np.cumsum(self.lamda_k) / lamda
+        clock = 0.0
+        start_time = None
+        done = 0
+        while done < n_customers:
+            n = min(self.block_size, n_customers - done)
+            arrivals = clock + np.cumsum(self._rng.exponential(1 / lamda, n))
+            classes = np.minimum(np.searchsorted(cumulative, self._rng.random(n), side='right'), n_classes - 1)
+            services = self._rng.exponential(1 / self.mu, n)
+            if start_time is None and done + n > warmup:
+                start_time = arrivals[warmup - done] if warmup > done else arrivals[0]
+            self._run_block(arrivals, classes, services, done)
+            clock = arrivals[-1]
+            done += n
+        self._drain()
+
+        n_k = np.array(self._count)
+        span = clock - start_time
+        with np.errstate(divide='ignore', invalid='ignore'):
+            wq_k = np.array(self._wait_sum) / n_k
+            w_k = np.array(self._sojourn_sum) / n_k
+        return {'wq_k': wq_k, 'w_k': w_k, 'lq_k': n_k / span * wq_k, 'l_k': n_k / span * w_k, 'n_k': n_k}
+
+    def _start(self, n_classes, warmup):
+        """
+        Helper function that resets the simulation state.
+        Args:
+            n_classes (int): number of priority classes
+            warmup (int): number of customers at the start to leave out of the estimates
+        Returns: None
+        """
+        c = int(self.c)
+        self._warmup = warmup
+        self._wait_sum = [0.0] * n_classes
+        self._sojourn_sum = [0.0] * n_classes
+        self._count = [0] * n_classes
+
+        #servers: the job each one is running (-1 when free), when it will finish, and the job's class
+        self._free = list(range(c))
+        self._server_job = [-1] * c
+        self._server_end = [0.0] * c
+        self._server_class = [0] * c
+        #event calendar of (completion time, server); entries left behind by preemption are skipped
+        self._busy = []
+        #(-class, server) of running jobs, so the lowest priority one is on top; only used when preemptive
+        self._running = []
+
+        #the customers of the current block, in arrival order, as memoryviews of NumPy arrays: the block is
+        # regrouped with NumPy and the event loop reads single customers at the speed of a list
+        self._arrival = memoryview(np.empty(0))
+        self._class = memoryview(np.empty(0, dtype=np.int64))
+        self._service = memoryview(np.empty(0))
+        self._remaining = memoryview(np.empty(0))
+        self._id = memoryview(np.empty(0, dtype=np.int64))
+
+        #queue of each class: waiting customers are _grouped[_offset[k] + _head[k]:_offset[k] + _tail[k]]
+        self._grouped = memoryview(np.empty(0, dtype=np.int64))
+        self._offset = [0] * n_classes
+        self._head = [0] * n_classes
+        self._tail = [0] * n_classes
+        #per-class heaps of preempted customers, which go before anyone still in _grouped
+        self._preempted = [[] for _ in range(n_classes)]
+        #heap of classes that have someone waiting
+        self._ready = []
+        #server freed by the last successful _preempt
+        self._preempt_server = -1
+
+    def _run_block(self, arrivals, classes, services, first_id):
+        """
+        Helper function that carries the customers still in the system over and processes a block of arrivals.
+        Args:
+            arrivals (ndarray): arrival times of the block
+            classes (ndarray): class index (0 for class 1) of each arrival
+            services (ndarray): service times of each arrival
+            first_id (int): customer number of the first arrival, for the warm-up cut
+        Returns: None
+        """
+        carried = self._carry_over(arrivals, classes, services, first_id)
+
+        arrival_times = self._arrival
+        customer_class = self._class
+        head = self._head
+        tail = self._tail
+        preempted = self._preempted
+        ready = self._ready
+        free = self._free
+        busy = self._busy
+        heappush = heapq.heappush
+
+        for j in range(carried, len(arrival_times)):
+            t = arrival_times[j]
+            while busy and busy[0][0] <= t:
+                self._complete()
+
+            #every arrival takes the next slot of its class queue; one that starts right away (which only
+            # happens when nobody of its class is waiting) is taken straight back off
+            k = customer_class[j]
+            if free:
+                self._start_job(j, free.pop(), t)
+                head[k] += 1
+            elif self.preemptive and self._preempt(k, t):
+                self._start_job(j, self._preempt_server, t)
+                head[k] += 1
+            elif head[k] == tail[k] and not preempted[k]:
+                heappush(ready, k)
+            tail[k] += 1
+
+    def _carry_over(self, arrivals, classes, services, first_id):
+        """
+        Helper function that rebuilds the per-block arrays from the customers still in the system followed by
+        the new arrivals, and regroups the class queues.
+        Args:
+            arrivals (ndarray): arrival times of the new block
+            classes (ndarray): class indexes of the new block
+            services (ndarray): service times of the new block
+            first_id (int): customer number of the first new arrival
+
+        Returns: number of carried customers at the front of the arrays
+        """
+        n_classes = len(self._offset)
+        grouped = np.asarray(self._grouped)
+        waiting = np.concatenate([grouped[self._offset[k] + self._head[k]:self._offset[k] + self._tail[k]]
+                                  for k in range(n_classes)])
+        in_service = np.array([j for j in self._server_job if j >= 0], dtype=np.int64)
+        preempted = np.array([j for heap in self._preempted for j in heap], dtype=np.int64)
+
+        #old indexes are in arrival order, so sorting keeps the new arrays in arrival order too
+        live = np.sort(np.concatenate((waiting, in_service, preempted)))
+        new_index = np.full(len(self._arrival), -1, dtype=np.int64)
+        new_index[live] = np.arange(len(live))
+        customer_class = np.concatenate((np.asarray(self._class)[live], classes)).astype(np.int64)
+        self._arrival = memoryview(np.concatenate((np.asarray(self._arrival)[live], arrivals)))
+        self._class = memoryview(customer_class)
+        self._service = memoryview(np.concatenate((np.asarray(self._service)[live], services)))
+        self._remaining = memoryview(np.concatenate((np.asarray(self._remaining)[live], services)))
+        self._id = memoryview(np.concatenate((np.asarray(self._id)[live],
+                                              np.arange(first_id, first_id + len(arrivals), dtype=np.int64))))
+
+        self._server_job = [int(new_index[j]) if j >= 0 else -1 for j in self._server_job]
+        self._preempted = [[int(new_index[j]) for j in heap] for heap in self._preempted]
+
+        #class queues hold the carried waiting customers, already arrived, then the new arrivals
+        queued = np.concatenate((np.sort(new_index[waiting]), np.arange(len(live), len(self._arrival))))
+        queued_class = customer_class[queued]
+        order = np.argsort(queued_class, kind='stable')
+        self._grouped = memoryview(queued[order])
+        sizes = np.bincount(queued_class, minlength=n_classes)
+        self._offset = (np.cumsum(sizes) - sizes).tolist()
+        self._head = [0] * n_classes
+        self._tail = np.bincount(customer_class[new_index[waiting]], minlength=n_classes).tolist()
+        return len(live)
+
+    def _start_job(self, j, server, t):
+        """
+        Helper function that puts customer j into service.
+        Args:
+            j (int): customer index in the current block
+            server (int): server that takes the customer
+            t (float): current time
+        Returns: None
+        """
+        end = t + self._remaining[j]
+        self._server_job[server] = j
+        self._server_end[server] = end
+        self._server_class[server] = self._class[j]
+        heapq.heappush(self._busy, (end, server))
+        if self.preemptive:
+            heapq.heappush(self._running, (-self._class[j], server))
+
+    def _next_waiting(self):
+        """
+        Helper function that takes the first customer of the highest priority class with someone waiting.
+        Returns: customer index, or -1 if nobody is waiting
+        """
+        if not self._ready:
+            return -1
+        k = self._ready[0]
+        if self._preempted[k]:
+            j = heapq.heappop(self._preempted[k])
+        else:
+            j = self._grouped[self._offset[k] + self._head[k]]
+            self._head[k] += 1
+        if self._head[k] == self._tail[k] and not self._preempted[k]:
+            heapq.heappop(self._ready)
+        return j
+
+    def _complete(self):
+        """
+        Helper function that handles the next event on the calendar: a service completion.
+        Returns: None
+        """
+        end, server = heapq.heappop(self._busy)
+        j = self._server_job[server]
+        if j < 0 or self._server_end[server] != end:
+            #left behind when its job was preempted
+            return
+
+        if self._id[j] >= self._warmup:
+            k = self._class[j]
+            sojourn = end - self._arrival[j]
+            self._sojourn_sum[k] += sojourn
+            self._wait_sum[k] += sojourn - self._service[j]
+            self._count[k] += 1
+
+        self._server_job[server] = -1
+        j = self._next_waiting()
+        if j >= 0:
+            self._start_job(j, server, end)
+        else:
+            self._free.append(server)
+
+    def _preempt(self, k, t):
+        """
+        Helper function that interrupts the lowest priority job in service if its class is below k. The
+        interrupted customer keeps its remaining service time and waits at the front of its class.
+        Args:
+            k (int): class index of the arriving customer
+            t (float): current time
+
+        Returns: True if a server was freed, which is left in _preempt_server
+        """
+        running = self._running
+        server_job = self._server_job
+        server_class = self._server_class
+        if len(running) > 4 * len(server_job) + 16:
+            #too many stale entries; rebuild from the servers
+            running[:] = [(-server_class[s], s) for s in range(len(server_job)) if server_job[s] >= 0]
+            heapq.heapify(running)
+
+        while running and (server_job[running[0][1]] < 0 or server_class[running[0][1]] != -running[0][0]):
+            heapq.heappop(running)
+        if not running or -running[0][0] <= k:
+            return False
+
+        _, server = heapq.heappop(running)
+        victim = server_job[server]
+        victim_class = self._class[victim]
+        self._remaining[victim] = self._server_end[server] - t
+        if self._head[victim_class] == self._tail[victim_class] and not self._preempted[victim_class]:
+            heapq.heappush(self._ready, victim_class)
+        heapq.heappush(self._preempted[victim_class], victim)
+        server_job[server] = -1
+        self._preempt_server = server
+        return True
+
+    def _drain(self):
+        """
+        Helper function that serves everyone still in the system once arrivals have stopped.
+        Returns: None
+        """
+        while self._busy:
+            self._complete()
@@ -0,0 +1,48 @@
+from unittest import TestCase
+import numpy as np
+import MMcPriorityQueue
+import MMcQueue
+import MMcPrioritySimulator as s
+
+
+class TestMMcPrioritySimulator(TestCase):
+    def setUp(self):
+        self.queue = MMcPriorityQueue.MMcPriorityQueue((6, 4, 5), 10, 2)
+
+    def test_non_preemptive(self):
+        #small blocks so plenty of customers are carried between blocks
+        result = s.MMcPrioritySimulator(self.queue, seed=1, block_size=5000).run(400000, warmup=1000)
+        expected = self.queue.get_class_metrics()
+        self.assertEqual(399000, result['n_k'].sum())
+        for name in ('wq_k', 'w_k', 'lq_k', 'l_k'):
+            np.testing.assert_allclose(expected[name], result[name], rtol=0.06)
+
+    def test_preemptive(self):
+        result = s.MMcPrioritySimulator(self.queue, preemptive=True, seed=2, block_size=5000).run(400000, warmup=1000)
+
+        #class 1 never waits for lower classes, so it sees an M/M/c queue of its own
+        self.assertAlmostEqual(1, result['w_k'][0] / MMcQueue.MMcQueue(6, 10, 2).w, delta=0.05)
+
+        #with equal exponential service, priority only reorders customers: the total in the system is M/M/c
+        self.assertAlmostEqual(1, result['l_k'].sum() / MMcQueue.MMcQueue(15, 10, 2).l, delta=0.05)
+
+        #and the lowest class does worse than without preemption
+        non_preemptive = self.queue.get_class_metrics()
+        self.assertGreater(result['wq_k'][2], non_preemptive['wq_k'][2])
+
+    def test_many_classes(self):
+        queue = MMcPriorityQueue.MMcPriorityQueue(tuple([0.015] * 1000), 10, 2)
+        result = s.MMcPrioritySimulator(queue, preemptive=True, seed=3).run(50000)
+        self.assertEqual(1000, len(result['wq_k']))
+        self.assertEqual(50000, result['n_k'].sum())
+
+    def test_reproducible(self):
+        first = s.MMcPrioritySimulator(self.queue, seed=4).run(10000)
+        second = s.MMcPrioritySimulator(self.queue, seed=4).run(10000)
+        np.testing.assert_array_equal(first['wq_k'], second['wq_k'])
+
+    def test_invalid(self):
+        self.queue.mu = 0
+        result = s.MMcPrioritySimulator(self.queue).run(1000)
+        self.assertTrue(np.all(np.isnan(result['wq_k'])))
+        self.assertEqual(0, result['n_k'].sum())
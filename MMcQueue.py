@@ -1,5 +1,8 @@
 import BaseQueue
+import Erlang
 import math
+import sys
+import numpy as np
 from numbers import Number
 
 class MMcQueue(BaseQueue.BaseQueue):
@@ -8,6 +11,7 @@ class MMcQueue(BaseQueue.BaseQueue):
     Contains the values that result from Little's Laws calculations with consideration for the value of c.
     Checks for validity and feasibility of inputs.
     """
+    __slots__ = ('_c',)
 
     def __init__(self, lamda, mu, c):
         """
@@ -26,14 +30,15 @@ class MMcQueue(BaseQueue.BaseQueue):
         Returns: String
 
         """
+        m = self.metrics()
         print(f'MMcQueue instance at {id(self)}'
-              f'\n\t lamda: {self.lamda}'
-              f'\n\t mu: {self.mu}'
-              f'\n\t P0: {self.p0}'
-              f'\n\t lq: {self.lq}'
-              f'\n\t l: {self.l}'
-              f'\n\t wq: {self.wq}'
-              f'\n\t w: {self.w}'
+              f'\n\t lamda: {m.lamda}'
+              f'\n\t mu: {m.mu}'
+              f'\n\t P0: {m.p0}'
+              f'\n\t lq: {m.lq}'
+              f'\n\t l: {m.l}'
+              f'\n\t wq: {m.wq}'
+              f'\n\t w: {m.w}'
               f'\n\t c: {self.c}')
 
 
@@ -93,6 +98,188 @@ class MMcQueue(BaseQueue.BaseQueue):
 
         return True
 
+    def _cache_key(self):
+        """
+        Helper function that builds the MetricsCache key, adding c to the BaseQueue key.
+        Returns: tuple key
+        """
+        return super()._cache_key() + (self._c,)
+
+    @classmethod
+    def batch_metrics(cls, lamda, mu, c):
+        """
+        Calculates the M/M/c metrics for every element of the broadcast lamda, mu and c arrays in one pass.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+
+        Returns: dict of NumPy arrays keyed by lq, p0, l, w, wq and ro
+        """
+        lamda, mu, c = cls._batch_params(lamda, mu, c)
+        r = lamda / mu
+        ro = r / c
+        valid = ~np.isnan(ro)
+        feasible = valid & (ro < 1)
+
+        #run the Erlang recurrence on placeholder values where the scenario will be masked out anyway
+        p_wait, p0 = Erlang.erlang_c_p0(np.where(feasible, r, 0.0), np.where(feasible, c, 1).astype(int))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lq = p_wait * ro / (1 - ro)
+
+        return cls._batch_results(lamda, r, ro, lq, p0, valid, feasible)
+
+    def staffing_curve(self, c_max, c_min=1):
+        """
+        Calculates the metrics of this queue's lamda and mu for every number of servers from c_min to c_max.
+        A single pass of the Erlang recurrence serves the whole range, so the curve costs O(c_max) instead of
+        a full p0 sum per server count.
+        Server counts that cannot keep up (ro >= 1) get math.inf like _calc_metrics does, with a probability of
+        waiting of 1. An invalid lamda or mu gives math.nan everywhere.
+        Args:
+            c_max (int): largest number of servers
+            c_min (int): smallest number of servers
+
+        Returns: dict of NumPy arrays keyed by c, p0, lq, wq, w and p_wait
+        """
+        cs = np.arange(c_min, c_max + 1)
+        if math.isnan(self.lamda) or math.isnan(self.mu):
+            nan = np.full(cs.shape, np.nan)
+            return {'c': cs, 'p0': nan, 'lq': nan, 'wq': nan, 'w': nan, 'p_wait': nan}
+
+        b, log_s = Erlang.erlang_b_curve(self.r, c_max)
+        b = b[c_min:]
+        ro = self.r / cs
+        feasible = ro < 1
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_wait = np.where(feasible, b / (1 - ro * (1 - b)), 1.0)
+            p0 = np.where(feasible, np.exp(-log_s[c_min:]) / (1 - b + b / (1 - ro)), np.inf)
+            lq = np.where(feasible, p_wait * ro / (1 - ro), np.inf)
+
+        wq = lq / self.lamda
+        return {'c': cs, 'p0': p0, 'lq': lq, 'wq': wq, 'w': wq + 1 / self.mu, 'p_wait': p_wait}
+
+    @property
+    def p_wait(self):
+        """
+        Getter method for p_wait property, the Erlang C probability that an arriving customer has to wait.
+        Recovered from lq = p_wait * ro / (1 - ro), so it reuses what _calc_metrics computed.
+        Returns: probability of waiting; 1 if the queue is infeasible
+        """
+        if not self.is_valid():
+            return math.nan
+
+        elif not self.is_feasible():
+            return 1.0
+
+        return self.lq * (1 - self.ro) / self.ro
+
+    def state_probabilities(self, n):
+        """
+        Calculates P(N = n), the probability of n customers in the system, for a whole array of n at once.
+        The terms p0 * r^n / n! (and p0 * r^n / (c! c^(n - c)) from c on) are built in log space relative to
+        a cached probability, p0 or else P(N = c) = p_wait * (1 - ro) once p0 has underflowed for a large load,
+        so they neither overflow for large c nor lose the tail to underflow. Only when both have underflowed,
+        for c far above the load, is the Erlang recurrence run again.
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities, 0 for negative or non-whole n; nan if the queue is invalid and 0 if
+            it is infeasible, since no steady state exists
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.zeros(n.shape)
+
+        whole = (n >= 0) & (np.floor(n) == n)
+        k = np.where(whole, n, 0).astype(int)
+        c = int(self.c)
+        p_c = self.p_wait * (1 - self.ro)
+        if self.p0 >= sys.float_info.min:
+            log_p0 = math.log(self.p0)
+        elif p_c >= sys.float_info.min:
+            log_p0 = math.log(p_c) - self._log_state_terms(c, 0.0)
+        else:
+            b, log_s = Erlang.erlang_b_log_s(self.r, c)
+            #p0 = 1 / (S(c) * (1 - B + B / (1 - ro)))
+            log_p0 = -log_s - math.log1p(b * self.ro / (1 - self.ro))
+        return np.where(whole, np.exp(self._log_state_terms(k, log_p0)), 0.0)
+
+    def _log_state_terms(self, n, log_p0):
+        """
+        Helper function for log(p0 * r^n / n!) below c and log(p0 * r^n / (c! c^(n - c))) from c on.
+        Args:
+            n (ndarray): numbers of customers; negative ones are treated as 0
+            log_p0 (number): log of the probability of an empty system
+
+        Returns: ndarray of log probabilities
+        """
+        c = int(self.c)
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, c + 1)))))
+        k = np.clip(n, 0, None)
+        below = log_factorial[np.minimum(k, c)]
+        above = log_factorial[c] + (k - c) * math.log(c)
+        return log_p0 + k * math.log(self.r) - np.where(k < c, below, above)
+
+    def wait_exceedance(self, t):
+        """
+        Calculates P(Wq > t) = p_wait * e^(-(c mu - lamda) t) for a whole array of t at once.
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid and 1 if it is infeasible
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.ones(t.shape)
+
+        rate = self.c * self.mu - self.lamda
+        return np.where(t >= 0, self.p_wait * np.exp(-rate * np.clip(t, 0, None)), 1.0)
+
+    def wait_percentile(self, q):
+        """
+        Calculates waiting time percentiles, e.g. q = 0.95 for p95, for a whole array of q at once.
+        Args:
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times t with P(Wq <= t) = q
+        """
+        return self.batch_wait_percentile(self.lamda, self.mu, self.c, q)
+
+    @classmethod
+    def batch_wait_percentile(cls, lamda, mu, c, q):
+        """
+        Calculates waiting time percentiles for every element of the broadcast lamda, mu, c and q arrays in
+        one pass, so many queues and percentiles cost no Python loop. Wq is 0 with probability 1 - p_wait and
+        exponential with rate c mu - lamda otherwise, so t = ln(p_wait / (1 - q)) / (c mu - lamda) once q is
+        past 1 - p_wait.
+        Args:
+            lamda (array_like): average rates of arrival
+            mu (array_like): average rates of service completion
+            c (array_like): numbers of servers
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times; nan for invalid queues or q outside [0, 1], inf for infeasible queues
+        """
+        m = cls.batch_metrics(lamda, mu, c)
+        lamda, mu, c, q = np.broadcast_arrays(*cls._batch_params(lamda, mu, c), np.asarray(q, dtype=float))
+        lq, ro = np.broadcast_to(m['lq'], q.shape), np.broadcast_to(m['ro'], q.shape)
+        feasible = np.isfinite(lq)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p_wait = lq * (1 - ro) / ro
+            t = np.where(q > 1 - p_wait, np.log(p_wait / (1 - q)) / (c * mu - lamda), 0.0)
+
+        t = np.where(feasible, t, np.where(np.isnan(lq), np.nan, np.inf))
+        return np.where((q >= 0) & (q <= 1), t, np.nan)
+
     def _calc_metrics(self):
         """
         Calculates and stores lq, the average number of customers waiting,
@@ -125,11 +312,7 @@ class MMcQueue(BaseQueue.BaseQueue):
 
         else:
             #Multiserver calculations separate from single server calculations since the formulas are different.
-            #P0 calculated first so that lq calculation can use the calculated p0 metric.
-            p0_term_1 = sum([(self.r ** i) / math.factorial(i) for i in range(self.c)])
-            p0_term_2 = (self.r ** self.c) / (math.factorial(self.c) * (1 - self.ro))
-            self._p0 = 1.0 / (p0_term_1 + p0_term_2)
-
-            lq_numerator = (self.r ** self.c) * self.ro
-            lq_denominator = math.factorial(self.c) * ((1 - self.ro) ** 2)
-            self._lq = (lq_numerator / lq_denominator) * self.p0
+            #P0 and the probability of waiting come out of the Erlang recurrence together. This replaces the
+            # factorial sums, which overflowed floats past roughly 170 servers.
+            p_wait, self._p0 = Erlang.erlang_c_p0(self.r, self.c)
+            self._lq = p_wait * self.ro / (1 - self.ro)
@@ -0,0 +1,60 @@
+"""
+Benchmark of the M/M/c p0/lq calculation: the original factorial sums against the Erlang recurrence.
+Run with: python MMcQueue_bench.py
+"""
+import math
+import timeit
+import Erlang
+import MMcQueue
+
+
+def factorial_metrics(r, c):
+    """
+    The original MMcQueue._calc_metrics multi-server formulas, kept here as the baseline.
+    Args:
+        r (number): offered load lamda / mu
+        c (int): number of servers
+    Returns: tuple of (p0, lq)
+    """
+    ro = r / c
+    p0_term_1 = sum([(r ** i) / math.factorial(i) for i in range(c)])
+    p0_term_2 = (r ** c) / (math.factorial(c) * (1 - ro))
+    p0 = 1.0 / (p0_term_1 + p0_term_2)
+    lq = ((r ** c) * ro) / (math.factorial(c) * ((1 - ro) ** 2)) * p0
+    return p0, lq
+
+
+def recurrence_metrics(r, c):
+    """
+    The Erlang recurrence now used by MMcQueue._calc_metrics.
+    Args:
+        r (number): offered load lamda / mu
+        c (int): number of servers
+    Returns: tuple of (p0, lq)
+    """
+    ro = r / c
+    p_wait, p0 = Erlang.erlang_c_p0(r, c)
+    return p0, p_wait * ro / (1 - ro)
+
+
+def main():
+    print(f'{"c":>8} {"factorial (us)":>15} {"recurrence (us)":>16} {"rel. diff lq":>13}')
+    for c in (2, 10, 50, 150, 1000, 10000, 100000):
+        r = 0.95 * c
+        number = max(1, 20000 // c)
+        new_time = timeit.timeit(lambda: recurrence_metrics(r, c), number=number) / number * 1e6
+        try:
+            old_time = timeit.timeit(lambda: factorial_metrics(r, c), number=number) / number * 1e6
+            old_lq = factorial_metrics(r, c)[1]
+            diff = abs(recurrence_metrics(r, c)[1] - old_lq) / old_lq
+            print(f'{c:>8} {old_time:>15.1f} {new_time:>16.1f} {diff:>13.2e}')
+        except OverflowError:
+            print(f'{c:>8} {"overflow":>15} {new_time:>16.1f} {"-":>13}')
+
+    #sanity check through the public class
+    queue = MMcQueue.MMcQueue(95000, 1, 100000)
+    print(f'\nMMcQueue(95000, 1, 100000): lq = {queue.lq:.6g}, p0 = {queue.p0:.3g}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from unittest import TestCase
 import math
+import numpy as np
 import MMcQueue as q
 
 
@@ -167,3 +168,98 @@ class TestMMcQueue(TestCase):
         self.queue.c = 2
         self.assertTrue(self.queue.is_valid())
         self.assertTrue(self.queue.is_feasible())
+
+    def test_large_c(self):
+        #thousands of servers used to overflow the factorial sums
+        self.queue.lamda = 4900
+        self.queue.mu = 1
+        self.queue.c = 5000
+        self.assertTrue(self.queue.is_feasible())
+        self.assertTrue(0 < self.queue.lq < math.inf)
+        self.assertTrue(0 <= self.queue.p0 < 1)
+        self.assertAlmostEqual(self.queue.lq / 4900 + 1, self.queue.w)
+
+    def test_batch_metrics(self):
+        #Each element should match the scalar queue, including the nan/inf handling
+        lamdas = [15, 15, 40, 15, 15]
+        cs = [1, 2, 2, 0, 3]
+        m = q.MMcQueue.batch_metrics(lamdas, 20, cs)
+
+        for i in range(len(lamdas)):
+            queue = q.MMcQueue(lamdas[i], 20, cs[i])
+            for name in ('lq', 'p0', 'l', 'w', 'wq', 'ro'):
+                np.testing.assert_allclose(getattr(queue, name), m[name][i])
+
+    def test_staffing_curve(self):
+        #lamda = 15, mu = 2 needs at least 8 servers to be feasible
+        self.queue.mu = 2
+        curve = self.queue.staffing_curve(20, c_min=5)
+        np.testing.assert_array_equal(np.arange(5, 21), curve['c'])
+        self.assertTrue(np.all(np.isinf(curve['lq'][:3])))
+        self.assertTrue(np.all(curve['p_wait'][:3] == 1))
+
+        #feasible server counts should match a queue built for that c
+        for i, c in enumerate(curve['c']):
+            if c < 8:
+                continue
+            queue = q.MMcQueue(15, 2, int(c))
+            self.assertAlmostEqual(queue.p0, curve['p0'][i])
+            self.assertAlmostEqual(queue.lq, curve['lq'][i])
+            self.assertAlmostEqual(queue.wq, curve['wq'][i])
+            self.assertAlmostEqual(queue.w, curve['w'][i])
+
+        #more servers never means more waiting
+        self.assertTrue(np.all(np.diff(curve['wq'][3:]) < 0))
+
+        #invalid parameters give nan
+        self.queue.mu = 0
+        self.assertTrue(np.all(np.isnan(self.queue.staffing_curve(3)['lq'])))
+
+    def test_distributions(self):
+        queue = q.MMcQueue(15, 2, 10)
+        probabilities = queue.state_probabilities(np.arange(400))
+        self.assertAlmostEqual(queue.p0, probabilities[0])
+        self.assertAlmostEqual(1.0, probabilities.sum())
+        #the mean queue length from the distribution matches lq
+        self.assertAlmostEqual(queue.lq, (np.clip(np.arange(400) - 10, 0, None) * probabilities).sum())
+        self.assertEqual(0, queue.state_probabilities(-1))
+
+        #p_wait is the probability of finding every server busy
+        self.assertAlmostEqual(queue.p_wait, probabilities[10:].sum())
+        self.assertAlmostEqual(queue.p_wait, queue.wait_exceedance(0))
+        np.testing.assert_allclose(queue.wait_exceedance([-1, 0.5]),
+                                   [1, queue.p_wait * math.exp(-(10 * 2 - 15) * 0.5)])
+
+        #percentiles invert the exceedance, and the mean of Wq matches wq
+        p95, p99 = queue.wait_percentile([0.95, 0.99])
+        self.assertAlmostEqual(0.05, queue.wait_exceedance(p95))
+        self.assertAlmostEqual(0.01, queue.wait_exceedance(p99))
+        self.assertAlmostEqual(queue.wq, queue.p_wait / (10 * 2 - 15))
+        self.assertEqual(0, queue.wait_percentile(0.1))
+
+        #large c stays finite in log space
+        big = q.MMcQueue(1900, 1, 2000)
+        self.assertAlmostEqual(1.0, big.state_probabilities(np.arange(3000)).sum())
+        #p0 underflows here, and for the second queue so does P(N = c), but the distribution does not
+        for big in (q.MMcQueue(3000, 1, 3100), q.MMcQueue(1000, 1, 100000)):
+            self.assertEqual(0, big.p0)
+            probabilities = big.state_probabilities(np.arange(4000))
+            self.assertAlmostEqual(1.0, probabilities.sum())
+            self.assertAlmostEqual(big.l, (np.arange(4000) * probabilities).sum(), places=6)
+        #N is a whole number
+        np.testing.assert_array_equal([0, 0], queue.state_probabilities([2.5, -1.0]))
+        self.assertAlmostEqual(queue.p0, queue.state_probabilities(0.0))
+
+    def test_batch_wait_percentile(self):
+        lamda = np.array([15, 15, 25, -1])
+        t = q.MMcQueue.batch_wait_percentile(lamda[:, None], 2, 10, np.array([0.5, 0.95, 0.99]))
+        self.assertEqual((4, 3), t.shape)
+        np.testing.assert_allclose(q.MMcQueue(15, 2, 10).wait_percentile([0.5, 0.95, 0.99]), t[0])
+        self.assertTrue(np.all(np.isinf(t[2])))
+        self.assertTrue(np.all(np.isnan(t[3])))
+        self.assertTrue(np.isnan(q.MMcQueue.batch_wait_percentile(15, 2, 10, 1.5)))
+
+        infeasible = q.MMcQueue(25, 2, 10)
+        self.assertEqual(1, infeasible.p_wait)
+        self.assertEqual(1, infeasible.wait_exceedance(3))
+        self.assertEqual(0, infeasible.state_probabilities(3))
@@ -0,0 +1,150 @@
+import heapq
+import math
+import numpy as np
+
+
+class FifoServers:
+    """
+    c identical servers taking customers first come, first served. The event calendar is a binary heap of
+    the times at which each server next becomes free, so every customer costs one heap replace.
+    Also tracks how long the whole system has been empty, for p0.
+    State carries over between calls to serve, so customers can be fed in blocks.
+    """
+    __slots__ = ('free', 'last_departure', 'empty_time')
+
+    def __init__(self, c, start=0.0):
+        """
+        Constructor for FifoServers class.
+        Args:
+            c (int): number of servers
+            start (number): time at which every server is free
+        """
+        self.free = [float(start)] * int(c)
+        self.last_departure = float(start)
+        self.empty_time = 0.0
+
+    def serve(self, arrivals, services):
+        """
+        Serves a block of customers.
+        Args:
+            arrivals (ndarray): arrival times, non-decreasing and not before earlier blocks
+            services (ndarray): service times
+
+        Returns: ndarray of the time each customer spent waiting in the queue
+        """
+        free = self.free
+        heapreplace = heapq.heapreplace
+        last = self.last_departure
+        empty = self.empty_time
+        waits = []
+        append = waits.append
+
+        for arrival, service in zip(arrivals.tolist(), services.tolist()):
+            start = free[0]
+            if start < arrival:
+                start = arrival
+            departure = start + service
+            heapreplace(free, departure)
+            append(start - arrival)
+
+            #everyone before this customer has left by last, so the gap until this arrival is empty time
+            if arrival > last:
+                empty += arrival - last
+            if departure > last:
+                last = departure
+
+        self.last_departure = last
+        self.empty_time = empty
+        return np.array(waits)
+
+
+class MMcSimulator:
+    """
+    Discrete-event simulation of an M/M/c (or M/M/1) FIFO queue, used to check the closed-form metrics of
+    MMcQueue and MM1Queue. Interarrival and service times are drawn from NumPy in blocks rather than one
+    random call per event.
+    """
+    def __init__(self, queue, seed=None, block_size=65536):
+        """
+        Constructor for MMcSimulator class.
+        Args:
+            queue (BaseQueue): queue whose lamda, mu and c (1 if it has none) are simulated
+            seed (int or SeedSequence): seed of the random stream, for reproducible runs
+            block_size (int): number of customers drawn and served per block
+        """
+        self.lamda = queue.lamda
+        self.mu = queue.mu
+        self.c = getattr(queue, 'c', 1)
+        self.block_size = block_size
+        self._rng = np.random.default_rng(seed)
+
+    def iter_blocks(self, n_customers, split=0):
+        """
+        Simulates customers block by block.
+        Args:
+            n_customers (int): number of customers to simulate
+            split (int): customer index that must start a new block, so a warm-up ends on a block boundary
+
+        Returns: generator of (arrivals, waits, services, servers) per block, where servers is the FifoServers
+            state after the block
+        """
+        servers = FifoServers(self.c)
+        clock = 0.0
+        done = 0
+        while done < n_customers:
+            n = min(self.block_size, n_customers - done)
+            if done < split:
+                n = min(n, split - done)
+            arrivals = clock + np.cumsum(self._rng.exponential(1 / self.lamda, n))
+            services = self._rng.exponential(1 / self.mu, n)
+            clock = arrivals[-1]
+            done += n
+            yield arrivals, servers.serve(arrivals, services), services, servers
+
+    def run(self, n_customers, warmup=0):
+        """
+        Simulates the queue and estimates its metrics. wq and w are averages over customers; lq and l follow
+        from Little's Laws with the observed arrival rate; p0 is the fraction of time the system was empty.
+        The estimation window runs from the first counted arrival to the last arrival.
+        Args:
+            n_customers (int): number of customers to simulate, including the warm-up
+            warmup (int): number of customers at the start to leave out of the estimates
+
+        Returns: dict with lq, l, wq, w, p0 and n (customers counted); all nan if the queue is invalid
+        """
+        if not self.is_valid() or n_customers - warmup < 2:
+            return {'lq': math.nan, 'l': math.nan, 'wq': math.nan, 'w': math.nan, 'p0': math.nan, 'n': 0}
+
+        seen = 0
+        wait_sum = 0.0
+        service_sum = 0.0
+        start_time = None
+        #state of the servers just before the first counted customer arrives
+        last_departure = 0.0
+        start_empty = 0.0
+        for arrivals, waits, services, servers in self.iter_blocks(n_customers, split=warmup):
+            if seen >= warmup:
+                if start_time is None:
+                    start_time = arrivals[0]
+                    start_empty = start_empty + max(start_time - last_departure, 0.0)
+                wait_sum += waits.sum()
+                service_sum += services.sum()
+            else:
+                last_departure = servers.last_departure
+                start_empty = servers.empty_time
+            seen += len(waits)
+
+        n = n_customers - warmup
+        wq = wait_sum / n
+        w = (wait_sum + service_sum) / n
+        span = arrivals[-1] - start_time
+        lamda = (n - 1) / span
+        return {'lq': float(lamda * wq), 'l': float(lamda * w), 'wq': float(wq), 'w': float(w),
+                'p0': float((servers.empty_time - start_empty) / span), 'n': n}
+
+    def is_valid(self):
+        """
+        Checks to see if lamda, mu and c are usable numbers.
+        Returns: True if the queue can be simulated
+        """
+        return not (math.isnan(self.lamda) or math.isnan(self.mu) or math.isnan(self.c))
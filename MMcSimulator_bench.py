@@ -0,0 +1,22 @@
+"""
+Throughput benchmark of the M/M/c simulator, in customers per second on one core.
+Run with: python MMcSimulator_bench.py
+"""
+import time
+import MM1Queue
+import MMcQueue
+import MMcSimulator
+
+
+def main():
+    n = 2000000
+    for queue in (MM1Queue.MM1Queue(15, 20), MMcQueue.MMcQueue(15, 20, 2), MMcQueue.MMcQueue(950, 1, 1000)):
+        start = time.perf_counter()
+        result = MMcSimulator.MMcSimulator(queue, seed=1).run(n, warmup=10000)
+        seconds = time.perf_counter() - start
+        print(f'{type(queue).__name__} c={getattr(queue, "c", 1)}: {n / seconds:,.0f} customers/s, '
+              f'wq {result["wq"]:.5f} (exact {queue.wq:.5f})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MM1Queue
+import MMcQueue
+import MMcSimulator as s
+
+
+class TestFifoServers(TestCase):
+    def test_serve(self):
+        #two servers: the third customer waits for the first server to free up at t = 3
+        servers = s.FifoServers(2)
+        waits = servers.serve(np.array([1.0, 1.5, 2.0]), np.array([2.0, 2.0, 1.0]))
+        np.testing.assert_allclose([0, 0, 1], waits)
+        self.assertAlmostEqual(4.0, servers.last_departure)
+        self.assertAlmostEqual(1.0, servers.empty_time)
+
+        #state carries over to the next block: the system empties at 4 and the next arrival is at 6
+        waits = servers.serve(np.array([6.0]), np.array([1.0]))
+        np.testing.assert_allclose([0], waits)
+        self.assertAlmostEqual(3.0, servers.empty_time)
+
+
+class TestMMcSimulator(TestCase):
+    def assert_close_to(self, queue, result, tolerance):
+        for name in ('lq', 'wq', 'w', 'p0'):
+            self.assertLess(abs(result[name] - getattr(queue, name)), tolerance * max(getattr(queue, name), 0.1))
+
+    def test_mm1(self):
+        queue = MM1Queue.MM1Queue(15, 20)
+        result = s.MMcSimulator(queue, seed=1).run(300000, warmup=1000)
+        self.assertEqual(299000, result['n'])
+        self.assert_close_to(queue, result, 0.05)
+
+    def test_mmc(self):
+        queue = MMcQueue.MMcQueue(15, 20, 2)
+        result = s.MMcSimulator(queue, seed=2, block_size=5000).run(300000, warmup=1000)
+        self.assert_close_to(queue, result, 0.05)
+
+    def test_reproducible(self):
+        queue = MMcQueue.MMcQueue(15, 20, 2)
+        self.assertEqual(s.MMcSimulator(queue, seed=3).run(10000), s.MMcSimulator(queue, seed=3).run(10000))
+
+    def test_invalid(self):
+        result = s.MMcSimulator(MMcQueue.MMcQueue(15, 0, 2)).run(1000)
+        self.assertTrue(math.isnan(result['lq']))
+        self.assertEqual(0, result['n'])
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from numbers import Number
+
+
+class MetricsCache:
+    """
+    Size-bounded LRU cache of the values _calc_metrics stores, shared by every queue object so that
+    rebuilding a queue with parameters that have been seen before skips the calculation.
+    The cache is optional and starts disabled, so queues behave exactly as without it until it is turned on.
+    Keys are tuples of the queue type and its parameters (see BaseQueue._cache_key).
+    Keeps hit, miss and eviction counts.
+    """
+    def __init__(self, capacity=1024, enabled=False):
+        """
+        Constructor for MetricsCache class.
+        Args:
+            capacity (int): largest number of parameter sets kept before the least recently used is evicted
+            enabled (bool): whether queues consult the cache at all
+        """
+        self._entries = OrderedDict()
+        self.enabled = enabled
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """
+        Returns: number of parameter sets currently cached
+        """
+        return len(self._entries)
+
+    @property
+    def capacity(self):
+        """
+        Getter method for capacity property
+        Returns: largest number of parameter sets kept
+        """
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity):
+        """
+        Setter method for capacity property; evicts least recently used entries if the cache is now too big.
+        Args:
+            capacity (int): largest number of parameter sets kept, must be >= 0
+        Returns: None
+        """
+        if not isinstance(capacity, Number) or capacity < 0:
+            raise ValueError(f'capacity must be a number >= 0, not {capacity!r}')
+        self._capacity = capacity
+        self._evict()
+
+    def get(self, key):
+        """
+        Looks up the stored metric values for a parameter set and marks it as recently used.
+        Args:
+            key (tuple): queue type and parameters
+        Returns: tuple of stored values, or None on a miss
+        """
+        values = self._entries.get(key)
+        if values is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return values
+
+    def put(self, key, values):
+        """
+        Stores the metric values for a parameter set, evicting the least recently used entry if needed.
+        Args:
+            key (tuple): queue type and parameters
+            values (tuple): values produced by _calc_metrics
+        Returns: None
+        """
+        self._entries[key] = values
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def clear(self):
+        """
+        Empties the cache and resets the statistics.
+        Returns: None
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns: dict with hits, misses, evictions, size and capacity
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._entries), 'capacity': self.capacity}
+
+    def _evict(self):
+        """
+        Helper function that drops least recently used entries until the cache fits its capacity.
+        Returns: None
+        """
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+#The cache every queue consults once it is turned on. Opt in with MetricsCache.shared.enabled = True and size it
+# with MetricsCache.shared.capacity = n.
+shared = MetricsCache()
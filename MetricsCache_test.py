@@ -0,0 +1,78 @@
+from unittest import TestCase
+import math
+import MetricsCache as mc
+import MG1Queue
+import MMcQueue
+
+
+class TestMetricsCache(TestCase):
+    def setUp(self):
+        self.cache = mc.MetricsCache(capacity=2)
+
+        #queues consult the shared cache, so start each test from an empty one and restore its settings after
+        self.shared_settings = (mc.shared.capacity, mc.shared.enabled)
+        mc.shared.clear()
+        mc.shared.enabled = True
+
+    def tearDown(self):
+        mc.shared.capacity, mc.shared.enabled = self.shared_settings
+        mc.shared.clear()
+
+    def test_get_put(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.put('a', (1, 2))
+        self.assertEqual((1, 2), self.cache.get('a'))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'capacity': 2}, self.cache.stats())
+
+    def test_lru_eviction(self):
+        self.cache.put('a', (1,))
+        self.cache.put('b', (2,))
+        #touch a so b is the least recently used
+        self.cache.get('a')
+        self.cache.put('c', (3,))
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual((1,), self.cache.get('a'))
+        self.assertEqual(1, self.cache.evictions)
+
+        #shrinking the capacity evicts straight away
+        self.cache.capacity = 1
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual(2, self.cache.evictions)
+
+        with self.assertRaises(ValueError):
+            self.cache.capacity = -1
+
+    def test_clear(self):
+        self.cache.put('a', (1,))
+        self.cache.get('a')
+        self.cache.clear()
+        self.assertEqual({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'capacity': 2}, self.cache.stats())
+
+    def test_shared_by_queues(self):
+        first = MMcQueue.MMcQueue(15, 20, 2)
+        lq = first.lq
+        self.assertEqual(1, mc.shared.misses)
+
+        #same parameters on a new object is a hit with the same values
+        second = MMcQueue.MMcQueue(15, 20, 2)
+        self.assertAlmostEqual(lq, second.lq)
+        self.assertAlmostEqual(first.p0, second.p0)
+        self.assertEqual(1, mc.shared.hits)
+
+        #a different c, or a different queue type with the same lamda and mu, is a miss
+        MMcQueue.MMcQueue(15, 20, 3).lq
+        MG1Queue.MG1Queue(15, 20).lq
+        self.assertEqual(3, mc.shared.misses)
+
+        #invalid queues are never cached
+        self.assertTrue(math.isnan(MMcQueue.MMcQueue(15, 0, 2).lq))
+        self.assertEqual(3, len(mc.shared))
+
+    def test_disabled(self):
+        #the shared cache is opt-in
+        self.assertFalse(mc.MetricsCache().enabled)
+        mc.shared.enabled = False
+        MMcQueue.MMcQueue(15, 20, 2).lq
+        MMcQueue.MMcQueue(15, 20, 2).lq
+        self.assertEqual({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'capacity': mc.shared.capacity},
+                         mc.shared.stats())
@@ -0,0 +1,148 @@
+import math
+import numpy as np
+import MG1Queue
+import MMcQueue
+from StreamingStats import Ewma, Welford
+
+
+class OnlineEstimator:
+    """
+    Keeps lamda, mu and sigma current from a live stream of arrival and completion events, and turns them
+    into MG1Queue or MMcQueue metrics on demand. Every event costs O(1): interarrival and service times go
+    into running accumulators, Welford over the whole history by default or exponentially weighted when the
+    system drifts. Events can come one at a time or as NumPy batches. The two queues are kept and updated in
+    place, so a metrics call only recalculates them when the estimates have moved.
+    """
+    def __init__(self, c=1, alpha=None):
+        """
+        Constructor for OnlineEstimator class.
+        Args:
+            c (int): number of servers of the MMcQueue model
+            alpha (number): weight of the newest value for exponentially weighted estimates; None weighs the
+                whole history equally
+        """
+        self.c = c
+        if alpha is None:
+            self._gaps = Welford()
+            self._services = Welford()
+        else:
+            self._gaps = Ewma(alpha)
+            self._services = Ewma(alpha)
+        self._last_arrival = math.nan
+        self._mg1 = MG1Queue.MG1Queue(math.nan, math.nan, math.nan)
+        self._mmc = MMcQueue.MMcQueue(math.nan, math.nan, c)
+
+    def arrival(self, t):
+        """
+        Records one arrival.
+        Args:
+            t (number): arrival time, not before the previous arrival
+        Returns: None
+        """
+        if not math.isnan(self._last_arrival):
+            self._gaps.add(t - self._last_arrival)
+        self._last_arrival = t
+
+    def arrivals(self, times):
+        """
+        Records a batch of arrivals.
+        Args:
+            times (array_like): arrival times in order, not before the previous arrival
+        Returns: None
+        """
+        times = np.asarray(times, dtype=float).ravel()
+        if len(times) == 0:
+            return
+        if math.isnan(self._last_arrival):
+            self._gaps.extend(np.diff(times))
+        else:
+            self._gaps.extend(np.diff(times, prepend=self._last_arrival))
+        self._last_arrival = float(times[-1])
+
+    def completion(self, service):
+        """
+        Records one service completion.
+        Args:
+            service (number): service time of the completed customer
+        Returns: None
+        """
+        self._services.add(service)
+
+    def completions(self, services):
+        """
+        Records a batch of service completions.
+        Args:
+            services (array_like): service times of the completed customers
+        Returns: None
+        """
+        self._services.extend(services)
+
+    @property
+    def lamda(self):
+        """
+        Getter method for lamda property
+        Returns: estimated arrival rate, nan before two arrivals
+        """
+        mean = self._gaps.mean if self._gaps.n else math.nan
+        return 1 / mean if mean > 0 else math.nan
+
+    @property
+    def mu(self):
+        """
+        Getter method for mu property
+        Returns: estimated service rate, nan before any completion
+        """
+        mean = self._services.mean if self._services.n else math.nan
+        return 1 / mean if mean > 0 else math.nan
+
+    @property
+    def sigma(self):
+        """
+        Getter method for sigma property
+        Returns: estimated service time standard deviation, nan before two completions
+        """
+        return math.sqrt(self._services.variance)
+
+    def mg1_metrics(self):
+        """
+        Calculates the MG1Queue metrics for the current estimates.
+        Returns: QueueMetrics snapshot
+        """
+        self._update(self._mg1)
+        sigma = self.sigma
+        if not _same(self._mg1.sigma, sigma):
+            self._mg1.sigma = sigma
+        return self._mg1.metrics()
+
+    def mmc_metrics(self):
+        """
+        Calculates the MMcQueue metrics for the current estimates.
+        Returns: QueueMetrics snapshot
+        """
+        self._update(self._mmc)
+        return self._mmc.metrics()
+
+    def _update(self, queue):
+        """
+        Helper function that copies the current lamda and mu into a queue. The setters flag a recalculation,
+        so they are only called when an estimate has changed.
+        Args:
+            queue (BaseQueue): queue to update
+        Returns: None
+        """
+        lamda, mu = self.lamda, self.mu
+        if not _same(queue.lamda, lamda):
+            queue.lamda = lamda
+        if not _same(queue.mu, mu):
+            queue.mu = mu
+
+
+def _same(a, b):
+    """
+    Helper function that compares two estimates, treating nan as equal to nan.
+    Args:
+        a (number): first estimate
+        b (number): second estimate
+    Returns: True if both are the same number or both are nan
+    """
+    return a == b or (math.isnan(a) and math.isnan(b))
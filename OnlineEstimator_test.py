@@ -0,0 +1,56 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MG1Queue
+import MMcQueue
+import OnlineEstimator as o
+
+
+class TestOnlineEstimator(TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.arrivals = np.cumsum(rng.exponential(1 / 15, 200000))
+        self.services = rng.gamma(4, 1 / 80, 200000)
+
+    def test_batches_match_events(self):
+        events = o.OnlineEstimator()
+        for t, s in zip(self.arrivals[:1000], self.services[:1000]):
+            events.arrival(t)
+            events.completion(s)
+        batches = o.OnlineEstimator()
+        for block in np.array_split(self.arrivals[:1000], 6):
+            batches.arrivals(block)
+        for block in np.array_split(self.services[:1000], 4):
+            batches.completions(block)
+        for name in ('lamda', 'mu', 'sigma'):
+            self.assertAlmostEqual(getattr(events, name), getattr(batches, name))
+
+    def test_metrics(self):
+        estimator = o.OnlineEstimator(c=2)
+        self.assertTrue(math.isnan(estimator.mg1_metrics().lq))
+
+        estimator.arrivals(self.arrivals)
+        estimator.completions(self.services)
+        self.assertAlmostEqual(15, estimator.lamda, delta=0.2)
+        self.assertAlmostEqual(20, estimator.mu, delta=0.2)
+        self.assertAlmostEqual(0.025, estimator.sigma, delta=0.001)
+
+        expected = MG1Queue.MG1Queue(estimator.lamda, estimator.mu, estimator.sigma)
+        self.assertAlmostEqual(expected.lq, estimator.mg1_metrics().lq)
+        self.assertAlmostEqual(MMcQueue.MMcQueue(estimator.lamda, estimator.mu, 2).wq,
+                               estimator.mmc_metrics().wq)
+
+        #new events move the next answer
+        before = estimator.mg1_metrics().lq
+        estimator.arrival(self.arrivals[-1] + 0.001)
+        self.assertNotEqual(before, estimator.mg1_metrics().lq)
+
+    def test_ewma(self):
+        #after the arrival rate doubles, the weighted estimate follows and the plain one lags
+        drift = np.concatenate((self.arrivals, self.arrivals[-1] + np.cumsum(np.full(20000, 1 / 30))))
+        weighted = o.OnlineEstimator(alpha=0.001)
+        weighted.arrivals(drift)
+        plain = o.OnlineEstimator()
+        plain.arrivals(drift)
+        self.assertAlmostEqual(30, weighted.lamda, delta=0.5)
+        self.assertLess(plain.lamda, 20)
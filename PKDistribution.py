@@ -0,0 +1,181 @@
+"""
+Queue-length and waiting-time distributions of the M/G/1 queue from the Pollaczek-Khinchine transforms.
+P(N = n) comes from inverting the probability generating function of N with an FFT; P(Wq > t) comes from
+numerically inverting the Laplace transform of the waiting time (Abate and Whitt's Euler algorithm).
+Service times are deterministic when sigma is 0 and gamma with the same mean and sigma otherwise, which
+covers MD1Queue, MM1Queue (sigma = 1 / mu) and MG1Queue.
+"""
+from functools import lru_cache
+import math
+import numpy as np
+
+#Euler inversion: 2 * EULER_M + 1 transform evaluations per point, good for about 0.6 * EULER_M digits
+EULER_M = 15
+#FFT inversion: the PGF is sampled on a circle of radius r with r^N = 10^-FFT_DIGITS
+FFT_DIGITS = 12
+
+
+def _service_tail(mu, sigma):
+    """
+    Helper function that builds 1 - B*(s), where B* is the Laplace-Stieltjes transform of the service time.
+    Working with 1 - B* keeps the P-K formulas accurate where B* is close to 1.
+    Args:
+        mu (number): average rate of service completion
+        sigma (number): service time standard deviation
+
+    Returns: function of a complex ndarray s
+    """
+    if sigma == 0:
+        return lambda s: -np.expm1(-s / mu)
+    shape = 1 / (sigma * mu) ** 2
+    scale = 1 / (mu * shape)
+    return lambda s: -np.expm1(-shape * np.log1p(scale * s))
+
+
+@lru_cache(maxsize=256)
+def _state_probabilities(lamda, mu, sigma, size):
+    """
+    Helper function that inverts the P-K generating function
+    P(z) = (1 - ro) (1 - z) B*(lamda (1 - z)) / (B*(lamda (1 - z)) - z)
+    with one FFT of length N >= 4 * size over the circle |z| = r. Sampling inside the unit circle keeps the
+    aliasing error below 10^-FFT_DIGITS, and only the first quarter of the output is used so rounding errors
+    grow by at most 10^(FFT_DIGITS / 4).
+    Args:
+        lamda (float): average rate of arrival
+        mu (float): average rate of service completion
+        sigma (float): service time standard deviation
+        size (int): number of probabilities, for n = 0 .. size - 1
+
+    Returns: read-only ndarray of P(N = n)
+    """
+    tail = _service_tail(mu, sigma)
+    n_fft = 1 << max(6, (4 * size - 1).bit_length())
+    radius = 10 ** (-FFT_DIGITS / n_fft)
+    u = 1 - radius * np.exp(2j * np.pi * np.arange(n_fft) / n_fft)
+    d = tail(lamda * u)
+    pgf = (1 - lamda / mu) * u * (1 - d) / (u - d)
+
+    p = (np.fft.fft(pgf).real / n_fft)[:size] * radius ** -np.arange(size)
+    p = np.clip(p, 0.0, None)
+    p.setflags(write=False)
+    return p
+
+
+def state_probabilities(lamda, mu, sigma, n):
+    """
+    Calculates P(N = n), the probability of n customers in the system, for a whole array of n at once.
+    Results are cached per parameter set, so later calls up to the same largest n cost one lookup.
+    Args:
+        lamda (number): average rate of arrival
+        mu (number): average rate of service completion
+        sigma (number): service time standard deviation
+        n (array_like): numbers of customers
+
+    Returns: ndarray of probabilities
+    """
+    n = np.asarray(n)
+    size = int(n.max()) + 1 if n.size else 1
+    #round up so nearby cutoffs share a cache entry
+    p = _state_probabilities(float(lamda), float(mu), float(sigma), 1 << max(size - 1, 1).bit_length())
+    return np.where(n >= 0, p[np.clip(n, 0, None)], 0.0)
+
+
+def _euler_nodes():
+    """
+    Helper function for the nodes and weights of the Euler inversion: f(t) is approximated by
+    sum(weights * Re F(nodes / t)) / t.
+    Returns: tuple of ndarrays (complex nodes, real weights)
+    """
+    m = EULER_M
+    xi = np.ones(2 * m + 1)
+    xi[0] = 0.5
+    #binomial partial sums of the Euler summation
+    binomial = np.array([math.comb(m, j) for j in range(m + 1)], dtype=float)
+    xi[m + 1:] = 1 - np.cumsum(binomial[:-1]) / 2 ** m
+    k = np.arange(2 * m + 1)
+    nodes = m * math.log(10) / 3 + 1j * math.pi * k
+    weights = 10 ** (m / 3) * (-1.0) ** k * xi
+    return nodes, weights
+
+
+_NODES, _WEIGHTS = _euler_nodes()
+
+
+def wait_exceedance(lamda, mu, sigma, t):
+    """
+    Calculates P(Wq > t) for a whole array of t at once by inverting its Laplace transform
+    (1 - W*(s)) / s, where W*(s) = (1 - ro) s / (s - lamda (1 - B*(s))) is the P-K transform of Wq.
+    Args:
+        lamda (number): average rate of arrival
+        mu (number): average rate of service completion
+        sigma (number): service time standard deviation
+        t (array_like): waiting times
+
+    Returns: ndarray of probabilities
+    """
+    t = np.asarray(t, dtype=float)
+    ro = lamda / mu
+    tail = _service_tail(mu, sigma)
+    positive = t > 0
+    s = _NODES / np.where(positive, t, 1.0)[..., None]
+    d = lamda * tail(s)
+    transform = (ro - d / s) / (s - d)
+    p = (transform.real @ _WEIGHTS) / np.where(positive, t, 1.0)
+    #P(Wq > 0) = ro, the chance of finding the server busy
+    return np.where(positive, np.clip(p, 0.0, 1.0), np.where(t == 0, ro, 1.0))
+
+
+@lru_cache(maxsize=256)
+def _wait_percentiles(lamda, mu, sigma, q):
+    """
+    Helper function that solves P(Wq > t) = 1 - q for every q together: the upper bounds double until they
+    bracket the answers, then all brackets are bisected at once.
+    Args:
+        lamda (float): average rate of arrival
+        mu (float): average rate of service completion
+        sigma (float): service time standard deviation
+        q (tuple): probabilities between 0 and 1
+
+    Returns: read-only ndarray of waiting times
+    """
+    target = 1 - np.array(q)
+    ro = lamda / mu
+    #no wait at all with probability 1 - ro
+    needed = target < ro
+    lo = np.zeros(len(target))
+    hi = np.full(len(target), (ro + lamda ** 2 * sigma ** 2) / (2 * mu * (1 - ro)) + 1 / mu)
+    while True:
+        short = needed & (wait_exceedance(lamda, mu, sigma, hi) > target)
+        if not short.any():
+            break
+        lo = np.where(short, hi, lo)
+        hi = np.where(short, 2 * hi, hi)
+
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        over = wait_exceedance(lamda, mu, sigma, mid) > target
+        lo = np.where(over, mid, lo)
+        hi = np.where(over, hi, mid)
+
+    t = np.where(needed, (lo + hi) / 2, 0.0)
+    t.setflags(write=False)
+    return t
+
+
+def wait_percentile(lamda, mu, sigma, q):
+    """
+    Calculates waiting time percentiles, e.g. q = 0.95 for p95, for a whole array of q at once.
+    Results are cached per parameter set and q.
+    Args:
+        lamda (number): average rate of arrival
+        mu (number): average rate of service completion
+        sigma (number): service time standard deviation
+        q (array_like): probabilities between 0 and 1
+
+    Returns: ndarray of waiting times t with P(Wq <= t) = q; nan for q outside [0, 1], inf for q = 1
+    """
+    q = np.asarray(q, dtype=float)
+    inside = (q >= 0) & (q < 1)
+    flat = np.where(inside, q, 0.0).ravel()
+    t = _wait_percentiles(float(lamda), float(mu), float(sigma), tuple(flat.tolist())).reshape(q.shape)
+    return np.where(inside, t, np.where(q == 1, np.inf, np.nan))
@@ -0,0 +1,51 @@
+from unittest import TestCase
+import math
+import numpy as np
+import PKDistribution as pk
+
+
+def md1_exceedance(t, lamda, d):
+    #exact M/D/1 waiting time distribution (Erlang's formula)
+    k = np.arange(int(t // d) + 1)
+    x = lamda * (k * d - t)
+    cdf = (1 - lamda * d) * np.sum(x ** k / np.array([math.factorial(i) for i in k], dtype=float) * np.exp(-x))
+    return 1 - cdf
+
+
+class TestPKDistribution(TestCase):
+    def test_exponential_service(self):
+        #sigma = 1 / mu is M/M/1: geometric queue length and exponential wait tail
+        n = np.arange(200)
+        np.testing.assert_allclose(0.25 * 0.75 ** n, pk.state_probabilities(15, 20, 1 / 20, n), atol=1e-10)
+        t = np.array([0.0, 0.05, 0.5, 2.0])
+        np.testing.assert_allclose(0.75 * np.exp(-5 * t), pk.wait_exceedance(15, 20, 1 / 20, t), atol=1e-9)
+        np.testing.assert_allclose(np.log(0.75 / np.array([0.05, 0.01])) / 5,
+                                   pk.wait_percentile(15, 20, 1 / 20, [0.95, 0.99]), rtol=1e-9)
+
+    def test_deterministic_service(self):
+        n = np.arange(4000)
+        p = pk.state_probabilities(19, 20, 0, n)
+        self.assertAlmostEqual(1.0, p.sum(), places=8)
+        self.assertAlmostEqual(0.05, p[0], places=10)
+        #mean number in system from P-K
+        self.assertAlmostEqual(0.95 + 0.95 ** 2 / (2 * 0.05), (n * p).sum(), places=6)
+
+        for t in (0.03, 0.33, 0.71):
+            self.assertAlmostEqual(md1_exceedance(t, 15, 1 / 20), pk.wait_exceedance(15, 20, 0, t), places=5)
+        p99 = pk.wait_percentile(15, 20, 0, 0.99)
+        self.assertAlmostEqual(0.01, md1_exceedance(p99, 15, 1 / 20), places=5)
+
+    def test_gamma_service(self):
+        #more variable service gives a longer tail, with the P-K mean
+        n = np.arange(2000)
+        p = pk.state_probabilities(15, 20, 0.1, n)
+        self.assertAlmostEqual(0.75 + (0.75 ** 2 + 15 ** 2 * 0.01) / 0.5, (n * p).sum(), places=6)
+        self.assertGreater(pk.wait_percentile(15, 20, 0.1, 0.95), pk.wait_percentile(15, 20, 0.05, 0.95))
+
+    def test_percentile_edges(self):
+        t = pk.wait_percentile(15, 20, 0, [0.1, 0.25, 1.0, 1.5, -0.1])
+        self.assertEqual(0, t[0])
+        self.assertEqual(0, t[1])
+        self.assertTrue(math.isinf(t[2]))
+        self.assertTrue(np.all(np.isnan(t[3:])))
+        self.assertEqual(0, pk.state_probabilities(15, 20, 0, -1))
@@ -0,0 +1,75 @@
+import numpy as np
+import PKDistribution
+
+
+class PKQueue:
+    """
+    Mixin for single server queues with Poisson arrivals that adds the Pollaczek-Khinchine queue-length and
+    waiting-time distributions (see PKDistribution). It is listed before BaseQueue in the bases of MM1Queue,
+    MD1Queue and MG1Queue, and each of them supplies its service time standard deviation via _service_sigma.
+    """
+    __slots__ = ()
+
+    def state_probabilities(self, n):
+        """
+        Calculates P(N = n), the probability of n customers in the system, for a whole array of n at once, by
+        FFT inversion of the Pollaczek-Khinchine generating function.
+        Args:
+            n (array_like): numbers of customers
+
+        Returns: ndarray of probabilities; nan if the queue is invalid and 0 if it is infeasible, since no
+            steady state exists
+        """
+        n = np.asarray(n)
+        if not self.is_valid():
+            return np.full(n.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.zeros(n.shape)
+
+        return PKDistribution.state_probabilities(self.lamda, self.mu, self._service_sigma(), n)
+
+    def wait_exceedance(self, t):
+        """
+        Calculates P(Wq > t) for a whole array of t at once, by Laplace inversion of the Pollaczek-Khinchine
+        waiting time transform.
+        Args:
+            t (array_like): waiting times
+
+        Returns: ndarray of probabilities; nan if the queue is invalid and 1 if it is infeasible
+        """
+        t = np.asarray(t, dtype=float)
+        if not self.is_valid():
+            return np.full(t.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.ones(t.shape)
+
+        return PKDistribution.wait_exceedance(self.lamda, self.mu, self._service_sigma(), t)
+
+    def wait_percentile(self, q):
+        """
+        Calculates waiting time percentiles, e.g. q = 0.95 for p95, for a whole array of q at once. Results
+        are cached per parameter set.
+        Args:
+            q (array_like): probabilities between 0 and 1
+
+        Returns: ndarray of waiting times t with P(Wq <= t) = q; nan if the queue is invalid, inf if it is
+            infeasible
+        """
+        q = np.asarray(q, dtype=float)
+        if not self.is_valid():
+            return np.full(q.shape, np.nan)
+
+        elif not self.is_feasible():
+            return np.full(q.shape, np.inf)
+
+        return PKDistribution.wait_percentile(self.lamda, self.mu, self._service_sigma(), q)
+
+    def _service_sigma(self):
+        """
+        Helper function for the service time standard deviation used by the distribution methods.
+        Each queue using this mixin overrides it.
+        Returns: standard deviation of the service time
+        """
+        raise NotImplementedError
@@ -0,0 +1,18 @@
+from typing import NamedTuple
+
+
+class QueueMetrics(NamedTuple):
+    """
+    Immutable snapshot of a queue's metrics, returned by BaseQueue.metrics().
+    Being a NamedTuple it has no per-instance __dict__, and it can be hashed, compared and unpacked like a tuple.
+    Invalid queues hold math.nan and infeasible ones math.inf, the same as the properties.
+    """
+    lamda: float
+    mu: float
+    r: float
+    ro: float
+    p0: float
+    lq: float
+    l: float
+    wq: float
+    w: float
@@ -0,0 +1,46 @@
+"""
+Benchmark of a full metrics report: reading the properties one at a time against one metrics() snapshot.
+Run with: python QueueMetrics_bench.py
+"""
+import sys
+import timeit
+import MMcQueue
+
+
+NAMES = ('lamda', 'mu', 'r', 'ro', 'p0', 'lq', 'l', 'wq', 'w')
+
+
+def read_properties(queue):
+    """
+    Reads every metric through its property, the way a report had to before metrics() existed.
+    Args:
+        queue (BaseQueue): queue to report on
+    Returns: tuple of metric values
+    """
+    return tuple(getattr(queue, name) for name in NAMES)
+
+
+def read_snapshot(queue):
+    """
+    Reads every metric from one snapshot.
+    Args:
+        queue (BaseQueue): queue to report on
+    Returns: QueueMetrics snapshot
+    """
+    return queue.metrics()
+
+
+def main():
+    queue = MMcQueue.MMcQueue(15, 20, 2)
+    number = 200000
+    for label, report in (('properties', read_properties), ('metrics()', read_snapshot)):
+        seconds = timeit.timeit(lambda: report(queue), number=number)
+        print(f'{label:>12}: {seconds / number * 1e9:8.0f} ns per report')
+
+    snapshot = queue.metrics()
+    print(f'\nsize of one snapshot: {sys.getsizeof(snapshot)} bytes, '
+          f'has __dict__: {hasattr(snapshot, "__dict__")}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+from unittest import TestCase
+import math
+import MG1Queue
+import MMcQueue
+import QueueMetrics as qm
+
+
+class TestQueueMetrics(TestCase):
+    def test_matches_properties(self):
+        for queue in (MMcQueue.MMcQueue(15, 20, 2), MMcQueue.MMcQueue(15, 20, 1), MG1Queue.MG1Queue(20, 25, 0.04)):
+            m = queue.metrics()
+            self.assertIsInstance(m, qm.QueueMetrics)
+            for name in qm.QueueMetrics._fields:
+                self.assertAlmostEqual(getattr(queue, name), getattr(m, name))
+
+    def test_invalid_and_infeasible(self):
+        m = MMcQueue.MMcQueue(15, 0, 2).metrics()
+        self.assertTrue(math.isnan(m.lq))
+        self.assertTrue(math.isnan(m.w))
+
+        m = MMcQueue.MMcQueue(50, 20, 2).metrics()
+        self.assertTrue(math.isinf(m.lq))
+        self.assertTrue(math.isinf(m.w))
+        self.assertAlmostEqual(1.25, m.ro)
+
+    def test_immutable_and_hashable(self):
+        m = MMcQueue.MMcQueue(15, 20, 2).metrics()
+        with self.assertRaises(AttributeError):
+            m.lq = 1
+        with self.assertRaises(AttributeError):
+            m.extra = 1
+
+        #equal parameters give equal, interchangeable snapshots
+        same = MMcQueue.MMcQueue(15, 20, 2).metrics()
+        self.assertEqual(m, same)
+        self.assertEqual(1, len({m, same}))
+
+    def test_recalculates(self):
+        queue = MMcQueue.MMcQueue(15, 20, 2)
+        before = queue.metrics()
+        queue.lamda = 10
+        after = queue.metrics()
+        self.assertNotEqual(before, after)
+        self.assertAlmostEqual(queue.lq, after.lq)
@@ -0,0 +1,137 @@
+"""
+Independent replications of a queue simulation, run in parallel, with confidence intervals on lq and wq.
+"""
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+import MD1Queue
+import MG1Queue
+import MG1Simulator
+import MM1Queue
+import MMcPriorityQueue
+import MMcPrioritySimulator
+import MMcQueue
+import MMcSimulator
+from StreamingStats import Welford
+
+METRICS = ('lq', 'wq')
+
+#queue types with a simulator of the same model; matched exactly, since a subclass may model something else
+MG1_TYPES = (MG1Queue.MG1Queue, MD1Queue.MD1Queue)
+MMC_TYPES = (MM1Queue.MM1Queue, MMcQueue.MMcQueue)
+SUPPORTED_TYPES = (MMcPriorityQueue.MMcPriorityQueue,) + MG1_TYPES + MMC_TYPES
+
+
+def replicate(queue, n_customers, warmup, seed):
+    """
+    Runs one replication with the simulator that matches the queue: MMcPrioritySimulator for priority queues,
+    MG1Simulator for MG1Queue and MD1Queue, and MMcSimulator for MM1Queue and MMcQueue.
+    Priority queues report lq summed over the classes and wq averaged over all customers.
+    Other queue types, including subclasses of these that change the model, would be simulated as
+    the wrong model and raise TypeError.
+    Args:
+        queue (BaseQueue): queue to simulate
+        n_customers (int): number of customers to simulate, including the warm-up
+        warmup (int): number of customers at the start to leave out of the estimates
+        seed (int or SeedSequence): seed of the replication's random stream
+
+    Returns: dict with lq and wq
+    """
+    if type(queue) is MMcPriorityQueue.MMcPriorityQueue:
+        result = MMcPrioritySimulator.MMcPrioritySimulator(queue, seed=seed).run(n_customers, warmup)
+        n_k = result['n_k']
+        if n_k.sum() == 0:
+            return {'lq': math.nan, 'wq': math.nan}
+        wq_k = np.where(n_k > 0, result['wq_k'], 0.0)
+        return {'lq': float(np.nansum(result['lq_k'])), 'wq': float((wq_k * n_k).sum() / n_k.sum())}
+
+    if type(queue) in MG1_TYPES:
+        result = MG1Simulator.MG1Simulator(queue, seed=seed).run(n_customers, warmup)
+    elif type(queue) in MMC_TYPES:
+        result = MMcSimulator.MMcSimulator(queue, seed=seed).run(n_customers, warmup)
+    else:
+        raise TypeError(f'no simulator for {type(queue).__name__}; supported: '
+                        f'{[t.__name__ for t in SUPPORTED_TYPES]}')
+    return {'lq': result['lq'], 'wq': result['wq']}
+
+
+def run_replications(queue, n_customers, replications=30, warmup=0, half_width=None, confidence=0.95,
+                     min_replications=5, seed=None, max_workers=None):
+    """
+    Runs independent replications of a queue simulation across a process pool and puts Student t
+    confidence intervals on lq and wq.
+    Replication i always uses the i-th stream spawned from SeedSequence(seed), so every replication is
+    reproducible. Results are folded into running means in replication order as they come in; when half_width
+    is given the run stops, and replications that have not started are cancelled, as soon as both intervals
+    are narrower than it, so a seeded run always stops at the same replication. Only about two replications
+    per worker are in flight at a time, so an early stop wastes little work.
+    Args:
+        queue (BaseQueue): queue to simulate; it must be picklable, which every queue in this project is
+        n_customers (int): number of customers per replication, including the warm-up
+        replications (int): maximum number of replications
+        warmup (int): number of customers at the start of each replication to leave out of the estimates
+        half_width (number or dict): target half-width for both metrics, or a dict keyed by lq and wq;
+            None runs every replication
+        confidence (number): confidence level of the intervals, between 0 and 1
+        min_replications (int): replications needed before the run may stop early
+        seed (int or SeedSequence): root seed of the replication streams
+        max_workers (int): number of worker processes; None uses every core
+
+    Returns: dict with n (replications used), and for each of lq and wq a (mean, half-width) tuple
+    """
+    #fail here rather than in every worker
+    if type(queue) not in SUPPORTED_TYPES:
+        raise TypeError(f'no simulator for {type(queue).__name__}; supported: '
+                        f'{[t.__name__ for t in SUPPORTED_TYPES]}')
+
+    if half_width is None or isinstance(half_width, dict):
+        targets = half_width or {}
+    else:
+        targets = {name: half_width for name in METRICS}
+
+    stats = {name: Welford() for name in METRICS}
+    streams = np.random.SeedSequence(seed).spawn(replications)
+    in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers) as pool:
+        pending = {}
+        finished = {}
+        submitted = folded = 0
+        stopped = False
+        while folded < replications and not stopped:
+            while submitted < replications and submitted - folded < in_flight:
+                pending[pool.submit(replicate, queue, n_customers, warmup, streams[submitted])] = submitted
+                submitted += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                finished[pending.pop(future)] = future.result()
+
+            #fold in submission order, so a seeded run stops after the same replications whatever finishes first
+            while folded in finished and not stopped:
+                result = finished.pop(folded)
+                folded += 1
+                for name in METRICS:
+                    stats[name].add(result[name])
+                stopped = bool(targets) and folded >= min_replications and _converged(stats, targets, confidence)
+
+        if stopped:
+            pool.shutdown(cancel_futures=True)
+
+    summary = {'n': stats['lq'].n}
+    for name in METRICS:
+        summary[name] = (stats[name].mean, stats[name].half_width(confidence))
+    return summary
+
+
+def _converged(stats, targets, confidence):
+    """
+    Helper function that checks whether every targeted confidence interval is narrow enough.
+    Args:
+        stats (dict): Welford accumulator of each metric
+        targets (dict): target half-width of each metric
+        confidence (number): confidence level of the intervals
+
+    Returns: True if all targets are met
+    """
+    return all(stats[name].half_width(confidence) <= target for name, target in targets.items())
@@ -0,0 +1,62 @@
+from unittest import TestCase
+import math
+import BaseQueue
+import MD1Queue
+import MM1Queue
+import MMcPriorityQueue
+import MMcQueue
+import Replications as r
+
+
+class TestReplications(TestCase):
+    def test_replicate(self):
+        #each queue type goes to its own simulator and comes back as lq and wq
+        for queue in (MM1Queue.MM1Queue(15, 20), MMcQueue.MMcQueue(30, 20, 2), MD1Queue.MD1Queue(15, 20),
+                      MMcPriorityQueue.MMcPriorityQueue((10, 10, 10), 20, 2)):
+            result = r.replicate(queue, 200000, 1000, 1)
+            self.assertLess(abs(result['wq'] - queue.wq), 0.1 * queue.wq)
+            self.assertLess(abs(result['lq'] - queue.lq), 0.1 * queue.lq)
+
+        result = r.replicate(MM1Queue.MM1Queue(-1, 20), 1000, 0, 1)
+        self.assertTrue(math.isnan(result['lq']))
+
+    def test_run_replications(self):
+        queue = MM1Queue.MM1Queue(15, 20)
+        result = r.run_replications(queue, 20000, replications=8, warmup=500, seed=7, max_workers=2)
+        self.assertEqual(8, result['n'])
+        for name in r.METRICS:
+            mean, half_width = result[name]
+            #the interval should cover the exact value, with a generous margin for the test
+            self.assertLess(abs(mean - getattr(queue, name)), 3 * half_width)
+
+        #independent streams from the same root seed give the same answer whatever order they finish in
+        again = r.run_replications(queue, 20000, replications=8, warmup=500, seed=7, max_workers=2)
+        for name in r.METRICS:
+            self.assertAlmostEqual(result[name][0], again[name][0])
+
+    def test_early_stop(self):
+        #a loose target is met after the minimum number of replications
+        queue = MM1Queue.MM1Queue(15, 20)
+        result = r.run_replications(queue, 20000, replications=50, half_width=10, min_replications=4, seed=1,
+                                    max_workers=2)
+        self.assertLess(result['n'], 50)
+        self.assertGreaterEqual(result['n'], 4)
+        self.assertLessEqual(result['lq'][1], 10)
+
+        #results are folded in replication order, so a seeded early stop is reproducible
+        result = r.run_replications(queue, 5000, replications=50, half_width=0.2, min_replications=4, seed=3,
+                                    max_workers=3)
+        again = r.run_replications(queue, 5000, replications=50, half_width=0.2, min_replications=4, seed=3,
+                                   max_workers=2)
+        self.assertEqual(result, again)
+
+    def test_unsupported_queue(self):
+        #subclasses model something else, so they must not fall through to the M/M/c simulator
+        class FiniteQueue(MMcQueue.MMcQueue):
+            __slots__ = ()
+
+        for queue in (FiniteQueue(30, 20, 2), BaseQueue.BaseQueue(30, 20)):
+            with self.assertRaises(TypeError):
+                r.replicate(queue, 1000, 0, 1)
+            with self.assertRaises(TypeError):
+                r.run_replications(queue, 1000, replications=2, max_workers=1)
@@ -0,0 +1,390 @@
+"""
+asyncio monitor that watches live event streams from many queues and alerts before they saturate.
+"""
+import asyncio
+import logging
+import math
+from collections import deque
+from typing import NamedTuple
+import numpy as np
+import MG1Queue
+import MMcQueue
+
+logger = logging.getLogger(__name__)
+
+#event kinds: an arrival carries its arrival time, a service carries the service time of a completed customer
+KINDS = ('arrival', 'service')
+
+
+class Alert(NamedTuple):
+    """
+    A predicted metric crossing its threshold. active is True when it goes over and False when it comes back.
+    """
+    queue_id: str
+    metric: str
+    value: float
+    threshold: float
+    active: bool
+
+
+class SlidingWindow:
+    """
+    Mean and variance of the last size values, updated in O(1) by adding the new value to running sums and
+    taking the evicted one off. The sums are rebuilt once per window to stop rounding errors from building up.
+    """
+    __slots__ = ('_values', '_sum', '_squares', '_evicted')
+
+    def __init__(self, size):
+        """
+        Constructor for SlidingWindow class.
+        Args:
+            size (int): number of values kept
+        """
+        self._values = deque(maxlen=size)
+        self._sum = 0.0
+        self._squares = 0.0
+        self._evicted = 0
+
+    def add(self, x):
+        """
+        Adds one value, evicting the oldest when the window is full.
+        Args:
+            x (number): value to add
+        Returns: None
+        """
+        values = self._values
+        if len(values) == values.maxlen:
+            old = values[0]
+            self._sum -= old
+            self._squares -= old * old
+            self._evicted += 1
+        values.append(x)
+        self._sum += x
+        self._squares += x * x
+        if self._evicted >= values.maxlen:
+            self._sum = math.fsum(values)
+            self._squares = math.fsum(v * v for v in values)
+            self._evicted = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def mean(self):
+        """
+        Getter method for mean property
+        Returns: mean of the window, nan when empty
+        """
+        n = len(self._values)
+        return self._sum / n if n else math.nan
+
+    @property
+    def variance(self):
+        """
+        Getter method for variance property
+        Returns: sample variance of the window, nan with fewer than two values
+        """
+        n = len(self._values)
+        if n < 2:
+            return math.nan
+        return max((self._squares - self._sum * self._sum / n) / (n - 1), 0.0)
+
+
+class _QueueState:
+    """
+    Windows and last evaluation of one monitored queue.
+    """
+    __slots__ = ('c', 'gaps', 'services', 'last_arrival', 'evaluated', 'ro', 'wq', 'active')
+
+    def __init__(self, c, window):
+        self.c = c
+        self.gaps = SlidingWindow(window)
+        self.services = SlidingWindow(window)
+        self.last_arrival = math.nan
+        #(lamda, mu, sigma) at the last evaluation
+        self.evaluated = (math.nan, math.nan, math.nan)
+        self.ro = math.nan
+        self.wq = math.nan
+        #metrics currently over their threshold
+        self.active = set()
+
+    def params(self):
+        """
+        Calculates lamda, mu and sigma from the windows.
+        Returns: (lamda, mu, sigma) tuple, nan where a window is still empty
+        """
+        gap, service = self.gaps.mean, self.services.mean
+        return (1 / gap if gap > 0 else math.nan, 1 / service if service > 0 else math.nan,
+                math.sqrt(self.services.variance))
+
+
+def evaluate(lamda, mu, sigma, c):
+    """
+    Calculates the predicted ro and wq of a batch of queues: MG1Queue for a single server (with sigma) and
+    MMcQueue otherwise. Runs in an executor, away from the event loop.
+    Args:
+        lamda (ndarray): arrival rates
+        mu (ndarray): service rates
+        sigma (ndarray): service time standard deviations
+        c (ndarray): numbers of servers
+
+    Returns: (ro, wq) tuple of ndarrays
+    """
+    single = c == 1
+    ro = np.empty(len(lamda))
+    wq = np.empty(len(lamda))
+    if single.any():
+        m = MG1Queue.MG1Queue.batch_metrics(lamda[single], mu[single], sigma[single])
+        ro[single], wq[single] = m['ro'], m['wq']
+    if not single.all():
+        m = MMcQueue.MMcQueue.batch_metrics(lamda[~single], mu[~single], c[~single])
+        ro[~single], wq[~single] = m['ro'], m['wq']
+    return ro, wq
+
+
+class SaturationMonitor:
+    """
+    Keeps sliding-window estimates of lamda, mu and sigma for any number of queues fed by live events, and
+    alerts when the predicted ro or wq crosses a threshold, before the queue stops being feasible.
+    Events are "queue_id kind value" lines from a tailed file or a UNIX socket, or (queue_id, kind, value)
+    tuples from an asyncio.Queue, where kind is one of KINDS. Handling an event is O(1) and never computes
+    metrics: a queue whose estimates have moved by more than the tolerance since its last evaluation is
+    marked dirty, and a background task evaluates all dirty queues together with the vectorized
+    batch_metrics in an executor. Alerts are put on the alerts asyncio.Queue.
+    Use it as an async context manager, which runs the evaluation task:
+        async with SaturationMonitor(ro_max=0.9) as monitor:
+            await monitor.tail('events.log')
+    """
+    def __init__(self, c=1, window=1000, tolerance=0.05, ro_max=0.9, wq_max=None, min_events=10,
+                 executor=None):
+        """
+        Constructor for SaturationMonitor class.
+        Args:
+            c (int or dict): number of servers of every queue, or a dict of it by queue id (1 if missing)
+            window (int): number of interarrival and service times in each sliding window
+            tolerance (number): relative change in lamda, mu or sigma that triggers a re-evaluation
+            ro_max (number): ro alert threshold; None for no ro alert
+            wq_max (number): wq alert threshold; None for no wq alert
+            min_events (int): interarrival and service times needed before a queue is evaluated
+            executor (Executor): where metrics are computed; None uses the loop's default thread pool
+        """
+        self.c = c
+        self.window = window
+        self.tolerance = tolerance
+        self.thresholds = {name: limit for name, limit in (('ro', ro_max), ('wq', wq_max)) if limit is not None}
+        self.min_events = max(min_events, 2)
+        self.executor = executor
+        self.alerts = asyncio.Queue()
+        self.queues = {}
+        self._dirty = set()
+        self._wake = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = None
+
+    async def __aenter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._evaluate_loop())
+        return self
+
+    async def __aexit__(self, *exc):
+        #a failed evaluation task is already done, so awaiting it below raises its exception here
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def handle(self, queue_id, kind, value):
+        """
+        Records one event and marks the queue for evaluation if its estimates have moved.
+        Args:
+            queue_id (str): queue the event belongs to
+            kind (str): one of KINDS
+            value (number): arrival time for an arrival, service time for a service
+        Returns: None
+        """
+        state = self.queues.get(queue_id)
+        if state is None:
+            c = self.c.get(queue_id, 1) if isinstance(self.c, dict) else self.c
+            state = self.queues[queue_id] = _QueueState(c, self.window)
+
+        if kind == 'arrival':
+            if not math.isnan(state.last_arrival):
+                state.gaps.add(value - state.last_arrival)
+            state.last_arrival = value
+        elif kind == 'service':
+            state.services.add(value)
+        else:
+            raise ValueError(f'event kind must be one of {KINDS}, not {kind!r}')
+
+        if len(state.gaps) >= self.min_events and len(state.services) >= self.min_events \
+                and queue_id not in self._dirty and self._moved(state):
+            self._dirty.add(queue_id)
+            self._idle.clear()
+            self._wake.set()
+
+    def handle_line(self, line):
+        """
+        Records one "queue_id kind value" event line; blank lines are ignored.
+        Args:
+            line (str or bytes): event line
+        Returns: None
+        """
+        if isinstance(line, bytes):
+            line = line.decode()
+        fields = line.split()
+        if fields:
+            queue_id, kind, value = fields
+            self.handle(queue_id, kind, float(value))
+
+    def _handle_event_line(self, line):
+        """
+        Helper function for the line sources: handles one event line, logging and skipping it if it is
+        malformed so one bad producer cannot stop tail or serve.
+        Args:
+            line (str or bytes): event line
+        Returns: None
+        """
+        try:
+            self.handle_line(line)
+        except ValueError as error:
+            logger.warning('skipping malformed event line %r: %s', line, error)
+
+    def _moved(self, state):
+        """
+        Helper function that checks whether any estimate has moved beyond the tolerance since the last
+        evaluation.
+        Args:
+            state (_QueueState): queue to check
+        Returns: True if the queue needs a new evaluation
+        """
+        lamda, mu, sigma = state.params()
+        old_lamda, old_mu, old_sigma = state.evaluated
+        #sigma is compared as a coefficient of variation, since it can sit at or near zero
+        for new, old, scale in ((lamda, old_lamda, old_lamda), (mu, old_mu, old_mu),
+                                (sigma * mu, old_sigma * old_mu, 1.0)):
+            if math.isnan(old) != math.isnan(new) or abs(new - old) > self.tolerance * abs(scale):
+                return True
+        return False
+
+    async def _evaluate_loop(self):
+        """
+        Helper coroutine that evaluates the dirty queues in batches as they come up.
+        Returns: None
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            ids = list(self._dirty)
+            self._dirty.clear()
+            states = [self.queues[queue_id] for queue_id in ids]
+            params = np.array([state.params() for state in states], dtype=float).reshape(-1, 3)
+            c = np.array([state.c for state in states], dtype=float)
+            ro, wq = await loop.run_in_executor(self.executor, evaluate, params[:, 0], params[:, 1],
+                                                params[:, 2], c)
+
+            for queue_id, state, p, r, w in zip(ids, states, params.tolist(), ro.tolist(), wq.tolist()):
+                state.evaluated = tuple(p)
+                state.ro, state.wq = r, w
+                for name, value in (('ro', r), ('wq', w)):
+                    self._check(queue_id, state, name, value)
+            if not self._dirty:
+                self._idle.set()
+
+    def _check(self, queue_id, state, name, value):
+        """
+        Helper function that raises or clears an alert when a metric crosses its threshold.
+        Args:
+            queue_id (str): queue evaluated
+            state (_QueueState): its state
+            name (str): ro or wq
+            value (number): predicted value; inf when the queue is infeasible
+        Returns: None
+        """
+        threshold = self.thresholds.get(name)
+        if threshold is None or math.isnan(value):
+            return
+        over = value >= threshold
+        if over != (name in state.active):
+            if over:
+                state.active.add(name)
+            else:
+                state.active.discard(name)
+            self.alerts.put_nowait(Alert(queue_id, name, value, threshold, over))
+
+    async def settled(self):
+        """
+        Waits until every queue marked for evaluation has been evaluated. If the evaluation task has failed,
+        its exception is raised here rather than waiting forever.
+        Returns: None
+        """
+        if self._task is None:
+            await self._idle.wait()
+            return
+
+        idle = asyncio.ensure_future(self._idle.wait())
+        try:
+            await asyncio.wait((idle, self._task), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            idle.cancel()
+        if self._task.done() and not self._task.cancelled():
+            self._task.result()
+
+    async def consume(self, events):
+        """
+        Reads (queue_id, kind, value) events from an asyncio.Queue until cancelled; malformed events are
+        logged and skipped.
+        Args:
+            events (asyncio.Queue): event source
+        Returns: None
+        """
+        while True:
+            event = await events.get()
+            try:
+                self.handle(*event)
+            except (TypeError, ValueError) as error:
+                logger.warning('skipping malformed event %r: %s', event, error)
+            finally:
+                events.task_done()
+
+    async def tail(self, path, from_start=False, poll=0.1):
+        """
+        Follows a file of event lines, like tail -f, until cancelled. A line is only handled once its newline
+        has been written; malformed lines are logged and skipped. The file is read in a worker thread so a slow
+        disk never blocks the event loop.
+        Args:
+            path (str): file to follow
+            from_start (bool): handle the lines already in the file first
+            poll (number): seconds to sleep when no new line is there
+        Returns: None
+        """
+        with open(path) as events:
+            if not from_start:
+                events.seek(0, 2)
+            partial = ''
+            while True:
+                line = await asyncio.to_thread(events.readline)
+                if not line:
+                    await asyncio.sleep(poll)
+                    continue
+                partial += line
+                if partial.endswith('\n'):
+                    self._handle_event_line(partial)
+                    partial = ''
+
+    async def serve(self, path):
+        """
+        Listens on a UNIX socket; every client writes event lines, and malformed ones are logged and skipped.
+        Args:
+            path (str): socket path
+        Returns: asyncio.Server, to be closed by the caller
+        """
+        async def client(reader, writer):
+            try:
+                async for line in reader:
+                    self._handle_event_line(line)
+            finally:
+                writer.close()
+
+        return await asyncio.start_unix_server(client, path)
@@ -0,0 +1,151 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+import asyncio
+import math
+import os
+import tempfile
+import numpy as np
+import SaturationMonitor as m
+
+
+def events(queue_id, lamda, service, n, start=0.0):
+    #evenly spaced arrivals and fixed service times, so the estimates are exact
+    return [e for i in range(n) for e in ((queue_id, 'arrival', start + i / lamda), (queue_id, 'service', service))]
+
+
+class TestSlidingWindow(TestCase):
+    def test_window(self):
+        data = np.random.default_rng(9).normal(5, 2, 2500)
+        window = m.SlidingWindow(100)
+        self.assertTrue(math.isnan(window.mean))
+        for x in data:
+            window.add(x)
+        self.assertEqual(100, len(window))
+        self.assertAlmostEqual(data[-100:].mean(), window.mean)
+        self.assertAlmostEqual(data[-100:].var(ddof=1), window.variance)
+
+
+class TestSaturationMonitor(IsolatedAsyncioTestCase):
+    async def test_alerts(self):
+        async with m.SaturationMonitor(c={'b': 2}, window=50, ro_max=0.9, wq_max=5.0) as monitor:
+            for event in events('a', 10, 0.05, 100) + events('b', 10, 0.19, 100):
+                monitor.handle(*event)
+            await monitor.settled()
+            self.assertAlmostEqual(0.5, monitor.queues['a'].ro)
+            self.assertAlmostEqual(0.95, monitor.queues['b'].ro)
+            alert = monitor.alerts.get_nowait()
+            self.assertEqual(('b', 'ro', True), (alert.queue_id, alert.metric, alert.active))
+            self.assertTrue(monitor.alerts.empty())
+
+            #b saturates: ro goes past 1 and wq is infinite
+            for event in events('b', 12, 0.19, 100, start=10):
+                monitor.handle(*event)
+            await monitor.settled()
+            alert = monitor.alerts.get_nowait()
+            self.assertEqual(('b', 'wq', True), (alert.queue_id, alert.metric, alert.active))
+            self.assertGreaterEqual(alert.value, 5.0)
+            self.assertTrue(math.isinf(monitor.queues['b'].wq))
+
+            #and recovers
+            for event in events('b', 5, 0.19, 100, start=20):
+                monitor.handle(*event)
+            await monitor.settled()
+            cleared = {monitor.alerts.get_nowait().metric for _ in range(2)}
+            self.assertEqual({'ro', 'wq'}, cleared)
+            self.assertFalse(monitor.queues['b'].active)
+
+    async def test_tolerance(self):
+        async with m.SaturationMonitor(window=50, tolerance=0.05) as monitor:
+            for event in events('a', 10, 0.05, 60):
+                monitor.handle(*event)
+            await monitor.settled()
+            evaluated = monitor.queues['a'].evaluated
+            #a 1% change in the service time is within tolerance
+            for event in events('a', 10, 0.0505, 60, start=6):
+                monitor.handle(*event)
+            await monitor.settled()
+            self.assertEqual(evaluated, monitor.queues['a'].evaluated)
+
+        with self.assertRaises(ValueError):
+            monitor.handle('a', 'departure', 1.0)
+
+    async def test_sources(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'events.log')
+            sock = os.path.join(tmp, 'events.sock')
+            with open(log, 'w') as f:
+                f.writelines(f'{q} {kind} {value}\n' for q, kind, value in events('file', 10, 0.095, 30))
+
+            async with m.SaturationMonitor(window=20, ro_max=0.9) as monitor:
+                queue = asyncio.Queue()
+                for event in events('queue', 10, 0.095, 30):
+                    queue.put_nowait(event)
+                server = await monitor.serve(sock)
+                tasks = [asyncio.create_task(monitor.consume(queue)),
+                         asyncio.create_task(monitor.tail(log, from_start=True, poll=0.01))]
+
+                reader, writer = await asyncio.open_unix_connection(sock)
+                writer.write(''.join(f'{q} {kind} {value}\n' for q, kind, value in events('socket', 10, 0.095, 30)
+                                     ).encode())
+                await writer.drain()
+                writer.close()
+
+                alerted = set()
+                while len(alerted) < 3:
+                    alert = await asyncio.wait_for(monitor.alerts.get(), 5)
+                    alerted.add(alert.queue_id)
+                self.assertEqual({'file', 'queue', 'socket'}, alerted)
+
+                for task in tasks:
+                    task.cancel()
+                server.close()
+                await server.wait_closed()
+
+    async def test_malformed_events(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'events.log')
+            sock = os.path.join(tmp, 'events.sock')
+            lines = ['a arrival\n', 'a arrival soon\n', 'a departure 1.0\n']
+            with open(log, 'w') as f:
+                f.writelines(lines + [f'{q} {kind} {value}\n' for q, kind, value in events('file', 10, 0.095, 30)])
+
+            async with m.SaturationMonitor(window=20, ro_max=0.9) as monitor:
+                queue = asyncio.Queue()
+                for event in [('a', 'arrival')] + events('queue', 10, 0.095, 30):
+                    queue.put_nowait(event)
+                server = await monitor.serve(sock)
+                with self.assertLogs('SaturationMonitor', 'WARNING') as logs:
+                    tasks = [asyncio.create_task(monitor.consume(queue)),
+                             asyncio.create_task(monitor.tail(log, from_start=True, poll=0.01))]
+                    reader, writer = await asyncio.open_unix_connection(sock)
+                    writer.write(''.join(lines + [f'{q} {kind} {value}\n'
+                                                  for q, kind, value in events('socket', 10, 0.095, 30)]).encode())
+                    await writer.drain()
+                    writer.close()
+
+                    #the good events after the bad ones still get through from every source
+                    alerted = set()
+                    while len(alerted) < 3:
+                        alert = await asyncio.wait_for(monitor.alerts.get(), 5)
+                        alerted.add(alert.queue_id)
+                self.assertEqual({'file', 'queue', 'socket'}, alerted)
+                self.assertEqual(7, len(logs.output))
+
+                for task in tasks:
+                    task.cancel()
+                server.close()
+                await server.wait_closed()
+
+    async def test_evaluation_failure(self):
+        #an exception in the evaluation task reaches settled() instead of leaving it waiting forever
+        def fail(*args):
+            raise ArithmeticError('evaluation failed')
+
+        evaluate = m.evaluate
+        self.addCleanup(setattr, m, 'evaluate', evaluate)
+        m.evaluate = fail
+        with self.assertRaises(ArithmeticError):
+            async with m.SaturationMonitor(window=20) as monitor:
+                for event in events('a', 10, 0.05, 30):
+                    monitor.handle(*event)
+                with self.assertRaises(ArithmeticError):
+                    await asyncio.wait_for(monitor.settled(), 5)
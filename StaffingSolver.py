@@ -0,0 +1,132 @@
+"""
+SLA-driven staffing for M/M/c queues: the smallest number of servers c that meets a target.
+Each query starts at the smallest stable c, probes c with exponentially growing steps until the target is
+met, then binary searches the last step. The Erlang-B recurrence is never restarted: every query keeps a
+checkpoint at the largest c known to miss the target and only advances the recurrence from there, so a query
+costs O(log c) target checks and O(c) recurrence steps in total. All queries run side by side as NumPy arrays.
+"""
+import numpy as np
+
+
+def min_servers(lamda, mu, wq_max=None, t=None, p_max=None, utilization_max=None):
+    """
+    Finds the smallest number of servers that meets every given target. Targets that are left as None
+    are ignored; with no targets at all the result is the smallest stable c.
+    The "80/20" service level (80% of customers wait no longer than 20 time units) is t=20, p_max=0.2.
+    Args:
+        lamda (array_like): average rates of arrival
+        mu (array_like): average rates of service completion
+        wq_max (array_like): upper bound on the average time spent waiting in the queue
+        t (array_like): waiting time threshold for the p_max target
+        p_max (array_like): upper bound on the probability that a customer waits longer than t
+        utilization_max (array_like): upper bound on ro
+
+    Returns: float ndarray with the smallest c for every query, nan where an argument is invalid
+    """
+    arrays = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in
+                                   (lamda, mu, _target(wq_max), _target(t, 0.0), _target(p_max),
+                                    _target(utilization_max))])
+    lamda, mu, wq_max, t, p_max, utilization_max = [x.ravel() for x in arrays]
+    shape = arrays[0].shape
+
+    valid = (lamda > 0) & (mu > 0) & (wq_max > 0) & (t >= 0) & (p_max > 0) & (utilization_max > 0)
+    a = np.where(valid, lamda / np.where(valid, mu, 1), 0.0)
+
+    #smallest stable c, raised further by the utilization cap which has a closed form
+    c_lo = np.floor(a) + 1
+    with np.errstate(divide='ignore'):
+        c_lo = np.maximum(c_lo, np.ceil(a / utilization_max))
+    c_lo = np.where(valid, c_lo, 1).astype(np.int64)
+
+    b_lo = _advance(a, np.zeros_like(c_lo), np.ones(a.shape), c_lo)
+    met = _meets(a, lamda, mu, c_lo, b_lo, wq_max, t, p_max) | ~valid
+    result = np.where(met, c_lo, 0)
+
+    #exponential phase: lo always misses the target, probe lo + step until a probe meets it
+    lo = c_lo
+    hi = c_lo.copy()
+    searching = ~met
+    step = np.ones_like(c_lo)
+    while np.any(searching):
+        probe = np.where(searching, lo + step, lo)
+        b_probe = _advance(a, lo, b_lo, probe)
+        probe_met = _meets(a, lamda, mu, probe, b_probe, wq_max, t, p_max)
+        found = searching & probe_met
+        missed = searching & ~probe_met
+        hi = np.where(found, probe, hi)
+        lo = np.where(missed, probe, lo)
+        b_lo = np.where(missed, b_probe, b_lo)
+        step = np.where(missed, step * 2, step)
+        searching = missed
+
+    #binary phase between the last miss and the first hit
+    searching = ~met & (hi - lo > 1)
+    while np.any(searching):
+        mid = np.where(searching, (lo + hi) // 2, lo)
+        b_mid = _advance(a, lo, b_lo, mid)
+        mid_met = _meets(a, lamda, mu, mid, b_mid, wq_max, t, p_max)
+        hi = np.where(searching & mid_met, mid, hi)
+        missed = searching & ~mid_met
+        lo = np.where(missed, mid, lo)
+        b_lo = np.where(missed, b_mid, b_lo)
+        searching = ~met & (hi - lo > 1)
+
+    result = np.where(met, result, hi).astype(float)
+    return np.where(valid, result, np.nan).reshape(shape)
+
+
+def _target(value, default=np.inf):
+    """
+    Helper function that replaces a missing target with one that is always met.
+    Args:
+        value (array_like or None): target given by the caller
+        default (number): value to use when the target is None
+
+    Returns: the target or its default
+    """
+    return default if value is None else value
+
+
+def _advance(a, k, b, target):
+    """
+    Helper function that continues the Erlang-B recurrence of every query from its own checkpoint.
+    Args:
+        a (ndarray): offered loads
+        k (ndarray): number of servers at each checkpoint
+        b (ndarray): Erlang-B value at each checkpoint
+        target (ndarray): number of servers to advance each query to, never below k
+
+    Returns: ndarray of Erlang-B values at target
+    """
+    b = b.copy()
+    k = k.copy()
+    while True:
+        active = k < target
+        if not np.any(active):
+            return b
+        k = np.where(active, k + 1, k)
+        ab = a * b
+        b = np.where(active, ab / (k + ab), b)
+
+
+def _meets(a, lamda, mu, c, b, wq_max, t, p_max):
+    """
+    Helper function that checks the waiting targets at c servers given Erlang-B at c.
+    Args:
+        a (ndarray): offered loads
+        lamda (ndarray): arrival rates
+        mu (ndarray): service rates
+        c (ndarray): number of servers, above a
+        b (ndarray): Erlang-B values at c
+        wq_max (ndarray): targets for the average time waiting in the queue
+        t (ndarray): waiting time thresholds
+        p_max (ndarray): targets for the probability of waiting longer than t
+
+    Returns: boolean ndarray, True where every target is met
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p_wait = b / (1 - a / c * (1 - b))
+        gap = c * mu - lamda
+        wq = p_wait / gap
+        tail = p_wait * np.exp(-gap * t)
+    return (wq <= wq_max) & (tail <= p_max)
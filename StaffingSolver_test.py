@@ -0,0 +1,46 @@
+from unittest import TestCase
+import numpy as np
+import MMcQueue
+import StaffingSolver as s
+
+
+class TestStaffingSolver(TestCase):
+    def brute_force(self, lamda, mu, wq_max=np.inf, t=0.0, p_max=np.inf, utilization_max=np.inf):
+        #Reference answer from walking the staffing curve one c at a time
+        queue = MMcQueue.MMcQueue(lamda, mu, 1)
+        curve = queue.staffing_curve(int(lamda / mu) + 2000)
+        tail = curve['p_wait'] * np.exp(-(curve['c'] * mu - lamda) * t)
+        ok = (curve['wq'] <= wq_max) & (tail <= p_max) & (lamda / mu / curve['c'] <= utilization_max)
+        return curve['c'][np.argmax(ok)]
+
+    def test_stable_only(self):
+        #with no targets the answer is the smallest c with ro < 1
+        np.testing.assert_array_equal([8, 9, 1], s.min_servers([15, 16, 1], [2, 2, 3]))
+
+    def test_wq_target(self):
+        for lamda, mu, wq_max in ((15, 2, 0.1), (100, 1, 0.01), (950, 1, 0.001), (3, 4, 10)):
+            self.assertEqual(self.brute_force(lamda, mu, wq_max=wq_max),
+                             s.min_servers(lamda, mu, wq_max=wq_max))
+
+    def test_service_level_target(self):
+        #80% of customers answered within 20 seconds, 1 call per second, 3 minute calls
+        expected = self.brute_force(1, 1 / 180, t=20, p_max=0.2)
+        self.assertEqual(expected, s.min_servers(1, 1 / 180, t=20, p_max=0.2))
+
+    def test_utilization_target(self):
+        self.assertEqual(10, s.min_servers(8, 1, utilization_max=0.8))
+        self.assertEqual(11, s.min_servers(8.1, 1, utilization_max=0.8))
+
+    def test_vectorized(self):
+        lamdas = np.array([15, 100, 950, 3, 40])
+        wq_max = np.array([0.1, 0.01, 0.001, 10, 0.05])
+        result = s.min_servers(lamdas, 1, wq_max=wq_max, utilization_max=0.95)
+        for i in range(len(lamdas)):
+            expected = self.brute_force(int(lamdas[i]), 1, wq_max=wq_max[i], utilization_max=0.95)
+            self.assertEqual(expected, result[i])
+
+    def test_invalid(self):
+        result = s.min_servers([15, -1, 15], [2, 2, 2], wq_max=[0.1, 0.1, 0])
+        self.assertEqual(self.brute_force(15, 2, wq_max=0.1), result[0])
+        self.assertTrue(np.isnan(result[1]))
+        self.assertTrue(np.isnan(result[2]))
@@ -0,0 +1,342 @@
+"""
+Streaming statistics for simulation output: accumulators that take values one at a time or in NumPy blocks and
+keep O(1) state.
+"""
+import math
+from statistics import NormalDist
+import numpy as np
+
+
+def t_quantile(p, dof):
+    """
+    Quantile of Student's t distribution from the Cornish-Fisher expansion around the normal quantile.
+    Accurate to about 1e-3 from 3 degrees of freedom up, which is plenty for confidence intervals.
+    Args:
+        p (number): probability, between 0 and 1
+        dof (number): degrees of freedom
+
+    Returns: t such that P(T <= t) = p
+    """
+    z = NormalDist().inv_cdf(p)
+    if math.isinf(dof):
+        return z
+    z3, z5, z7 = z ** 3, z ** 5, z ** 7
+    return (z + (z3 + z) / (4 * dof) + (5 * z5 + 16 * z3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * dof ** 3))
+
+
+class Welford:
+    """
+    Running mean and variance by Welford's method, numerically stable in one pass.
+    """
+    __slots__ = ('n', 'mean', '_m2')
+
+    def __init__(self):
+        """
+        Constructor for Welford class.
+        """
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        """
+        Adds one value.
+        Args:
+            x (number): value to add
+        Returns: None
+        """
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (x - self.mean)
+
+    def extend(self, values):
+        """
+        Adds a block of values, merging the block's own mean and variance with Chan's parallel formula so the
+        block is summarised by NumPy instead of a loop.
+        Args:
+            values (array_like): values to add
+        Returns: None
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        m = len(values)
+        if m == 0:
+            return
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        n = self.n + m
+        delta = mean - self.mean
+        self.mean += delta * m / n
+        self._m2 += m2 + delta * delta * self.n * m / n
+        self.n = n
+
+    @property
+    def variance(self):
+        """
+        Getter method for variance property
+        Returns: sample variance (n - 1 denominator), nan with fewer than two values
+        """
+        if self.n < 2:
+            return math.nan
+        return self._m2 / (self.n - 1)
+
+    def half_width(self, confidence=0.95):
+        """
+        Calculates the half-width of the Student t confidence interval for the mean.
+        Args:
+            confidence (number): confidence level, between 0 and 1
+        Returns: half-width, nan with fewer than two values
+        """
+        if self.n < 2:
+            return math.nan
+        return t_quantile((1 + confidence) / 2, self.n - 1) * math.sqrt(self.variance / self.n)
+
+
+class Ewma:
+    """
+    Exponentially weighted mean and variance, for estimates that follow a drifting stream. Each new value
+    gets weight alpha and older ones decay by (1 - alpha) per value. Moments are kept around the first value
+    seen, which keeps the variance accurate for values far from zero.
+    """
+    __slots__ = ('alpha', 'n', '_shift', '_m1', '_m2')
+
+    def __init__(self, alpha=0.01):
+        """
+        Constructor for Ewma class.
+        Args:
+            alpha (number): weight of the newest value, between 0 and 1
+        """
+        if not 0 < alpha <= 1:
+            raise ValueError(f'alpha must be in (0, 1], not {alpha}')
+        self.alpha = alpha
+        self.n = 0
+        self._shift = 0.0
+        self._m1 = 0.0
+        self._m2 = 0.0
+
+    def add(self, x):
+        """
+        Adds one value.
+        Args:
+            x (number): value to add
+        Returns: None
+        """
+        if self.n == 0:
+            self._shift = x
+        self.n += 1
+        d = x - self._shift
+        self._m1 += self.alpha * (d - self._m1)
+        self._m2 += self.alpha * (d * d - self._m2)
+
+    def extend(self, values):
+        """
+        Adds a block of values with the same result as adding them one at a time; both moments follow a
+        linear recursion, so the block collapses to one weighted sum.
+        Args:
+            values (array_like): values to add, oldest first
+        Returns: None
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        m = len(values)
+        if m == 0:
+            return
+        if self.n == 0:
+            self._shift = values[0]
+        self.n += m
+        d = values - self._shift
+        #value i of the block keeps alpha * (1 - alpha)^(m - 1 - i) of its weight
+        weights = self.alpha * (1 - self.alpha) ** np.arange(m - 1, -1, -1)
+        decay = (1 - self.alpha) ** m
+        self._m1 = decay * self._m1 + weights @ d
+        self._m2 = decay * self._m2 + weights @ (d * d)
+
+    @property
+    def mean(self):
+        """
+        Getter method for mean property
+        Returns: weighted mean, nan before any value
+        """
+        if self.n == 0:
+            return math.nan
+        #early on the weights still sum to less than one, so rescale them
+        return self._shift + self._m1 / self._weight()
+
+    @property
+    def variance(self):
+        """
+        Getter method for variance property
+        Returns: weighted variance, nan with fewer than two values
+        """
+        if self.n < 2:
+            return math.nan
+        total = self._weight()
+        return max(self._m2 / total - (self._m1 / total) ** 2, 0.0)
+
+    def _weight(self):
+        """
+        Helper function for the total weight of the values seen so far.
+        Returns: 1 - (1 - alpha)^n
+        """
+        return -math.expm1(self.n * math.log1p(-self.alpha)) if self.alpha < 1 else 1.0
+
+
+class BatchMeans:
+    """
+    Batch means over a stream, with MSER-5 warm-up truncation, in bounded memory.
+    Observations are averaged in batches of batch_size; only the batch means are kept. When max_batches
+    batches are full, neighbouring pairs are merged and the batch size doubles, so memory stays fixed however
+    long the stream runs and there are always between max_batches / 2 and max_batches batches for the
+    variance estimate.
+    """
+    __slots__ = ('batch_size', 'max_batches', 'n', '_means', '_count', '_partial_sum', '_partial_n')
+
+    def __init__(self, batch_size=5, max_batches=1024):
+        """
+        Constructor for BatchMeans class.
+        Args:
+            batch_size (int): initial batch size; 5 gives MSER-5
+            max_batches (int): number of batch means kept, even
+        """
+        if max_batches < 4 or max_batches % 2:
+            raise ValueError(f'max_batches must be an even number of at least 4, not {max_batches}')
+        self.batch_size = int(batch_size)
+        self.max_batches = int(max_batches)
+        self.n = 0
+        self._means = np.empty(self.max_batches)
+        self._count = 0
+        self._partial_sum = 0.0
+        self._partial_n = 0
+
+    def extend(self, values):
+        """
+        Adds a block of observations.
+        Args:
+            values (number or array_like): observations, in stream order
+        Returns: None
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        self.n += len(values)
+        while len(values):
+            #top up the partial batch, then take as many whole batches as fit
+            fill = min(self.batch_size - self._partial_n, len(values))
+            if self._partial_n or fill < self.batch_size:
+                self._partial_sum += values[:fill].sum()
+                self._partial_n += fill
+                values = values[fill:]
+                if self._partial_n == self.batch_size:
+                    self._push(np.array([self._partial_sum / self.batch_size]))
+                    self._partial_sum = 0.0
+                    self._partial_n = 0
+                continue
+
+            size = self.batch_size
+            whole = min(len(values) // size, self.max_batches - self._count)
+            #_push may double batch_size, so slice with the size the batches were taken at
+            self._push(values[:whole * size].reshape(whole, size).mean(axis=1))
+            values = values[whole * size:]
+
+    def _push(self, means):
+        """
+        Helper function that stores completed batch means, merging pairs when the buffer is full.
+        Args:
+            means (ndarray): new batch means, no more than the free room in the buffer
+        Returns: None
+        """
+        self._means[self._count:self._count + len(means)] = means
+        self._count += len(means)
+        if self._count == self.max_batches:
+            half = self.max_batches // 2
+            self._means[:half] = (self._means[0::2] + self._means[1::2]) / 2
+            self._count = half
+            self.batch_size *= 2
+
+    @property
+    def means(self):
+        """
+        Getter method for means property
+        Returns: ndarray of the completed batch means, oldest first
+        """
+        return self._means[:self._count].copy()
+
+    def truncation(self):
+        """
+        Calculates the MSER warm-up point: the number of leading batches d, at most half of them, that
+        minimizes the squared standard error of the remaining batch means, sum((Y - mean)^2) / (k - d)^2.
+        Returns: number of leading observations to drop
+        """
+        k = self._count
+        if k < 4:
+            return 0
+        y = self._means[:k]
+        #suffix sums give the statistic for every d at once
+        s1 = np.cumsum(y[::-1])[::-1]
+        s2 = np.cumsum((y * y)[::-1])[::-1]
+        left = np.arange(k, 0, -1)
+        d = np.arange(k // 2 + 1)
+        sse = s2[d] - s1[d] ** 2 / left[d]
+        return int(np.argmin(sse / left[d] ** 2)) * self.batch_size
+
+    def estimate(self, confidence=0.95, truncate=True):
+        """
+        Calculates the steady-state mean and the batch means confidence interval half-width.
+        Args:
+            confidence (number): confidence level of the interval, between 0 and 1
+            truncate (bool): drop the MSER warm-up first
+
+        Returns: (mean, half-width) tuple; nan with fewer than two batches left
+        """
+        skip = self.truncation() // self.batch_size if truncate else 0
+        y = self._means[skip:self._count]
+        if len(y) < 2:
+            return math.nan, math.nan
+        return (float(y.mean()),
+                t_quantile((1 + confidence) / 2, len(y) - 1) * float(y.std(ddof=1)) / math.sqrt(len(y)))
+
+
+class SteadyStateEstimator:
+    """
+    Streams per-customer waiting times from a simulator into running estimates of the BaseQueue metrics.
+    wq is the batch means average after MSER-5 truncation; w = wq + 1 / mu and lq, l follow from Little's
+    Laws with the queue's lamda. Nothing is kept per customer, so it suits runs of 10^9 customers, e.g.
+        estimator.consume(waits for _, waits, _, _ in MMcSimulator.MMcSimulator(queue).iter_blocks(n))
+    """
+    def __init__(self, queue, batch_size=5, max_batches=1024):
+        """
+        Constructor for SteadyStateEstimator class.
+        Args:
+            queue (BaseQueue): queue being simulated, for lamda and mu
+            batch_size (int): initial batch size of the batch means
+            max_batches (int): number of batch means kept
+        """
+        self.lamda = queue.lamda
+        self.mu = queue.mu
+        self.batches = BatchMeans(batch_size, max_batches)
+
+    def consume(self, waits, confidence=0.95):
+        """
+        Feeds waiting times through the estimator.
+        Args:
+            waits (iterable): waiting times, one number or one array per item
+            confidence (number): confidence level of the intervals
+
+        Returns: generator of the running estimates after each item
+        """
+        for block in waits:
+            self.batches.extend(block)
+            yield self.estimates(confidence)
+
+    def estimates(self, confidence=0.95):
+        """
+        Calculates the current estimates.
+        Args:
+            confidence (number): confidence level of the intervals
+
+        Returns: dict with lq, l, wq, w and their half-widths (keys ending in _hw), n (customers seen) and
+            warmup (customers dropped as warm-up)
+        """
+        wq, hw = self.batches.estimate(confidence)
+        w = wq + 1 / self.mu
+        return {'lq': self.lamda * wq, 'l': self.lamda * w, 'wq': wq, 'w': w,
+                'lq_hw': self.lamda * hw, 'l_hw': self.lamda * hw, 'wq_hw': hw, 'w_hw': hw,
+                'n': self.batches.n, 'warmup': self.batches.truncation()}
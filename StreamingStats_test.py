@@ -0,0 +1,105 @@
+from unittest import TestCase
+import math
+import numpy as np
+import MM1Queue
+import MMcSimulator
+import StreamingStats as s
+
+
+class TestStreamingStats(TestCase):
+    def test_t_quantile(self):
+        #reference values from t tables
+        self.assertAlmostEqual(2.776, s.t_quantile(0.975, 4), delta=0.01)
+        self.assertAlmostEqual(2.228, s.t_quantile(0.975, 10), delta=0.002)
+        self.assertAlmostEqual(2.042, s.t_quantile(0.975, 30), delta=0.001)
+        self.assertAlmostEqual(1.960, s.t_quantile(0.975, math.inf), delta=0.001)
+
+    def test_welford(self):
+        data = np.random.default_rng(3).normal(1e6, 2, 1000)
+        stats = s.Welford()
+        self.assertTrue(math.isnan(stats.variance))
+        for x in data:
+            stats.add(x)
+        self.assertEqual(1000, stats.n)
+        self.assertAlmostEqual(data.mean(), stats.mean)
+        self.assertAlmostEqual(data.var(ddof=1), stats.variance)
+        self.assertAlmostEqual(s.t_quantile(0.975, 999) * data.std(ddof=1) / math.sqrt(1000), stats.half_width())
+
+    def test_batch_means(self):
+        data = np.arange(100, dtype=float)
+        one_by_one = s.BatchMeans(batch_size=5, max_batches=8)
+        for x in data:
+            one_by_one.extend(x)
+        blocks = s.BatchMeans(batch_size=5, max_batches=8)
+        for block in np.array_split(data, 7):
+            blocks.extend(block)
+
+        #100 values: batches of 5 merge to 10 at 40 values and to 20 at 80, leaving 5 full batches
+        for stats in (one_by_one, blocks):
+            self.assertEqual(100, stats.n)
+            self.assertEqual(20, stats.batch_size)
+            np.testing.assert_allclose(data.reshape(5, 20).mean(axis=1), stats.means)
+
+        with self.assertRaises(ValueError):
+            s.BatchMeans(max_batches=7)
+
+    def test_truncation(self):
+        #a decaying start-up bias is cut off, a stationary series is left alone
+        rng = np.random.default_rng(5)
+        noise = rng.normal(0, 1, 20000)
+        biased = s.BatchMeans()
+        biased.extend(noise + np.where(np.arange(20000) < 2000, 20.0, 0.0))
+        self.assertGreaterEqual(biased.truncation(), 2000)
+        self.assertLess(biased.truncation(), 4000)
+        self.assertLess(abs(biased.estimate()[0]), 0.1)
+
+        flat = s.BatchMeans()
+        flat.extend(noise)
+        self.assertLess(flat.truncation(), 2000)
+
+    def test_steady_state_estimator(self):
+        queue = MM1Queue.MM1Queue(19, 20)
+        estimator = s.SteadyStateEstimator(queue)
+        blocks = MMcSimulator.MMcSimulator(queue, seed=2).iter_blocks(2000000)
+        for estimates in estimator.consume(waits for _, waits, _, _ in blocks):
+            pass
+        self.assertEqual(2000000, estimates['n'])
+        for name in ('lq', 'l', 'wq', 'w'):
+            self.assertLess(abs(estimates[name] - getattr(queue, name)), 4 * estimates[name + '_hw'])
+        self.assertAlmostEqual(estimates['w'] - estimates['wq'], 1 / 20)
+
+    def test_welford_extend(self):
+        data = np.random.default_rng(6).gamma(2, 3, 1001)
+        stats = s.Welford()
+        stats.add(data[0])
+        for block in np.array_split(data[1:], 7):
+            stats.extend(block)
+        stats.extend([])
+        self.assertEqual(1001, stats.n)
+        self.assertAlmostEqual(data.mean(), stats.mean)
+        self.assertAlmostEqual(data.var(ddof=1), stats.variance)
+
+    def test_ewma(self):
+        data = np.random.default_rng(7).normal(50, 2, 500)
+        one_by_one = s.Ewma(0.05)
+        for x in data:
+            one_by_one.add(x)
+        blocks = s.Ewma(0.05)
+        for block in np.array_split(data, 9):
+            blocks.extend(block)
+        self.assertAlmostEqual(one_by_one.mean, blocks.mean)
+        self.assertAlmostEqual(one_by_one.variance, blocks.variance)
+
+        #the weights follow the definition, rescaled to sum to one
+        weights = 0.05 * 0.95 ** np.arange(499, -1, -1)
+        weights /= weights.sum()
+        mean = weights @ data
+        self.assertAlmostEqual(mean, blocks.mean)
+        self.assertAlmostEqual(weights @ (data - mean) ** 2, blocks.variance)
+
+        #a shift in the stream is followed
+        blocks.extend(np.full(500, 60.0))
+        self.assertAlmostEqual(60.0, blocks.mean, delta=0.01)
+
+        with self.assertRaises(ValueError):
+            s.Ewma(0)
@@ -0,0 +1,163 @@
+"""
+Trace-driven replay: recorded (arrival time, service time) logs streamed through a c-server FIFO queue.
+"""
+import itertools
+import math
+import os
+import numpy as np
+import MG1Queue
+import MMcQueue
+from MMcSimulator import FifoServers
+
+#binary trace record: little-endian float64 arrival time then float64 service time, 16 bytes per customer
+RECORD = np.dtype([('arrival', '<f8'), ('service', '<f8')])
+
+
+def iter_csv(path, block_size=65536, columns=(0, 1), delimiter=',', skip_header=0):
+    """
+    Reads a CSV trace block by block; only one block of lines is held at a time.
+    Args:
+        path (str): trace file
+        block_size (int): number of customers per block
+        columns (tuple): column indexes of the arrival time and the service time
+        delimiter (str): field separator
+        skip_header (int): number of lines to skip at the top
+
+    Returns: generator of (arrivals, services) ndarrays
+    """
+    with open(path) as trace:
+        for _ in range(skip_header):
+            next(trace, None)
+        while True:
+            lines = list(itertools.islice(trace, block_size))
+            if not lines:
+                return
+            block = np.loadtxt(lines, delimiter=delimiter, usecols=columns, ndmin=2)
+            yield block[:, 0], block[:, 1]
+
+
+def iter_binary(path, block_size=65536):
+    """
+    Reads a binary trace of RECORD entries through a memory map, so pages are loaded as blocks are reached
+    and dropped by the OS afterwards.
+    Args:
+        path (str): trace file
+        block_size (int): number of customers per block
+
+    Returns: generator of (arrivals, services) ndarrays
+    """
+    if os.path.getsize(path) == 0:
+        #an empty file cannot be mapped
+        return
+    records = np.memmap(path, dtype=RECORD, mode='r')
+    for start in range(0, len(records), block_size):
+        block = records[start:start + block_size]
+        yield np.array(block['arrival']), np.array(block['service'])
+
+
+def write_binary(path, blocks):
+    """
+    Writes (arrivals, services) blocks, e.g. from iter_csv, as a binary trace.
+    Args:
+        path (str): trace file to create
+        blocks (iterable): (arrivals, services) ndarrays
+    Returns: None
+    """
+    with open(path, 'wb') as trace:
+        for arrivals, services in blocks:
+            block = np.empty(len(arrivals), dtype=RECORD)
+            block['arrival'] = arrivals
+            block['service'] = services
+            block.tofile(trace)
+
+
+class TraceReplay:
+    """
+    Replays a recorded trace through c FIFO servers and sets the observed metrics beside the MMcQueue and
+    MG1Queue predictions for the lamda, mu and sigma estimated from the same trace.
+    Arrival times must be non-decreasing. The trace is streamed in blocks and only running sums are kept,
+    so memory is bounded by the block size whatever the trace length.
+    """
+    def __init__(self, path, c=1, binary=None, block_size=65536, **csv_options):
+        """
+        Constructor for TraceReplay class.
+        Args:
+            path (str): trace file
+            c (int): number of servers to replay with
+            binary (bool): True for a binary trace, False for CSV; None decides by the .csv extension
+            block_size (int): number of customers per block
+            csv_options: passed to iter_csv (columns, delimiter, skip_header)
+        """
+        self.path = path
+        self.c = c
+        self.binary = not str(path).lower().endswith('.csv') if binary is None else binary
+        self.block_size = block_size
+        self.csv_options = csv_options
+
+    def iter_blocks(self):
+        """
+        Replays the trace block by block, in the same shape as MMcSimulator.iter_blocks.
+        Returns: generator of (arrivals, waits, services, servers) per block, where servers is the FifoServers
+            state after the block
+        """
+        if self.binary:
+            blocks = iter_binary(self.path, self.block_size)
+        else:
+            blocks = iter_csv(self.path, self.block_size, **self.csv_options)
+        servers = None
+        for arrivals, services in blocks:
+            if servers is None:
+                servers = FifoServers(self.c, start=arrivals[0])
+            yield arrivals, servers.serve(arrivals, services), services, servers
+
+    def run(self):
+        """
+        Replays the whole trace. wq and w are averages over customers; lq and l follow from Little's Laws with
+        the observed arrival rate; p0 is the fraction of time the system was empty. lamda, mu and sigma are
+        estimated from the interarrival and service times.
+        Returns: dict with lq, l, wq, w, p0, n, lamda, mu and sigma; nan metrics for a trace of fewer than two
+            customers
+        """
+        n = 0
+        wait_sum = 0.0
+        service_sum = 0.0
+        #squares are taken around the first block's mean, which keeps the variance sum accurate
+        shift = None
+        square_sum = 0.0
+        first = last = 0.0
+        servers = None
+        for arrivals, waits, services, servers in self.iter_blocks():
+            if shift is None:
+                shift = services.mean()
+                first = arrivals[0]
+            n += len(waits)
+            wait_sum += waits.sum()
+            service_sum += services.sum()
+            square_sum += ((services - shift) ** 2).sum()
+            last = arrivals[-1]
+
+        if n < 2 or last <= first:
+            return {'lq': math.nan, 'l': math.nan, 'wq': math.nan, 'w': math.nan, 'p0': math.nan, 'n': n,
+                    'lamda': math.nan, 'mu': math.nan, 'sigma': math.nan}
+
+        span = last - first
+        lamda = (n - 1) / span
+        wq = wait_sum / n
+        w = (wait_sum + service_sum) / n
+        mean_service = service_sum / n
+        variance = (square_sum - n * (mean_service - shift) ** 2) / (n - 1)
+        return {'lq': lamda * wq, 'l': lamda * w, 'wq': wq, 'w': w, 'p0': servers.empty_time / span, 'n': n,
+                'lamda': lamda, 'mu': 1 / mean_service, 'sigma': math.sqrt(max(variance, 0.0))}
+
+    def compare(self):
+        """
+        Replays the trace and builds the queue models from the estimated parameters.
+        Returns: dict with observed (the run dict), mmc (MMcQueue QueueMetrics with the replay's c) and, for a
+            single server, mg1 (MG1Queue QueueMetrics with the estimated sigma)
+        """
+        observed = self.run()
+        result = {'observed': observed,
+                  'mmc': MMcQueue.MMcQueue(observed['lamda'], observed['mu'], self.c).metrics()}
+        if self.c == 1:
+            result['mg1'] = MG1Queue.MG1Queue(observed['lamda'], observed['mu'], observed['sigma']).metrics()
+        return result
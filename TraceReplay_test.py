@@ -0,0 +1,65 @@
+from unittest import TestCase
+import math
+import os
+import tempfile
+import numpy as np
+import TraceReplay as t
+
+
+class TestTraceReplay(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, 'trace.csv')
+        self.bin = os.path.join(self.tmp.name, 'trace.bin')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_trace(self, arrivals, services):
+        with open(self.csv, 'w') as trace:
+            trace.write('arrival,service\n')
+            for a, s in zip(arrivals, services):
+                trace.write(f'{float(a)!r},{float(s)!r}\n')
+        t.write_binary(self.bin, t.iter_csv(self.csv, block_size=3, skip_header=1))
+
+    def test_small_trace(self):
+        #two servers: the third customer waits for the first server to free up at t = 3
+        self.write_trace([1.0, 1.5, 2.0, 6.0], [2.0, 2.0, 1.0, 1.0])
+        for replay in (t.TraceReplay(self.csv, c=2, block_size=3, skip_header=1),
+                       t.TraceReplay(self.bin, c=2, block_size=3)):
+            result = replay.run()
+            self.assertEqual(4, result['n'])
+            self.assertAlmostEqual(0.25, result['wq'])
+            self.assertAlmostEqual(1.75, result['w'])
+            self.assertAlmostEqual(3 / 5, result['lamda'])
+            self.assertAlmostEqual(2 / 3, result['mu'])
+            self.assertAlmostEqual(np.std([2.0, 2.0, 1.0, 1.0], ddof=1), result['sigma'])
+            #the system is empty from 4 to 6 out of the 5 time units between first and last arrival
+            self.assertAlmostEqual(2 / 5, result['p0'])
+
+    def test_compare(self):
+        rng = np.random.default_rng(4)
+        arrivals = np.cumsum(rng.exponential(1 / 15, 100000))
+        services = rng.exponential(1 / 20, 100000)
+        self.write_trace(arrivals, services)
+
+        single = t.TraceReplay(self.bin, block_size=4096).compare()
+        observed = single['observed']
+        self.assertLess(abs(observed['wq'] - single['mmc'].wq), 0.1 * single['mmc'].wq)
+        self.assertLess(abs(observed['lq'] - single['mg1'].lq), 0.1 * single['mg1'].lq)
+        self.assertAlmostEqual(observed['lamda'], single['mmc'].lamda)
+
+        #CSV and binary replay the same customers
+        from_csv = t.TraceReplay(self.csv, block_size=5000, skip_header=1).run()
+        for name in ('wq', 'w', 'lq', 'p0', 'mu', 'sigma'):
+            self.assertAlmostEqual(observed[name], from_csv[name])
+
+        double = t.TraceReplay(self.bin, c=2).compare()
+        self.assertNotIn('mg1', double)
+        self.assertLess(double['observed']['wq'], observed['wq'])
+
+    def test_empty_trace(self):
+        self.write_trace([], [])
+        result = t.TraceReplay(self.bin).run()
+        self.assertEqual(0, result['n'])
+        self.assertTrue(math.isnan(result['wq']))